@@ -0,0 +1,75 @@
+"""Requests per second of each executor as the worker count grows.
+
+Runs ``--requests`` concurrent calculations of each indicator on one
+synthetic series through the inline executor, then through the thread and
+process executors with each ``--workers`` count, and prints throughput
+relative to inline. The result cache is bypassed: every request computes.
+
+    python benchmarks/executor_scaling.py --points 500000 --workers 1 2 4 8
+
+The thread executor normally only threads indicators whose work releases
+the GIL (`indicators.base.releases_gil`; for TA-Lib adapters, what
+`talib_releases_gil` measured). Here the thread rows run every indicator
+on threads, to measure whether its calls actually overlap; the ``gil``
+column shows what the executor would route by.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from mcp_talib.executors import InlineExecutor, ProcessExecutor, ThreadExecutor
+from mcp_talib.indicators import registry
+from mcp_talib.indicators.base import releases_gil
+from mcp_talib.models.market_data import ColumnarMarketData
+
+
+async def _throughput(executor, market_data, indicator, requests: int) -> float:
+    jobs = [(indicator, {})]
+    # Untimed warm-up so pools are started and workers have imported TA-Lib
+    await asyncio.gather(*(executor.run(market_data, jobs) for _ in range(2)))
+    started = time.perf_counter()
+    await asyncio.gather(*(executor.run(market_data, jobs) for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--points", type=int, default=500_000)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--indicators", nargs="+", default=["sma", "kama", "bbands", "sar"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(size=args.points))
+    market_data = ColumnarMarketData(close=close, high=close + 1, low=close - 1)
+
+    print(f"{os.cpu_count()} CPUs, {args.points} points, {args.requests} concurrent requests")
+    print(f"{'indicator':<10} {'gil':<8} {'executor':<8} {'workers':>7} {'req/s':>9} {'vs inline':>9}")
+    for name in args.indicators:
+        indicator = registry.get_indicator(name)
+        gil = "released" if releases_gil(indicator) else "held"
+        inline = await _throughput(InlineExecutor(), market_data, indicator, args.requests)
+        print(f"{name:<10} {gil:<8} {'inline':<8} {'-':>7} {inline:>9.1f} {1.0:>8.2f}x")
+        for workers in args.workers:
+            for executor in (
+                ThreadExecutor(workers, min_points=0, fallback=InlineExecutor()),
+                ProcessExecutor(workers, min_points=0),
+            ):
+                executor.start()
+                # Shadows the class attribute for this run only
+                indicator.releases_gil = True
+                try:
+                    rate = await _throughput(executor, market_data, indicator, args.requests)
+                finally:
+                    del indicator.releases_gil
+                    executor.shutdown()
+                print(f"{name:<10} {gil:<8} {executor.name:<8} {workers:>7} {rate:>9.1f} {rate / inline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
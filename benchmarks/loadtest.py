@@ -0,0 +1,304 @@
+"""Latency percentiles and throughput of the servers under concurrent load.
+
+Starts the HTTP API (``HttpApiTransport``), the MCP streamable HTTP server
+(``HttpTransport``) and an MCP stdio server on localhost, then replays the
+same workload against each: ``--requests`` tool calls drawn from ``--mix``
+and ``--points`` with a seeded generator, issued by ``--concurrency``
+workers that each send their next call as soon as the last one returns.
+Comparing the rows shows where MCP JSON-RPC framing and session handling
+cost more than plain REST. Every transport gets the same columns; REST
+sends indicators on high/low a raw float64 body, since its JSON body only
+carries closes.
+
+    python benchmarks/loadtest.py --concurrency 16 --requests 2000 --mix sma=3 rsi=1 bbands=1 --points 1000 10000
+
+Each HTTP worker keeps its own connection, and each MCP HTTP worker its
+own session. The stdio server has one pipe, so all workers share one
+session there. ``--url-api`` and ``--url-mcp`` target already-running
+servers instead of starting them. The result cache is disabled in the
+servers it starts unless ``--cache`` is given, so repeated payloads still
+compute. The report goes to stdout and, with ``--output``, to a JSON file.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack, contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from suite import OPTIONS, rest_request, server_directory, tool_columns
+
+from mcp_talib.indicators import registry
+from mcp_talib.synthetic import columns_payload, generate_ohlcv
+
+TRANSPORTS = ("http", "mcp-http", "stdio")
+
+Job = Tuple[str, int]
+Call = Callable[[Job], Awaitable[bool]]
+# URL, body and headers of a REST call
+Request = Tuple[str, bytes, Dict[str, str]]
+
+
+def _weighted(items: List[str], cast) -> Dict[Any, float]:
+    weights = {}
+    for item in items:
+        key, sep, weight = item.partition("=")
+        weights[cast(key)] = float(weight) if sep else 1.0
+    if not weights or min(weights.values()) <= 0:
+        raise SystemExit(f"weights must be positive, got {' '.join(items)}")
+    return weights
+
+
+def workload(mix: Dict[str, float], sizes: Dict[int, float], requests: int, seed: int) -> List[Job]:
+    """The ``(tool, points)`` calls of a run, the same for every transport."""
+    rng = random.Random(seed)
+    tools = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    points = rng.choices(list(sizes), weights=list(sizes.values()), k=requests)
+    return list(zip(tools, points))
+
+
+def arguments(tool: str, points: int, seed: int) -> Dict[str, Any]:
+    """MCP tool arguments of a job."""
+    return {**columns_payload(generate_ohlcv(points, seed=seed), tool_columns(tool)), **OPTIONS.get(tool, {})}
+
+
+def rest_call(tool: str, points: int, seed: int) -> Request:
+    """The REST request of a job, on the same columns as `arguments`."""
+    return rest_request(tool, generate_ohlcv(points, seed=seed))
+
+
+def percentiles(latencies: List[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": max(latencies)}
+
+
+async def run_load(call: Call, jobs: List[Job], concurrency: int) -> Dict[str, Any]:
+    """Issue ``jobs`` through ``call`` from ``concurrency`` closed-loop workers."""
+    queue = iter(jobs)
+    samples: List[Tuple[str, float, bool]] = []
+
+    async def worker():
+        for job in queue:
+            started = time.perf_counter()
+            try:
+                ok = await call(job)
+            except Exception:
+                ok = False
+            samples.append((job[0], time.perf_counter() - started, ok))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    def summary(rows: List[Tuple[str, float, bool]]) -> Dict[str, Any]:
+        errors = sum(not ok for _, _, ok in rows)
+        return {
+            "requests": len(rows),
+            "errors": errors,
+            "error_rate": errors / len(rows) if rows else 0.0,
+            "latency": percentiles([latency for _, latency, ok in rows if ok]),
+        }
+
+    report = summary(samples)
+    report.update({"seconds": elapsed, "requests_per_second": len(samples) / elapsed if elapsed else None})
+    report["tools"] = {tool: summary([s for s in samples if s[0] == tool]) for tool in sorted({s[0] for s in samples})}
+    return report
+
+
+def _ok(text: str) -> bool:
+    return '"success":true' in text
+
+
+async def _http_calls(stack: AsyncExitStack, url: str, requests: Dict[Job, Request], concurrency: int) -> Call:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    client = await stack.enter_async_context(httpx.AsyncClient(base_url=url, limits=limits, timeout=None))
+
+    async def call(job: Job) -> bool:
+        path, body, headers = requests[job]
+        response = await client.post(path, content=body, headers=headers)
+        return response.status_code == 200 and _ok(response.text)
+
+    return call
+
+
+def _session_call(session) -> Callable[[Job, Dict[str, Any]], Awaitable[bool]]:
+    async def call(job: Job, arguments: Dict[str, Any]) -> bool:
+        result = await session.call_tool(f"calculate_{job[0]}", arguments)
+        return not result.isError and _ok(result.content[0].text)
+
+    return call
+
+
+async def _mcp_http_calls(stack: AsyncExitStack, url: str, payloads: Dict[Job, Dict[str, Any]], concurrency: int) -> Call:
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+
+    idle: asyncio.Queue = asyncio.Queue()
+    for _ in range(concurrency):
+        reader, writer, _ = await stack.enter_async_context(streamablehttp_client(url, timeout=300))
+        session = await stack.enter_async_context(ClientSession(reader, writer))
+        await session.initialize()
+        idle.put_nowait(_session_call(session))
+
+    async def call(job: Job) -> bool:
+        # Each worker takes a session of its own for the call
+        session_call = await idle.get()
+        try:
+            return await session_call(job, payloads[job])
+        finally:
+            idle.put_nowait(session_call)
+
+    return call
+
+
+async def _stdio_calls(stack: AsyncExitStack, env: Dict[str, str], payloads: Dict[Job, Dict[str, Any]]) -> Call:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    cwd = stack.enter_context(server_directory())
+    server = StdioServerParameters(command=sys.executable, args=["-m", "mcp_talib.cli"], env=env, cwd=cwd)
+    reader, writer = await stack.enter_async_context(stdio_client(server))
+    session = await stack.enter_async_context(ClientSession(reader, writer))
+    await session.initialize()
+    session_call = _session_call(session)
+
+    async def call(job: Job) -> bool:
+        return await session_call(job, payloads[job])
+
+    return call
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(args: List[str], env: Dict[str, str], port: int, timeout: float = 30.0) -> Iterator[None]:
+    """Run ``python -m mcp_talib.cli ARGS`` until its port accepts connections."""
+    with server_directory() as cwd:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "mcp_talib.cli", *args, "--host", "127.0.0.1", "--port", str(port)],
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"server {' '.join(args)} exited with status {process.returncode}")
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                    break
+                except OSError as e:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"server {' '.join(args)} did not start within {timeout:.0f}s") from e
+                    time.sleep(0.1)
+            yield
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+async def run_transport(transport: str, url: Optional[str], env: Dict[str, str], jobs: List[Job], args) -> Dict[str, Any]:
+    unique = sorted(set(jobs))
+    async with AsyncExitStack() as stack:
+        if transport == "http":
+            requests = {job: rest_call(*job, seed=args.seed) for job in unique}
+            call = await _http_calls(stack, url, requests, args.concurrency)
+        else:
+            payloads = {job: arguments(*job, seed=args.seed) for job in unique}
+            if transport == "mcp-http":
+                call = await _mcp_http_calls(stack, url, payloads, args.concurrency)
+            else:
+                call = await _stdio_calls(stack, env, payloads)
+        # Untimed warm-up, so connection setup and first imports are not measured
+        await run_load(call, unique * max(1, args.warmup // len(unique)), args.concurrency)
+        return await run_load(call, jobs, args.concurrency)
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value * 1e3:>9.2f}" if value is not None else f"{'-':>9}"
+
+
+def _report(transport: str, report: Dict[str, Any]) -> None:
+    latency = report["latency"]
+    print(
+        f"{transport:<9} {report['requests']:>8} {report['error_rate']:>7.1%} {report['requests_per_second']:>9.1f} "
+        f"{_ms(latency['p50'])} {_ms(latency['p95'])} {_ms(latency['p99'])} {_ms(latency['max'])}",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50, help="untimed requests before each run")
+    parser.add_argument("--mix", nargs="+", default=["sma", "ema", "rsi", "bbands"], metavar="TOOL[=WEIGHT]")
+    parser.add_argument("--points", nargs="+", default=["1000"], metavar="POINTS[=WEIGHT]")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="keep the servers' result cache enabled")
+    parser.add_argument("--url-api", help="HTTP API base URL, instead of starting one")
+    parser.add_argument("--url-mcp", help="MCP streamable HTTP URL, instead of starting one")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    mix = _weighted(args.mix, str)
+    unknown = sorted(set(mix) - set(registry.list_indicators()))
+    if unknown:
+        raise SystemExit(f"unknown tools: {', '.join(unknown)}")
+    jobs = workload(mix, _weighted(args.points, lambda s: int(float(s))), args.requests, args.seed)
+
+    env = dict(os.environ)
+    if args.cache:
+        # Use the servers' default cache size, whatever the shell sets
+        env.pop("MCP_TALIB_RESULT_CACHE_MAX_ENTRIES", None)
+    else:
+        env["MCP_TALIB_RESULT_CACHE_MAX_ENTRIES"] = "0"
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, mix {' '.join(args.mix)}, points {' '.join(args.points)}")
+    print(f"{'transport':<9} {'requests':>8} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    reports: Dict[str, Any] = {}
+    for transport in args.transports:
+        if transport == "http" and not args.url_api:
+            port = _free_port()
+            with serve(["--mode", "api"], env, port):
+                reports[transport] = asyncio.run(run_transport(transport, f"http://127.0.0.1:{port}", env, jobs, args))
+        elif transport == "mcp-http" and not args.url_mcp:
+            port = _free_port()
+            with serve(["--mode", "mcp", "--transport", "http"], env, port):
+                reports[transport] = asyncio.run(run_transport(transport, f"http://127.0.0.1:{port}/mcp", env, jobs, args))
+        else:
+            url = args.url_api if transport == "http" else args.url_mcp
+            reports[transport] = asyncio.run(run_transport(transport, url, env, jobs, args))
+        _report(transport, reports[transport])
+
+    if args.output:
+        settings = {key: value for key, value in vars(args).items() if key != "output"}
+        with open(args.output, "w") as fh:
+            json.dump({"settings": settings, "transports": reports}, fh, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""Latency, throughput and peak memory of every indicator through each access path.
+
+Each registered indicator runs on seeded synthetic OHLCV series
+(`mcp_talib.synthetic`) of every ``--sizes`` length through these paths:
+
+``direct``  ``indicator.calculate`` on a ready `ColumnarMarketData`
+``cli``     ``mcp-talib call NAME --file payload.json`` via Typer's runner
+``http``    ``POST /api/tools/NAME`` on the FastAPI app through an in-process ASGI client
+``stdio``   the ``calculate_NAME`` tool of a ``python -m mcp_talib.cli`` MCP server over stdio
+
+The result cache is disabled so every run computes. A case runs once
+untimed, then ``--repeat`` times or until ``--max-seconds`` have passed,
+and one more time under tracemalloc for its peak memory; the stdio server
+runs in another process, so that path reports no memory. The CLI path only
+takes closes, so indicators on high/low are skipped there. The JSON body
+of the tool endpoint also carries only closes, so the HTTP path sends
+those indicators their columns as a raw float64 body instead.
+
+    python benchmarks/suite.py --output bench.json
+    python benchmarks/suite.py --baseline bench.json --indicators sma kama --sizes 1000 100000
+
+Serializing paths get slow at large sizes; ``--limit PATH=POINTS`` raises
+or lowers their largest size. Results are written as JSON to ``--output``.
+With ``--baseline`` each case is compared with the same case of an earlier
+output, and the script exits with status 1 if any got slower or used more
+memory than ``--threshold`` allows.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import numpy as np
+import talib
+from typer.testing import CliRunner
+
+from mcp_talib import cli_tools, media
+from mcp_talib.core.mcp_server import TOOL_SPECS
+from mcp_talib.indicators import registry
+from mcp_talib.serialization import dumps
+from mcp_talib.synthetic import columns_payload, generate_ohlcv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = ("direct", "cli", "http", "stdio")
+SIZES = [10**exponent for exponent in range(2, 8)]
+# Largest default size of each path; the serializing ones scale with JSON text
+LIMITS = {"direct": 10**7, "cli": 10**6, "http": 10**6, "stdio": 10**5}
+# Options for indicators whose defaults cannot run on their own
+OPTIONS: Dict[str, Dict[str, Any]] = {"mavp": {"periods": 14.0}}
+# Latency changes below this are timer noise, whatever the ratio
+NOISE_FLOOR_SECONDS = 0.0005
+
+Case = Tuple[str, int]
+
+
+@contextmanager
+def server_directory() -> Iterator[str]:
+    """A temporary working directory for a server process.
+
+    The server reads logging.conf from its working directory and writes
+    console.log there, so it gets a copy of the repository's config and
+    its log is removed with the directory.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(ROOT, "logging.conf"), directory)
+        yield directory
+
+
+def tool_columns(name: str) -> List[str]:
+    spec = TOOL_SPECS.get(name)
+    return list(spec["market_data_args"]) if spec else ["close"]
+
+
+def rest_request(name: str, market_data) -> Tuple[str, bytes, Dict[str, str]]:
+    """URL, body and headers of a ``POST /api/tools/NAME`` call on ``market_data``.
+
+    Indicators on closes send a JSON body. The JSON body has no other
+    columns, so the rest send theirs as raw float64 named by ``columns``,
+    with their options in the query string.
+    """
+    columns = tool_columns(name)
+    options = OPTIONS.get(name, {})
+    if columns == ["close"]:
+        body = dumps({**columns_payload(market_data, columns), **options})
+        return f"/api/tools/{name}", body, {"Content-Type": media.JSON}
+    body = b"".join(np.ascontiguousarray(getattr(market_data, column), dtype="<f8").tobytes() for column in columns)
+    query = urlencode({"columns": ",".join(columns), **options})
+    return f"/api/tools/{name}?{query}", body, {"Content-Type": media.RAW}
+
+
+def _summary(latencies: List[float], points: int, peak_bytes: Optional[int]) -> Dict[str, Any]:
+    median = statistics.median(latencies)
+    return {
+        "runs": len(latencies),
+        "latency": {
+            "min": min(latencies),
+            "median": median,
+            "mean": statistics.fmean(latencies),
+            "max": max(latencies),
+        },
+        "points_per_second": points / median if median else None,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def _measure(call: Callable[[], None], points: int, args, memory: bool = True) -> Dict[str, Any]:
+    call()
+    latencies: List[float] = []
+    deadline = time.perf_counter() + args.max_seconds
+    while len(latencies) < args.repeat and (not latencies or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            call()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return _summary(latencies, points, peak)
+
+
+async def _ameasure(call: Callable[[], Awaitable[None]], points: int, args, memory: bool = True) -> Dict[str, Any]:
+    await call()
+    latencies: List[float] = []
+    deadline = time.perf_counter() + args.max_seconds
+    while len(latencies) < args.repeat and (not latencies or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            await call()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return _summary(latencies, points, peak)
+
+
+def _check(result) -> None:
+    if not result.success:
+        raise RuntimeError(result.error_message or "calculation failed")
+
+
+async def bench_direct(cases: List[Case], series, args) -> List[Dict[str, Any]]:
+    records = []
+    for name, points in cases:
+        indicator = registry.get_indicator(name)
+        market_data = series(points)
+
+        async def call(indicator=indicator, market_data=market_data, options=OPTIONS.get(name, {})):
+            _check(await indicator.calculate(market_data, options))
+
+        records.append(await _record(name, "direct", points, _ameasure(call, points, args)))
+    return records
+
+
+def bench_cli(cases: List[Case], series, args) -> List[Dict[str, Any]]:
+    runner = CliRunner()
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, points in cases:
+            if tool_columns(name) != ["close"]:
+                continue
+            path = os.path.join(directory, f"{name}-{points}.json")
+            if not os.path.exists(path):
+                with open(path, "w") as fh:
+                    json.dump({**columns_payload(series(points), ["close"]), **OPTIONS.get(name, {})}, fh)
+
+            def call(name=name, path=path):
+                outcome = runner.invoke(cli_tools.app, ["call", name, "--file", path])
+                if outcome.exit_code or b'"success":true' not in outcome.stdout_bytes:
+                    raise RuntimeError(outcome.stdout or repr(outcome.exception))
+
+            try:
+                records.append({"indicator": name, "path": "cli", "points": points, **_measure(call, points, args)})
+            except Exception as e:
+                records.append({"indicator": name, "path": "cli", "points": points, "error": str(e)})
+            _report(records[-1])
+    return records
+
+
+async def bench_http(cases: List[Case], series, args) -> List[Dict[str, Any]]:
+    import httpx
+
+    from mcp_talib.http_api_server import create_http_api_app
+
+    transport = httpx.ASGITransport(app=create_http_api_app())
+    records = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, points in cases:
+            url, body, headers = rest_request(name, series(points))
+
+            async def call(url=url, body=body, headers=headers):
+                response = await client.post(url, content=body, headers=headers)
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+            records.append(await _record(name, "http", points, _ameasure(call, points, args)))
+    return records
+
+
+async def bench_stdio(cases: List[Case], series, args) -> List[Dict[str, Any]]:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    records = []
+    with server_directory() as cwd:
+        server = StdioServerParameters(command=sys.executable, args=["-m", "mcp_talib.cli"], env=dict(os.environ), cwd=cwd)
+        async with stdio_client(server) as (reader, writer):
+            async with ClientSession(reader, writer) as session:
+                await session.initialize()
+                for name, points in cases:
+                    arguments = {**columns_payload(series(points), tool_columns(name)), **OPTIONS.get(name, {})}
+
+                    async def call(name=name, arguments=arguments):
+                        result = await session.call_tool(f"calculate_{name}", arguments)
+                        if result.isError or '"success":true' not in result.content[0].text:
+                            raise RuntimeError(result.content[0].text[:200])
+
+                    measured = _ameasure(call, points, args, memory=False)
+                    records.append(await _record(name, "stdio", points, measured))
+    return records
+
+
+async def _record(name: str, path: str, points: int, measured: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        record = {"indicator": name, "path": path, "points": points, **await measured}
+    except Exception as e:
+        record = {"indicator": name, "path": path, "points": points, "error": str(e)}
+    _report(record)
+    return record
+
+
+def _report(record: Dict[str, Any]) -> None:
+    head = f"{record['indicator']:<13} {record['path']:<7} {record['points']:>9}"
+    if "error" in record:
+        print(f"{head}  error: {record['error']}", flush=True)
+        return
+    peak = record["peak_bytes"]
+    memory = f"{peak / 2**20:>9.1f}" if peak is not None else f"{'-':>9}"
+    print(
+        f"{head} {record['latency']['median'] * 1e3:>11.3f} {record['points_per_second']:>13.0f} {memory}",
+        flush=True,
+    )
+
+
+def compare(records: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Describe each case that got slower or used more memory than ``baseline`` by over ``threshold``."""
+    before = {(r["indicator"], r["path"], r["points"]): r for r in baseline["results"] if "error" not in r}
+    regressions = []
+    for record in records:
+        old = before.get((record["indicator"], record["path"], record["points"]))
+        if old is None or "error" in record:
+            continue
+        case = f"{record['indicator']} {record['path']} {record['points']}"
+        new_latency, old_latency = record["latency"]["median"], old["latency"]["median"]
+        if new_latency > old_latency * (1 + threshold) and new_latency - old_latency > NOISE_FLOOR_SECONDS:
+            regressions.append(f"{case}: median {old_latency * 1e3:.3f} ms -> {new_latency * 1e3:.3f} ms")
+        new_peak, old_peak = record["peak_bytes"], old["peak_bytes"]
+        if new_peak is not None and old_peak and new_peak > old_peak * (1 + threshold):
+            regressions.append(f"{case}: peak memory {old_peak} -> {new_peak} bytes")
+    return regressions
+
+
+def _limits(items: List[str]) -> Dict[str, int]:
+    limits = dict(LIMITS)
+    for item in items:
+        path, sep, points = item.partition("=")
+        if not sep or path not in PATHS:
+            raise SystemExit(f"--limit takes PATH=POINTS with PATH one of {', '.join(PATHS)}, got {item!r}")
+        limits[path] = int(float(points))
+    return limits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--indicators", nargs="+", default=registry.list_indicators())
+    parser.add_argument("--sizes", type=lambda s: int(float(s)), nargs="+", default=SIZES)
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    parser.add_argument("--limit", nargs="+", default=[], metavar="PATH=POINTS")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="time budget for the repeats of one case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="earlier --output to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown before flagging")
+    args = parser.parse_args()
+
+    # Before the settings are first read; the stdio server inherits it
+    os.environ["MCP_TALIB_RESULT_CACHE_MAX_ENTRIES"] = "0"
+    unknown = sorted(set(args.indicators) - set(registry.list_indicators()))
+    if unknown:
+        raise SystemExit(f"unknown indicators: {', '.join(unknown)}")
+    limits = _limits(args.limit)
+
+    generated: Dict[int, Any] = {}
+
+    def series(points: int):
+        if points not in generated:
+            generated[points] = generate_ohlcv(points, seed=args.seed)
+        return generated[points]
+
+    print(f"{'indicator':<13} {'path':<7} {'points':>9} {'median ms':>11} {'points/s':>13} {'peak MiB':>9}")
+    records: List[Dict[str, Any]] = []
+    for path in args.paths:
+        cases = [(name, points) for name in args.indicators for points in sorted(args.sizes) if points <= limits[path]]
+        if path == "cli":
+            records += bench_cli(cases, series, args)
+        else:
+            bench = {"direct": bench_direct, "http": bench_http, "stdio": bench_stdio}[path]
+            records += asyncio.run(bench(cases, series, args))
+
+    output = {
+        "environment": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "talib": talib.__version__,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": records,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(output, fh, indent=2)
+    print(f"wrote {len(records)} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(records, json.load(fh), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
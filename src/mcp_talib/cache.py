@@ -0,0 +1,170 @@
+"""Content-addressed LRU cache of indicator results.
+
+Results are keyed by the indicator name, a BLAKE2b digest of the input
+columns and the canonical JSON form of the options, so identical requests
+hit the cache whichever transport (HTTP, MCP or CLI) sends them. The cache
+is bounded both by entry count and by the bytes of the cached output
+arrays, evicting least recently used entries first.
+
+Cached output arrays are marked read-only because every hit shares them.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .config import get_settings
+from .models.indicator_result import IndicatorResult
+from .models.market_data import ColumnarMarketData
+from .serialization import to_builtin
+
+_COLUMNS = ("close", "open", "high", "low", "volume", "timestamp")
+
+# Rough per-entry cost of the result object, key and metadata
+_ENTRY_OVERHEAD = 512
+
+
+def fingerprint(market_data: Any) -> bytes:
+    """Digest of the input columns' names, dtypes and contents.
+
+    The digest is memoized on `ColumnarMarketData`, so a series shared by
+    several indicators in one request is hashed once.
+    """
+    cached = getattr(market_data, "_fingerprint", None)
+    if cached is not None:
+        return cached
+    digest = hashlib.blake2b(digest_size=16)
+    for name in _COLUMNS:
+        column = getattr(market_data, name, None)
+        if column is None:
+            continue
+        array = np.ascontiguousarray(column if isinstance(column, np.ndarray) else np.asarray(column, dtype=np.float64))
+        digest.update(f"{name}:{array.dtype.str}:{array.shape[0]};".encode())
+        digest.update(array)
+    result = digest.digest()
+    if isinstance(market_data, ColumnarMarketData):
+        market_data._fingerprint = result
+    return result
+
+
+def canonical_options(options: Optional[Dict[str, Any]]) -> str:
+    """Options as compact JSON with sorted keys and NumPy values unwrapped."""
+    return json.dumps(to_builtin(options or {}), sort_keys=True, separators=(",", ":"), default=repr)
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    return 8
+
+
+def _freeze(value: Any) -> None:
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+
+
+class ResultCache:
+    """Thread-safe LRU of successful `IndicatorResult`s."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[bytes, Tuple[IndicatorResult, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def key(self, indicator_name: str, market_data: Any, options: Optional[Dict[str, Any]]) -> bytes:
+        """Cache key of one calculation."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(indicator_name.encode())
+        digest.update(b"\0")
+        digest.update(fingerprint(market_data))
+        digest.update(canonical_options(options).encode())
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[IndicatorResult]:
+        """Return a copy of the cached result for ``key``, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[0]
+        # Callers may annotate their result; keep the cached one pristine
+        return result.model_copy(update={"metadata": dict(result.metadata or {})})
+
+    def put(self, key: bytes, result: IndicatorResult) -> None:
+        """Cache ``result``; results larger than the byte budget are skipped."""
+        size = _nbytes(result.values) + _ENTRY_OVERHEAD
+        if not self.enabled or size > self.max_bytes:
+            return
+        _freeze(result.values)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters plus current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide cache used by `execution.run_indicator`."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            settings = get_settings()
+            _cache = ResultCache(
+                max_entries=settings.result_cache_max_entries,
+                max_bytes=settings.result_cache_max_bytes,
+            )
+        return _cache
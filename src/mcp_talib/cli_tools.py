@@ -10,23 +10,26 @@ from typing import Optional, Dict, Any, List
 
 import typer
 
+from .execution import run_indicator
 from .indicators import registry
-from .models.market_data import MarketData
-from .schemas import ToolResult
+from .models.market_data import ColumnarMarketData, Precision
+from .serialization import dumps, result_to_payload
 
 app = typer.Typer(help="mcp-talib tools CLI")
 
 
-def _call_indicator_sync(indicator_name: str, close: List[float], params: Dict[str, Any]):
+def _call_indicator_sync(
+    indicator_name: str, close: List[float], params: Dict[str, Any], precision: Optional[Precision] = None
+):
     """Synchronously call an async indicator.calculate function."""
     indicator = registry.get_indicator(indicator_name)
     if not indicator:
         raise RuntimeError("indicator not found")
 
-    market_data = MarketData(close=close)
+    market_data = ColumnarMarketData(close=close).with_precision(precision)
 
     async def run():
-        return await indicator.calculate(market_data, params)
+        return await run_indicator(indicator, market_data, params)
 
     return asyncio.run(run())
 
@@ -53,6 +56,7 @@ def call(
     close_json: Optional[str] = typer.Option(None, "--close", "-c", help="JSON array of close prices"),
     json_file: Optional[str] = typer.Option(None, "--file", "-f", help="JSON file with payload"),
     timeperiod: Optional[int] = typer.Option(None, "--timeperiod", "-t"),
+    precision: Optional[str] = typer.Option(None, "--precision", help="float64 (default) or float32"),
 ):
     """Call a tool. Provide either `--close` JSON array or `--file` with JSON payload.
 
@@ -74,21 +78,16 @@ def call(
         typer.echo("missing 'close' in payload", err=True)
         raise typer.Exit(code=2)
 
-    params = {k: v for k, v in payload.items() if k != "close"}
-    res = _call_indicator_sync(name, close, params)
-
-    # Normalize into ToolResult and print strict JSON
-    success = getattr(res, "success", False)
-
-    # Preserve full values payload (list or dict)
-    raw_values = getattr(res, "values", None)
-    values = raw_values if isinstance(raw_values, (list, dict)) else None
+    precision = payload.get("precision", precision)
+    if precision not in (None, "float64", "float32"):
+        typer.echo("precision must be float64 or float32", err=True)
+        raise typer.Exit(code=2)
 
-    metadata = res.metadata if isinstance(getattr(res, "metadata", None), dict) else None
-    error = getattr(res, "error", None)
+    params = {k: v for k, v in payload.items() if k not in ("close", "precision")}
+    res = _call_indicator_sync(name, close, params, precision)
 
-    out = ToolResult(success=bool(success), values=values, metadata=metadata, error=str(error) if error else None)
-    typer.echo(out.model_dump_json())
+    # Normalize into the ToolResult shape and print strict JSON
+    typer.echo(dumps(result_to_payload(res, builtin=False)).decode())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+"""Runtime settings read from ``MCP_TALIB_*`` environment variables.
+
+Every setting has a default that suits a single-node deployment; override
+one by exporting, for example, ``MCP_TALIB_SERIES_TTL_SECONDS=600``.
+"""
+
+import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+ENV_PREFIX = "MCP_TALIB_"
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ("1", "true", "yes", "on"):
+        return True
+    if lowered in ("0", "false", "no", "off", ""):
+        return False
+    raise ValueError(f"expected a boolean, got {value!r}")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Server settings; see `from_env` for how they are loaded."""
+
+    # Stored series expire after this many seconds without being used
+    series_ttl_seconds: float = 3600.0
+    # Total bytes of series data held by the store before least recently
+    # used series are evicted
+    series_max_bytes: int = 512 * 1024 * 1024
+    # Indicator results kept by the shared result cache; setting either
+    # limit to 0 disables caching
+    result_cache_max_entries: int = 1024
+    result_cache_max_bytes: int = 256 * 1024 * 1024
+    # Where calculations run: "inline" on the event loop, "process" in a
+    # pool of worker processes or "thread" on threads where the GIL allows
+    # (see `mcp_talib.executors`)
+    executor: str = "inline"
+    # Worker count of each pool executor; 0 means one per CPU
+    workers: int = 0
+    # Inputs with fewer points always run inline, where they are cheaper
+    # than a round trip to a worker
+    offload_min_points: int = 50_000
+    # JSON scalar written for NaN and infinity in responses, such as the
+    # lookback prefix: null, a number or a quoted string
+    json_nan: str = "null"
+    # Bars per chunk of a streamed response (NDJSON or frame stream)
+    stream_chunk_points: int = 65_536
+    # JSON lines file each timed request is appended to (see
+    # `mcp_talib.timing`); empty disables the trace
+    trace_file: str = ""
+    # Add per-stage timings to the metadata of MCP tool results
+    timing_metadata: bool = False
+    # Allow requests to ask for their calculation to be profiled (see
+    # `mcp_talib.profiling`), and where profiles are stored; empty means
+    # a directory under the system temp dir. Only the newest
+    # `profile_max_count` profiles are kept
+    profiling: bool = False
+    profile_dir: str = ""
+    profile_max_count: int = 100
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        """Build settings from ``MCP_TALIB_<FIELD>`` variables.
+
+        Raises ``ValueError`` naming the variable if a value cannot be
+        parsed as the field's type.
+        """
+        environ = os.environ if environ is None else environ
+        values: dict[str, Any] = {}
+        for field in fields(cls):
+            name = ENV_PREFIX + field.name.upper()
+            raw = environ.get(name)
+            if raw is None:
+                continue
+            parse = _parse_bool if field.type is bool else field.type
+            try:
+                values[field.name] = parse(raw)
+            except ValueError as e:
+                raise ValueError(f"invalid {name}: {e}") from e
+        return cls(**values)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, read once from the environment."""
+    return Settings.from_env()
@@ -16,11 +16,26 @@ Usage:
     # - SSE: mcp.run(transport="sse", host="0.0.0.0", port=8000)
 """
 
-from typing import Any, Dict, List, Optional
+import functools
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP
+from mcp.types import TextContent
 
+from ..config import get_settings
 from ..indicators import registry
-from ..models.market_data import MarketData
+from ..execution import resolve_spec_keys, run_indicator_set
+from ..metrics import current_transport, get_metrics
+from ..models.market_data import Precision
+from ..profiling import run_with_profile
+from ..projection import Projection, project
+from ..schemas import IndicatorSpec
+from ..serialization import dumps
+from ..store import get_series_store, resolve_market_data
+from ..subscriptions import get_subscription_hub
+from ..sweep import run_sweep
+from ..timing import current_timings, span, timed
 
 
 # Tool definitions: indicator name, description, and parameter specifications
@@ -160,35 +175,186 @@ async def _calculate_indicator(
     indicator_name: str,
     market_data_kwargs: Dict[str, List[float]],
     indicator_opts: Dict[str, Any],
+    series: Optional[str] = None,
+    precision: Optional[Precision] = None,
+    projection: Optional[Projection] = None,
+    profile: bool = False,
 ) -> Dict[str, Any]:
     """Helper function to calculate any indicator.
     
     Args:
         indicator_name: Name of the indicator to calculate
-        market_data_kwargs: Keyword arguments for MarketData (close, high, low, etc.)
+        market_data_kwargs: Keyword arguments for ColumnarMarketData (close, high, low, etc.)
         indicator_opts: Options/parameters for the indicator
+        series: Handle of a stored series to use instead of market_data_kwargs
+        precision: "float32" to compute on and return float32 values
+        projection: Outputs and bars of the result to return; all of them by default
+        profile: Profile the calculation (see `mcp_talib.profiling`)
         
     Returns:
         Dictionary with success status, values, and metadata or error message
     """
+    if projection is None:
+        projection = Projection()
     try:
         indicator = registry.get_indicator(indicator_name)
         if not indicator:
             raise ValueError(f"{indicator_name.upper()} indicator not found")
         
-        market_data = MarketData(**market_data_kwargs)
-        result = await indicator.calculate(market_data, indicator_opts)
-        
-        if result.success:
-            return {
-                "success": True,
-                "values": result.values,
-                "metadata": result.metadata,
-            }
+        with span("convert"):
+            market_data = resolve_market_data(series, precision, **market_data_kwargs)
+        with span("calculate"):
+            result, profiled = await run_with_profile(indicator, market_data, indicator_opts, profile)
+        with span("project"):
+            result = project(result, projection)
+        timings = current_timings()
+        if timings is not None and result.success and get_settings().timing_metadata:
+            result = result.model_copy(update={"metadata": {**(result.metadata or {}), "timing": timings.durations()}})
+        response = _result_to_response(result)
+        if profiled is not None:
+            response["profile"] = profiled.to_dict()
+        return response
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+        }
+
+
+def _result_to_response(result: Any) -> Dict[str, Any]:
+    """Shape an IndicatorResult as an MCP tool response.
+
+    Output arrays are kept as ndarrays; `_json_tool` writes them.
+    """
+    if result.success:
+        return {
+            "success": True,
+            "values": result.values,
+            "metadata": result.metadata,
+        }
+    return {
+        "success": False,
+        "error": getattr(result, "error_message", result.error if hasattr(result, "error") else "Unknown error"),
+    }
+
+
+async def calculate_multi(
+    indicators: List[IndicatorSpec],
+    close: Optional[List[float]] = None,
+    high: Optional[List[float]] = None,
+    low: Optional[List[float]] = None,
+    open: Optional[List[float]] = None,
+    volume: Optional[List[float]] = None,
+    series: Optional[str] = None,
+    precision: Optional[Precision] = None,
+    drop_lookback: bool = False,
+    tail: Optional[int] = None,
+    slice: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Calculate several indicators over one shared OHLCV series.
+
+    Each spec is `{"indicator": name, "params": {...}, "key": optional,
+    "outputs": optional}`; results are keyed by `key`, defaulting to the
+    indicator name, and `outputs` keeps only the named output series. Pass
+    `series` (a stored series handle) instead of the columns to reuse data
+    saved with store_series. precision="float32" returns values with 7
+    significant digits. drop_lookback=true drops leading NaN bars, and
+    tail=N or slice="start:end" return only those bars.
+    """
+    try:
+        keys = resolve_spec_keys([(spec.key, spec.indicator) for spec in indicators])
+        market_data = resolve_market_data(
+            series, precision, close=close, high=high, low=low, open=open, volume=volume
+        )
+
+        specs = [(key, spec.indicator, spec.params) for key, spec in zip(keys, indicators)]
+        results = await run_indicator_set(market_data, specs)
+
+        projections = {
+            key: Projection.from_options(spec.outputs, drop_lookback, tail, slice)
+            for key, spec in zip(keys, indicators)
+        }
+        responses = {key: _result_to_response(project(result, projections[key])) for key, result in results.items()}
+        return {
+            "success": all(r["success"] for r in responses.values()),
+            "results": responses,
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+        }
+
+
+async def sweep_indicator(
+    indicator: str,
+    grid: Dict[str, Any],
+    params: Optional[Dict[str, Any]] = None,
+    close: Optional[List[float]] = None,
+    high: Optional[List[float]] = None,
+    low: Optional[List[float]] = None,
+    open: Optional[List[float]] = None,
+    volume: Optional[List[float]] = None,
+    series: Optional[str] = None,
+    precision: Optional[Precision] = None,
+    outputs: Optional[List[str]] = None,
+    drop_lookback: bool = False,
+    tail: Optional[int] = None,
+    slice: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Evaluate one indicator over a grid of parameter values.
+
+    Each grid axis is a list of values or a {"start", "stop", "step"} range
+    (stop inclusive), e.g. {"timeperiod": {"start": 5, "stop": 200}}. Each
+    output is a matrix with one row per grid point, listed in
+    metadata.points, and one column per input bar. Pass `series` (a stored
+    series handle) instead of the columns to reuse stored data, and
+    precision="float32" for 7-significant-digit values. `outputs`,
+    drop_lookback, tail and slice select outputs and bars as in the
+    calculate_* tools.
+    """
+    try:
+        projection = Projection.from_options(outputs, drop_lookback, tail, slice)
+        market_data = resolve_market_data(series, precision, close=close, high=high, low=low, open=open, volume=volume)
+        result = await run_sweep(indicator, market_data, grid, params)
+        return _result_to_response(project(result, projection))
+    except Exception as e:
         return {
             "success": False,
-            "error": getattr(result, "error_message", result.error if hasattr(result, "error") else "Unknown error"),
+            "error": str(e),
         }
+
+
+async def store_series(
+    name: str,
+    close: Optional[List[float]] = None,
+    high: Optional[List[float]] = None,
+    low: Optional[List[float]] = None,
+    open: Optional[List[float]] = None,
+    volume: Optional[List[float]] = None,
+    append: bool = False,
+    precision: Optional[Precision] = None,
+) -> Dict[str, Any]:
+    """Store an OHLCV series server-side under `name`.
+
+    With append=true the bars are added to the end of an existing series
+    (which is created if missing). Afterwards pass series=name to any
+    calculate_* tool instead of re-sending the arrays; the data is also
+    readable as the resource series://{name}. precision="float32" stores
+    the series in half the memory, and indicators on it return float32
+    values.
+    """
+    try:
+        market_data = resolve_market_data(None, precision, close=close, high=high, low=low, open=open, volume=volume)
+        store = get_series_store()
+        hub = get_subscription_hub()
+        if append:
+            info = store.append(name, market_data)
+            hub.publish(name, market_data)
+        else:
+            info = store.put(name, market_data)
+            hub.reset(name)
+        return {"success": True, "series": info}
     except Exception as e:
         return {
             "success": False,
@@ -196,6 +362,77 @@ async def _calculate_indicator(
         }
 
 
+async def list_series() -> Dict[str, Any]:
+    """List the series stored server-side, with their lengths and columns."""
+    return {"success": True, "series": get_series_store().list()}
+
+
+async def delete_series(name: str) -> Dict[str, Any]:
+    """Delete a stored series."""
+    if not get_series_store().delete(name):
+        return {"success": False, "error": f"series '{name}' not found"}
+    # Subscriptions of a deleted series cannot warm up again, so they close
+    get_subscription_hub().reset(name)
+    return {"success": True}
+
+
+def read_series(name: str) -> str:
+    """Stored OHLCV series, as its description plus the column data."""
+    store = get_series_store()
+    market_data = store.get(name)
+    info = store.info(name)
+    data = {column: getattr(market_data, column) for column in info["columns"]}
+    return dumps({**info, "data": data}).decode()
+
+
+def read_metrics() -> str:
+    """Request, calculation and cache metrics in the Prometheus text format."""
+    return get_metrics().render()
+
+
+def _json_tool(fn: Callable[..., Awaitable[Dict[str, Any]]]) -> Callable[..., Awaitable[TextContent]]:
+    """Wrap a tool so its response is one JSON text block written by `dumps`.
+
+    Register the wrapper with ``structured_output=False``. FastMCP would
+    otherwise validate the returned dict against an output schema, send it
+    a second time as structured content, and pretty-print it itself.
+
+    The call is recorded in the process metrics under the tool's name and
+    timed stage by stage (see `mcp_talib.timing`).
+    """
+
+    @functools.wraps(fn)
+    async def tool(*args: Any, **kwargs: Any) -> TextContent:
+        started = time.perf_counter()
+        ok, encoded = False, None
+        try:
+            with timed(current_transport.get(), fn.__name__):
+                payload = await fn(*args, **kwargs)
+                ok = payload.get("success", True) is not False
+                with span("encode"):
+                    encoded = dumps(payload)
+            return TextContent(type="text", text=encoded.decode())
+        finally:
+            get_metrics().observe_request(
+                current_transport.get(),
+                fn.__name__,
+                time.perf_counter() - started,
+                ok=ok,
+                bytes_out=len(encoded) if encoded is not None else None,
+            )
+
+    return tool
+
+
+# Projection options of the calculate_* tools, in `Projection.from_options` order
+_PROJECTION_PARAMS = {
+    "outputs": (Optional[List[str]], None),
+    "drop_lookback": (bool, False),
+    "tail": (Optional[int], None),
+    "slice": (Optional[str], None),
+}
+
+
 def _create_tool_function(indicator_name: str, spec: Dict[str, Any]):
     """Factory function to create tool functions dynamically.
     
@@ -207,6 +444,14 @@ def _create_tool_function(indicator_name: str, spec: Dict[str, Any]):
         Async tool function ready to be registered with @mcp.tool()
     """
     async def tool_func(**kwargs) -> Dict[str, Any]:
+        series = kwargs.pop("series", None)
+        precision = kwargs.pop("precision", None)
+        profile = kwargs.pop("profile", False)
+        try:
+            projection = Projection.from_options(*(kwargs.pop(name, None) for name in _PROJECTION_PARAMS))
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+
         # Extract market data arguments
         market_data_kwargs = {}
         indicator_opts = {}
@@ -220,11 +465,39 @@ def _create_tool_function(indicator_name: str, spec: Dict[str, Any]):
             if key not in spec["market_data_args"].values():
                 indicator_opts[key] = value
         
-        return await _calculate_indicator(indicator_name, market_data_kwargs, indicator_opts)
+        return await _calculate_indicator(
+            indicator_name, market_data_kwargs, indicator_opts, series, precision, projection, profile
+        )
     
     # Set function name and docstring for better introspection
     tool_func.__name__ = f"calculate_{indicator_name}"
-    tool_func.__doc__ = f"Calculate {spec['description']}."
+    tool_func.__doc__ = (
+        f"Calculate {spec['description']}. Pass the price arrays, or `series` "
+        "with the name of a series saved by store_series. precision=\"float32\" "
+        "returns values with 7 significant digits. `outputs` keeps only the named "
+        "output series, drop_lookback=true drops leading NaN bars, and tail=N or "
+        "slice=\"start:end\" return only those bars; metadata.offset is the input "
+        "bar of the first value. profile=true, where the server allows it, adds "
+        "a `profile` with the calculation's hot functions and collapsed stacks."
+    )
+    # FastMCP builds the tool's input schema from the signature, so expose
+    # the spec's parameters rather than `**kwargs`. Price arrays become
+    # optional because a stored series can supply them instead.
+    parameters = []
+    for param, annotation in spec["params"].items():
+        if param in spec["market_data_args"].values():
+            annotation, default = Optional[annotation], None
+        else:
+            default = spec["defaults"].get(param, inspect.Parameter.empty)
+        parameters.append(inspect.Parameter(param, inspect.Parameter.KEYWORD_ONLY, default=default, annotation=annotation))
+    parameters.append(inspect.Parameter("series", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[str]))
+    parameters.append(
+        inspect.Parameter("precision", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[Precision])
+    )
+    for name, (annotation, default) in _PROJECTION_PARAMS.items():
+        parameters.append(inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, default=default, annotation=annotation))
+    parameters.append(inspect.Parameter("profile", inspect.Parameter.KEYWORD_ONLY, default=False, annotation=bool))
+    tool_func.__signature__ = inspect.Signature(parameters, return_annotation=Dict[str, Any])
     
     return tool_func
 
@@ -247,6 +520,11 @@ def create_mcp_server() -> FastMCP:
     # Dynamically register all indicator tools
     for indicator_name, spec in TOOL_SPECS.items():
         tool_func = _create_tool_function(indicator_name, spec)
-        mcp.add_tool(tool_func)
+        mcp.add_tool(_json_tool(tool_func), structured_output=False)
+    
+    for tool_func in (calculate_multi, sweep_indicator, store_series, list_series, delete_series):
+        mcp.add_tool(_json_tool(tool_func), structured_output=False)
+    mcp.resource("series://{name}", mime_type="application/json")(read_series)
+    mcp.resource("metrics://prometheus", mime_type="text/plain")(read_metrics)
     
     return mcp
@@ -4,7 +4,9 @@ from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP
 
 from ..indicators import registry
-from ..models.market_data import MarketData
+from ..models.market_data import ColumnarMarketData
+from ..execution import run_indicator
+from ..serialization import to_builtin
 
 
 def create_server() -> FastMCP:
@@ -32,15 +34,15 @@ def create_server() -> FastMCP:
                 raise ValueError("SMA indicator not found")
             
             # Create market data
-            market_data = MarketData(close=close)
+            market_data = ColumnarMarketData(close=close)
             
             # Calculate indicator
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             
             if result.success:
                 return {
                     "success": True,
-                    "values": result.values,
+                    "values": to_builtin(result.values),
                     "metadata": result.metadata,
                 }
             else:
@@ -76,15 +78,15 @@ def create_server() -> FastMCP:
                 raise ValueError("EMA indicator not found")
             
             # Create market data
-            market_data = MarketData(close=close)
+            market_data = ColumnarMarketData(close=close)
             
             # Calculate indicator
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             
             if result.success:
                 return {
                     "success": True,
-                    "values": result.values,
+                    "values": to_builtin(result.values),
                     "metadata": result.metadata,
                 }
             else:
@@ -120,15 +122,15 @@ def create_server() -> FastMCP:
                 raise ValueError("RSI indicator not found")
             
             # Create market data
-            market_data = MarketData(close=close)
+            market_data = ColumnarMarketData(close=close)
             
             # Calculate indicator
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             
             if result.success:
                 return {
                     "success": True,
-                    "values": result.values,
+                    "values": to_builtin(result.values),
                     "metadata": result.metadata,
                 }
             else:
@@ -155,10 +157,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("bbands")
             if not indicator:
                 raise ValueError("BBANDS indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod, "nbdevup": nbdevup, "nbdevdn": nbdevdn, "matype": matype})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod, "nbdevup": nbdevup, "nbdevdn": nbdevdn, "matype": matype})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -169,10 +171,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("dema")
             if not indicator:
                 raise ValueError("DEMA indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -183,10 +185,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("ht_trendline")
             if not indicator:
                 raise ValueError("HT_TRENDLINE indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -197,10 +199,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("kama")
             if not indicator:
                 raise ValueError("KAMA indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -211,10 +213,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("ma")
             if not indicator:
                 raise ValueError("MA indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod, "matype": matype})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod, "matype": matype})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -225,10 +227,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("mama")
             if not indicator:
                 raise ValueError("MAMA indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"fastlimit": fastlimit, "slowlimit": slowlimit})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"fastlimit": fastlimit, "slowlimit": slowlimit})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -239,11 +241,11 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("mavp")
             if not indicator:
                 raise ValueError("MAVP indicator not found")
-            market_data = MarketData(close=close)
+            market_data = ColumnarMarketData(close=close)
             opts = {"periods": periods, "minperiod": minperiod, "maxperiod": maxperiod}
-            result = await indicator.calculate(market_data, opts)
+            result = await run_indicator(indicator, market_data, opts)
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -254,10 +256,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("midpoint")
             if not indicator:
                 raise ValueError("MIDPOINT indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -268,10 +270,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("midprice")
             if not indicator:
                 raise ValueError("MIDPRICE indicator not found")
-            market_data = MarketData(close=[0], high=high, low=low)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            market_data = ColumnarMarketData(high=high, low=low)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -282,10 +284,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("sar")
             if not indicator:
                 raise ValueError("SAR indicator not found")
-            market_data = MarketData(close=[0], high=high, low=low)
-            result = await indicator.calculate(market_data, {"acceleration": acceleration, "maximum": maximum})
+            market_data = ColumnarMarketData(high=high, low=low)
+            result = await run_indicator(indicator, market_data, {"acceleration": acceleration, "maximum": maximum})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -296,11 +298,11 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("sarext")
             if not indicator:
                 raise ValueError("SAREXT indicator not found")
-            market_data = MarketData(close=[0], high=high, low=low)
+            market_data = ColumnarMarketData(high=high, low=low)
             opts = {"startvalue": startvalue, "offsetonreverse": offsetonreverse, "acceleration_initlong": acceleration_initlong, "acceleration_long": acceleration_long, "acceleration_maxlong": acceleration_maxlong, "acceleration_initshort": acceleration_initshort, "acceleration_short": acceleration_short, "acceleration_maxshort": acceleration_maxshort}
-            result = await indicator.calculate(market_data, opts)
+            result = await run_indicator(indicator, market_data, opts)
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -311,10 +313,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("t3")
             if not indicator:
                 raise ValueError("T3 indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod, "vfactor": vfactor})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod, "vfactor": vfactor})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -325,10 +327,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("tema")
             if not indicator:
                 raise ValueError("TEMA indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -339,10 +341,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("trima")
             if not indicator:
                 raise ValueError("TRIMA indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -353,10 +355,10 @@ def create_server() -> FastMCP:
             indicator = registry.get_indicator("wma")
             if not indicator:
                 raise ValueError("WMA indicator not found")
-            market_data = MarketData(close=close)
-            result = await indicator.calculate(market_data, {"timeperiod": timeperiod})
+            market_data = ColumnarMarketData(close=close)
+            result = await run_indicator(indicator, market_data, {"timeperiod": timeperiod})
             if result.success:
-                return {"success": True, "values": result.values, "metadata": result.metadata}
+                return {"success": True, "values": to_builtin(result.values), "metadata": result.metadata}
             return {"success": False, "error": result.error_message}
         except Exception as e:
             return {"success": False, "error": str(e)}
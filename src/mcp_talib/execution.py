@@ -0,0 +1,167 @@
+"""Shared execution path for indicator calculations.
+
+The HTTP API, MCP tools and CLI all run indicators through `run_indicator`
+(or `run_indicators` for several on one series) so behaviour that applies
+to every calculation, caching and where it runs, lives in one place.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+
+import numpy as np
+
+from .cache import get_result_cache
+from .executors import get_executor
+from .indicators import registry
+from .indicators.base import BaseIndicator
+from .metrics import get_metrics
+from .models.indicator_result import IndicatorResult
+from .models.market_data import PRECISIONS, Precision
+
+T = TypeVar("T")
+
+
+async def run_indicator(
+    indicator: BaseIndicator,
+    market_data: Any,
+    options: Optional[Dict[str, Any]] = None,
+) -> IndicatorResult:
+    """Calculate ``indicator`` on ``market_data`` with ``options``.
+
+    Successful results are served from and stored in the shared result
+    cache, keyed by the input contents and the options.
+    """
+    return (await run_indicators(market_data, [(indicator, options or {})]))[0]
+
+
+async def run_indicators(
+    market_data: Any,
+    jobs: Sequence[Tuple[BaseIndicator, Dict[str, Any]]],
+) -> List[IndicatorResult]:
+    """Calculate several ``(indicator, options)`` jobs on one series.
+
+    Jobs answered by the result cache are not recalculated; the rest are
+    handed to the configured executor as one batch, which shares
+    intermediate series between them. Every result is recorded in the
+    process metrics.
+    """
+    cache = get_result_cache()
+    results: List[Optional[IndicatorResult]] = [None] * len(jobs)
+    keys: List[Optional[bytes]] = [None] * len(jobs)
+    pending: List[int] = []
+    for index, (indicator, options) in enumerate(jobs):
+        name = getattr(indicator, "name", None)
+        if cache.enabled and name is not None:
+            keys[index] = cache.key(name, market_data, options)
+            cached = cache.get(keys[index])
+            if cached is not None:
+                results[index] = cached
+                continue
+        pending.append(index)
+
+    if pending:
+        computed = await get_executor().run(market_data, [jobs[index] for index in pending])
+        for index, result in zip(pending, computed):
+            results[index] = result = match_input_precision(market_data, result)
+            if keys[index] is not None and isinstance(result, IndicatorResult) and result.success:
+                cache.put(keys[index], result)
+    observe_results(market_data, results, set(pending))
+    return results
+
+
+def match_input_precision(market_data: Any, result: IndicatorResult) -> IndicatorResult:
+    """`with_output_precision` at the precision of ``market_data``, if not float64."""
+    precision = getattr(market_data, "precision", "float64")
+    if precision != "float64" and isinstance(result, IndicatorResult):
+        return with_output_precision(result, precision)
+    return result
+
+
+def observe_results(market_data: Any, results: Sequence[Optional[IndicatorResult]], computed: Set[int]) -> None:
+    """Record ``results`` in the process metrics; those at ``computed`` indices were calculated."""
+    metrics = get_metrics()
+    length = getattr(market_data, "length", None)
+    for index, result in enumerate(results):
+        if not isinstance(result, IndicatorResult) or not result.success:
+            continue
+        metadata = result.metadata or {}
+        fresh = index in computed and result.calculation_time is not None
+        metrics.observe_calculation(
+            result.indicator_name,
+            metadata.get("input_points", length),
+            metadata.get("output_points"),
+            result.calculation_time / 1000 if fresh else None,
+        )
+
+
+def with_output_precision(result: IndicatorResult, precision: Precision) -> IndicatorResult:
+    """Store ``result``'s floating-point outputs at ``precision``.
+
+    Indicators compute in float64; float32 inputs get float32 outputs, so
+    cached results and responses shrink like the input did.
+    """
+    dtype = PRECISIONS[precision]
+    values = {
+        key: value.astype(dtype) if isinstance(value, np.ndarray) and value.dtype.kind == "f" else value
+        for key, value in result.values.items()
+    }
+    return result.model_copy(update={"values": values})
+
+
+async def gather_bounded(awaitables: Iterable[Awaitable[T]], limit: int) -> List[T]:
+    """Await ``awaitables`` with at most ``limit`` in flight, preserving order."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def bounded(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(bounded(a) for a in awaitables))
+
+
+def resolve_spec_keys(specs: Sequence[Tuple[Optional[str], str]]) -> List[str]:
+    """Return the result key of each ``(key, indicator)`` spec.
+
+    A spec without an explicit key is keyed by its indicator name. Keys
+    must be unique, so asking for the same indicator twice requires keys.
+    """
+    keys: List[str] = []
+    for key, indicator_name in specs:
+        key = key or indicator_name
+        if key in keys:
+            raise ValueError(f"duplicate result key '{key}'; set a distinct `key` on each spec")
+        keys.append(key)
+    return keys
+
+
+async def run_indicator_set(
+    market_data: Any,
+    specs: Iterable[Tuple[str, str, Dict[str, Any]]],
+) -> Dict[str, IndicatorResult]:
+    """Run several ``(key, indicator name, options)`` specs on one series.
+
+    The market data is built once by the caller and shared by every spec,
+    so the input is parsed and converted a single time per request, and
+    intermediate series (nested EMAs, moving averages) are computed once
+    for all specs that need them.
+    """
+    results: Dict[str, IndicatorResult] = {}
+    jobs: List[Tuple[BaseIndicator, Dict[str, Any]]] = []
+    job_keys: List[str] = []
+    for key, indicator_name, options in specs:
+        indicator = registry.get_indicator(indicator_name)
+        if not indicator:
+            results[key] = IndicatorResult(
+                indicator_name=indicator_name,
+                success=False,
+                values={},
+                error_message="tool not found",
+            )
+            continue
+        # Placeholder keeps the response in request order
+        results[key] = None
+        jobs.append((indicator, options))
+        job_keys.append(key)
+    for key, result in zip(job_keys, await run_indicators(market_data, jobs)):
+        results[key] = result
+    return results
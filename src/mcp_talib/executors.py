@@ -0,0 +1,457 @@
+"""Where indicator calculations run.
+
+Indicator adapters are ``async`` but do their numeric work synchronously,
+so a long calculation awaited on the event loop stalls every other request
+the server is handling. `execution.run_indicators` hands its cache misses
+to the executor selected by ``Settings.executor``:
+
+``inline``
+    Calculate on the calling event loop (the default).
+``process``
+    Calculate in a pool of worker processes. Input columns are copied into
+    one shared-memory block that the worker maps without copying, and the
+    worker writes its output arrays into another block that the caller
+    copies out; only names, options and metadata are pickled. Blocks are
+    reused across calls, since faulting in fresh pages costs more than
+    many indicators. Workers are
+    started and have imported TA-Lib before the first request, and each
+    job runs all the indicators of one request in a single worker so
+    intermediate series are still shared between them.
+``thread``
+    Calculate indicators whose heavy work releases the GIL
+    (`indicators.base.releases_gil`) on a thread pool, and send the others
+    to the process pool. Threads share the caller's memory, so nothing is
+    copied. The TA-Lib adapters are threaded when the installed binding
+    runs its C routines without the GIL, which `talib_releases_gil`
+    measures once when the executor starts; older bindings hold it, and
+    then only the NumPy-based SMA is threaded.
+
+Inputs shorter than ``Settings.offload_min_points`` always run inline:
+below that, dispatching to another process costs more than the
+calculation.
+"""
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import get_settings
+from .indicators import registry
+from .indicators.base import BaseIndicator, releases_gil, talib_releases_gil
+from .indicators.shared import shared_scope
+from .models.indicator_result import IndicatorResult
+from .models.market_data import ColumnarMarketData
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ("inline", "process", "thread")
+
+_COLUMNS = ("close", "open", "high", "low", "volume", "timestamp")
+
+# (key, offset, dtype, shape) of each array packed into a block
+_Layout = List[Tuple[str, int, str, Tuple[int, ...]]]
+
+Job = Tuple[BaseIndicator, Dict[str, Any]]
+
+
+async def _calculate(indicator: BaseIndicator, market_data: Any, options: Dict[str, Any]) -> IndicatorResult:
+    """Run one job and record its `IndicatorResult.calculation_time`."""
+    started = time.perf_counter()
+    result = await indicator.calculate(market_data, options)
+    if isinstance(result, IndicatorResult) and result.calculation_time is None:
+        result.calculation_time = (time.perf_counter() - started) * 1000
+    return result
+
+
+class InlineExecutor:
+    """Run calculations on the calling event loop."""
+
+    name = "inline"
+
+    async def run(self, market_data: Any, jobs: Sequence[Job]) -> List[IndicatorResult]:
+        """Calculate each ``(indicator, options)`` job on ``market_data``."""
+        with shared_scope():
+            return [await _calculate(indicator, market_data, options) for indicator, options in jobs]
+
+    def start(self) -> None:
+        """Nothing to start; present for symmetry with the pool executors."""
+
+    def shutdown(self) -> None:
+        """Nothing to stop."""
+
+
+def _create_block(size: int) -> shared_memory.SharedMemory:
+    return shared_memory.SharedMemory(create=True, size=size)
+
+
+def _pack(
+    arrays: Sequence[Tuple[str, np.ndarray]],
+    allocate: Callable[[int], shared_memory.SharedMemory] = _create_block,
+) -> Tuple[Optional[shared_memory.SharedMemory], _Layout]:
+    """Copy ``arrays`` into one shared-memory block, 8-byte aligned."""
+    layout: _Layout = []
+    size = 0
+    for key, array in arrays:
+        layout.append((key, size, array.dtype.str, array.shape))
+        size += (array.nbytes + 7) & ~7
+    if size == 0:
+        return None, layout
+    block = allocate(size)
+    for (_, offset, dtype, shape), (_, array) in zip(layout, arrays):
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)[...] = array
+    return block, layout
+
+
+def _views(block: Optional[shared_memory.SharedMemory], layout: _Layout) -> Dict[str, np.ndarray]:
+    return {
+        key: np.ndarray(shape, dtype=dtype, buffer=block.buf if block is not None else b"", offset=offset)
+        for key, offset, dtype, shape in layout
+    }
+
+
+def _attach(name: Optional[str]) -> Optional[shared_memory.SharedMemory]:
+    return shared_memory.SharedMemory(name=name) if name is not None else None
+
+
+def _release(block: Optional[shared_memory.SharedMemory], unlink: bool = False) -> None:
+    if block is None:
+        return
+    block.close()
+    if unlink:
+        block.unlink()
+
+
+class _BlockPool:
+    """Shared-memory blocks kept for reuse.
+
+    Writing into a fresh block faults in every page, which costs about as
+    much as a fast indicator on the same data; reused blocks are already
+    mapped.
+    """
+
+    def __init__(self, keep: int):
+        self.keep = keep
+        self._free: List[shared_memory.SharedMemory] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int) -> shared_memory.SharedMemory:
+        with self._lock:
+            # Smallest free block that fits, unless it would waste over half
+            fits = [block for block in self._free if size <= block.size <= 2 * size]
+            if fits:
+                block = min(fits, key=lambda b: b.size)
+                self._free.remove(block)
+                return block
+        return _create_block(size)
+
+    def release(self, block: Optional[shared_memory.SharedMemory]) -> None:
+        if block is None:
+            return
+        with self._lock:
+            if len(self._free) < self.keep:
+                self._free.append(block)
+                return
+        _release(block, unlink=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            blocks, self._free = self._free, []
+        for block in blocks:
+            _release(block, unlink=True)
+
+
+def _calculate_batch(market_data: Any, jobs: Sequence[Job]) -> List[IndicatorResult]:
+    """Run ``jobs`` synchronously, sharing intermediate series; used off the
+    event loop, on worker threads and in worker processes."""
+    loop = asyncio.new_event_loop()
+    try:
+        with shared_scope():
+            return [loop.run_until_complete(_calculate(indicator, market_data, options)) for indicator, options in jobs]
+    finally:
+        loop.close()
+
+
+# Blocks a worker has mapped, by name. The caller reuses its blocks, and
+# mapping one again would fault in every page again.
+_worker_blocks: "OrderedDict[str, shared_memory.SharedMemory]" = OrderedDict()
+_WORKER_BLOCKS = 8
+
+
+def _attach_cached(name: Optional[str]) -> Optional[shared_memory.SharedMemory]:
+    if name is None:
+        return None
+    block = _worker_blocks.get(name)
+    if block is None:
+        block = _worker_blocks[name] = shared_memory.SharedMemory(name=name)
+        while len(_worker_blocks) > _WORKER_BLOCKS:
+            _release(_worker_blocks.popitem(last=False)[1])
+    _worker_blocks.move_to_end(name)
+    return block
+
+
+def _init_worker() -> None:
+    # Instantiate the adapters and touch TA-Lib once so the first real job
+    # does not pay for imports and lazy initialization
+    registry.get_indicators()
+    import talib
+
+    talib.SMA(np.arange(8, dtype=np.float64), timeperiod=2)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _calculate_in_worker(
+    block_name: Optional[str],
+    layout: _Layout,
+    jobs: Sequence[Tuple[str, Dict[str, Any]]],
+    spare_name: Optional[str],
+) -> Tuple[Optional[str], _Layout, List[Dict[str, Any]]]:
+    """Worker side of `ProcessExecutor.run`.
+
+    Outputs are written into the caller's ``spare`` block when they fit,
+    otherwise into a new one. Returns the name and layout of the output
+    block plus, per job, the result fields other than the output arrays
+    (which the block holds).
+    """
+    block = _attach_cached(block_name)
+    spare = _attach_cached(spare_name)
+    out = None
+    try:
+        market_data = ColumnarMarketData.model_construct(**_views(block, layout))
+        results = _calculate_batch(market_data, [(registry.get_indicator(name), options) for name, options in jobs])
+
+        arrays: List[Tuple[str, np.ndarray]] = []
+        fields: List[Dict[str, Any]] = []
+        for index, result in enumerate(results):
+            result_fields = result.model_dump(exclude={"values"})
+            result_fields["values"] = {k: v for k, v in result.values.items() if not isinstance(v, np.ndarray)}
+            result_fields["arrays"] = [k for k, v in result.values.items() if isinstance(v, np.ndarray)]
+            arrays.extend((f"{index}:{k}", result.values[k]) for k in result_fields["arrays"])
+            fields.append(result_fields)
+        # Outputs may be views of the input, so pack them before unmapping it
+        out, out_layout = _pack(
+            arrays, lambda size: spare if spare is not None and size <= spare.size else _create_block(size)
+        )
+    finally:
+        # Drop every view of the mapped blocks, which cannot be unmapped
+        # while one is alive
+        market_data = results = arrays = None
+
+    if out is None:
+        return None, out_layout, fields
+    if out is not spare:
+        # The caller copies the outputs out and then owns the block
+        out.close()
+    return out.name, out_layout, fields
+
+
+class ProcessExecutor:
+    """Run calculations in a pool of worker processes via shared memory."""
+
+    name = "process"
+
+    def __init__(self, workers: int = 0, min_points: int = 50_000):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_points = min_points
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inline = InlineExecutor()
+        # Input and output blocks for reuse, and the output size last seen
+        # for each combination of indicators
+        self._blocks = _BlockPool(keep=4 * self.workers)
+        self._output_sizes: Dict[Tuple[str, ...], int] = {}
+        # Jobs beyond the worker count wait here rather than in the pool's
+        # queue, so they do not hold a packed copy of their input meanwhile
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def start(self) -> ProcessPoolExecutor:
+        """Start the workers (if needed) and have each import TA-Lib now."""
+        with self._lock:
+            if self._pool is None:
+                # Spawned, not forked: the server process runs threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                for _ in range(self.workers):
+                    self._pool.submit(_ping)
+            return self._pool
+
+    def shutdown(self) -> None:
+        """Stop the workers; a later `run` starts a new pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        self._blocks.clear()
+
+    def offloads(self, market_data: Any, jobs: Sequence[Job]) -> bool:
+        """Whether ``jobs`` on ``market_data`` would run in a worker.
+
+        Only registered indicators on columnar input at least
+        ``min_points`` long are sent: workers look indicators up by name.
+        """
+        if not isinstance(market_data, ColumnarMarketData) or market_data.length < self.min_points:
+            return False
+        for indicator, _ in jobs:
+            name = getattr(indicator, "name", None)
+            if name is None or type(registry.get_indicator(name)) is not type(indicator):
+                return False
+        return True
+
+    async def run(self, market_data: Any, jobs: Sequence[Job]) -> List[IndicatorResult]:
+        """Calculate each ``(indicator, options)`` job on ``market_data``."""
+        if not jobs or not self.offloads(market_data, jobs):
+            return await self._inline.run(market_data, jobs)
+
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.workers)
+        async with slots:
+            return await self._offload(market_data, jobs)
+
+    async def _offload(self, market_data: ColumnarMarketData, jobs: Sequence[Job]) -> List[IndicatorResult]:
+        columns = [(name, getattr(market_data, name)) for name in _COLUMNS if getattr(market_data, name) is not None]
+        call = [(indicator.name, options) for indicator, options in jobs]
+        signature = tuple(name for name, _ in call)
+        block, layout = _pack(columns, self._blocks.acquire)
+        spare = None
+        try:
+            spare = self._blocks.acquire(self._output_sizes.get(signature) or 8 * len(jobs) * market_data.length)
+            pool = self.start()
+            try:
+                out_name, out_layout, fields = await asyncio.get_running_loop().run_in_executor(
+                    pool, _calculate_in_worker, block.name if block else None, layout, call, spare.name
+                )
+            except BrokenProcessPool:
+                logger.warning("indicator worker pool died; restarting it and running this request inline")
+                self.shutdown()
+                return await self._inline.run(market_data, jobs)
+            out = _attach(out_name) if out_name != spare.name else spare
+            if out is spare:
+                # The outputs are in the spare block, released once copied out
+                spare = None
+        finally:
+            self._blocks.release(block)
+            self._blocks.release(spare)
+
+        try:
+            # Copy the outputs out so the block can be reused right away
+            arrays = {key: view.copy() for key, view in _views(out, out_layout).items()}
+        finally:
+            self._blocks.release(out)
+        if len(self._output_sizes) >= 256:
+            self._output_sizes.clear()
+        self._output_sizes[signature] = out.size if out is not None else 8
+
+        results = []
+        for index, result_fields in enumerate(fields):
+            values = result_fields.pop("values")
+            for key in result_fields.pop("arrays"):
+                values[key] = arrays[f"{index}:{key}"]
+            results.append(IndicatorResult(values=values, **result_fields))
+        return results
+
+
+class ThreadExecutor:
+    """Run GIL-releasing calculations on threads and the rest on ``fallback``."""
+
+    name = "thread"
+
+    def __init__(self, workers: int = 0, min_points: int = 50_000, fallback: Optional[Any] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_points = min_points
+        self.fallback = fallback if fallback is not None else InlineExecutor()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> ThreadPoolExecutor:
+        """Start the thread pool and the fallback executor."""
+        # Measure TA-Lib's GIL handling now rather than during a request
+        talib_releases_gil()
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mcp-talib")
+            pool = self._pool
+        self.fallback.start()
+        return pool
+
+    def shutdown(self) -> None:
+        """Stop the threads and the fallback executor."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        self.fallback.shutdown()
+
+    def threads(self, market_data: Any, indicator: Any) -> bool:
+        """Whether ``indicator`` on ``market_data`` would run on a thread."""
+        return getattr(market_data, "length", 0) >= self.min_points and releases_gil(indicator)
+
+    async def run(self, market_data: Any, jobs: Sequence[Job]) -> List[IndicatorResult]:
+        """Calculate each ``(indicator, options)`` job on ``market_data``."""
+        threaded: List[int] = []
+        others: List[int] = []
+        for index, (indicator, _) in enumerate(jobs):
+            (threaded if self.threads(market_data, indicator) else others).append(index)
+        if not threaded:
+            return await self.fallback.run(market_data, jobs)
+
+        async def nothing() -> List[IndicatorResult]:
+            return []
+
+        pool = self.start()
+        on_threads, elsewhere = await asyncio.gather(
+            asyncio.get_running_loop().run_in_executor(
+                pool, _calculate_batch, market_data, [jobs[index] for index in threaded]
+            ),
+            self.fallback.run(market_data, [jobs[index] for index in others]) if others else nothing(),
+        )
+        results: List[Optional[IndicatorResult]] = [None] * len(jobs)
+        for index, result in zip(threaded + others, list(on_threads) + list(elsewhere)):
+            results[index] = result
+        return results
+
+
+_executor: Optional[Any] = None
+_executor_lock = threading.Lock()
+
+
+def create_executor(kind: str, workers: int = 0, min_points: int = 50_000) -> Any:
+    """Build an executor by name; raises ``ValueError`` for unknown kinds."""
+    if kind == "inline":
+        return InlineExecutor()
+    if kind == "process":
+        return ProcessExecutor(workers=workers, min_points=min_points)
+    if kind == "thread":
+        return ThreadExecutor(workers, min_points, fallback=ProcessExecutor(workers=workers, min_points=min_points))
+    raise ValueError(f"unknown executor '{kind}'; expected one of {', '.join(EXECUTORS)}")
+
+
+def get_executor() -> Any:
+    """Return the process-wide executor selected by the settings."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            settings = get_settings()
+            _executor = create_executor(settings.executor, settings.workers, settings.offload_min_points)
+            atexit.register(_executor.shutdown)
+        return _executor
@@ -8,13 +8,19 @@ other MCP clients continue to work.
 
 from typing import Any, Dict, List
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from mcp.server.fastmcp import FastMCP
 
 from .indicators import registry
-from .models.market_data import MarketData
-from .schemas import ToolRequest, ToolResult
+from .metrics import CONTENT_TYPE, MetricsMiddleware, get_metrics
+from .profiling import PROFILE_HEADER, PROFILE_ID_HEADER, ProfilingDisabledError, load_profile, run_with_profile, wants_profile
+from .projection import project
+from .schemas import PROJECTION_FIELDS, ToolRequest, ToolResult
+from .serialization import FastJSONResponse, result_to_payload
+from .store import SeriesNotFoundError, resolve_market_data
+from .timing import ServerTimingMiddleware, mark, span
 
 
 def create_http_app(mcp: FastMCP) -> FastAPI:
@@ -23,47 +29,71 @@ def create_http_app(mcp: FastMCP) -> FastAPI:
     - POST `/api/tools/{tool_name}`: JSON body with `close` (list of floats)
       and other parameters passed to the indicator.
     - GET `/api/tools`: list available tools
+    - GET `/api/profiles/{profile_id}`: a stored profile of a tool call
     """
 
-    api = FastAPI(title="mcp-talib HTTP API", docs_url="/docs", redoc_url=None)
+    api = FastAPI(
+        title="mcp-talib HTTP API", docs_url="/docs", redoc_url=None, default_response_class=FastJSONResponse
+    )
 
     api.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],  # tighten for production
         allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
         allow_headers=["*"],
-        expose_headers=["mcp-session-id"],
+        expose_headers=["mcp-session-id", PROFILE_ID_HEADER],
         max_age=3600,
     )
+    api.add_middleware(ServerTimingMiddleware, transport="http")
+    api.add_middleware(MetricsMiddleware, transport="http")
 
     @api.post("/api/tools/{tool_name}", response_model=ToolResult)
-    async def call_tool(tool_name: str, payload: ToolRequest):
+    async def call_tool(tool_name: str, payload: ToolRequest, request: Request):
         """Generic wrapper to call a registered indicator.
 
-        Expected JSON shape: { "close": [...], ...params }
+        Expected JSON shape: { "close": [...], ...params }. With profiling
+        enabled, an `X-Profile: 1` header profiles the calculation (see
+        `mcp_talib.profiling`).
         """
+        # FastAPI has read and validated the body before calling us
+        mark("parse")
         indicator = registry.get_indicator(tool_name)
         if not indicator:
             raise HTTPException(status_code=404, detail="tool not found")
 
-        # Use validated close list from the Pydantic model and forward extra
-        close = payload.close
-        params = {k: v for k, v in payload.model_dump().items() if k != "close"}
-
-        market_data = MarketData(close=close)
-
-        result = await indicator.calculate(market_data, params or {})
-
-        # Normalize result into strict ToolResult JSON
-        if getattr(result, "success", False):
-            # Keep the full values payload (list or dict) as-is so clients can
-            # access both series and named series objects like {"sma": [...]}.
-            values = result.values if isinstance(result.values, (list, dict)) else None
-            metadata = result.metadata if isinstance(result.metadata, dict) else None
-            return ToolResult(success=True, values=values, metadata=metadata)
-
-        err = getattr(result, "error", None) or "calculation error"
-        return ToolResult(success=False, error=str(err))
+        # Use validated close list (or stored series) from the Pydantic model
+        # and forward extra fields as indicator params
+        params = payload.model_dump(exclude={"close", "series", "precision", *PROJECTION_FIELDS})
+
+        try:
+            with span("convert"):
+                market_data = resolve_market_data(payload.series, payload.precision, close=payload.close)
+        except SeriesNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e)) from e
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+
+        try:
+            with span("calculate"):
+                result, profile = await run_with_profile(
+                    indicator, market_data, params or {}, wants_profile(request.headers.get(PROFILE_HEADER))
+                )
+        except ProfilingDisabledError as e:
+            raise HTTPException(status_code=403, detail=str(e)) from e
+        try:
+            with span("project"):
+                result = project(result, payload.projection())
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+
+        # Normalize result into strict ToolResult JSON, written straight from
+        # the output arrays rather than re-validated through `response_model`,
+        # which still documents the response shape.
+        with span("encode"):
+            response = FastJSONResponse(result_to_payload(result, builtin=False))
+        if profile is not None:
+            response.headers[PROFILE_ID_HEADER] = profile.id
+        return response
 
     @api.get("/api/tools")
     async def list_tools() -> Dict[str, List[str]]:
@@ -71,6 +101,21 @@ def create_http_app(mcp: FastMCP) -> FastAPI:
         tools = registry.list_indicators()
         return {"tools": tools}
 
+    @api.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Request, calculation and cache metrics in the Prometheus text format."""
+        return Response(get_metrics().render(), media_type=CONTENT_TYPE)
+
+    @api.get("/api/profiles/{profile_id}")
+    async def get_profile(profile_id: str) -> Dict[str, str]:
+        """A stored profile: its hot-function `table` and `collapsed` stacks."""
+        try:
+            return load_profile(profile_id)
+        except ProfilingDisabledError as e:
+            raise HTTPException(status_code=403, detail=str(e)) from e
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=f"profile '{profile_id}' not found") from e
+
     # Provide a lightweight human-friendly status at `/mcp/status` so a plain
     # GET to a non-streaming path returns something useful for humans/browsers.
     # Keep the actual MCP protocol endpoints (streaming, POST, SSE) mounted
@@ -5,14 +5,249 @@ with only HTTP endpoints for calling indicators. It contains no MCP-specific
 routes or mounting logic—use this for pure REST/HTTP access.
 """
 
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
 
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
 
+from . import media
+from .cache import get_result_cache
+from .execution import gather_bounded, resolve_spec_keys, run_indicator, run_indicator_set
 from .indicators import registry
-from .models.market_data import MarketData
-from .schemas import ToolRequest, ToolResult
+from .metrics import CONTENT_TYPE, MetricsMiddleware, get_metrics
+from .models.market_data import PRECISIONS, ColumnarMarketData, Precision
+from .profiling import PROFILE_HEADER, PROFILE_ID_HEADER, ProfilingDisabledError, load_profile, run_with_profile, wants_profile
+from .projection import Projection, project
+from .schemas import (
+    PROJECTION_FIELDS,
+    BatchJob,
+    BatchRequest,
+    BatchResult,
+    MultiRequest,
+    MultiResult,
+    SeriesInfo,
+    SeriesPayload,
+    SweepRequest,
+    ToolRequest,
+    ToolResult,
+)
+from .serialization import FastJSONResponse, dumps, encode_msgpack, encode_result, iter_result, result_to_payload
+from .store import SeriesNotFoundError, get_series_store, resolve_market_data
+from .subscriptions import Subscription, get_subscription_hub
+from .sweep import run_sweep
+from .timing import ServerTimingMiddleware, iter_spanned, span
+
+# Jobs in flight per batch request when the client does not ask for a limit
+DEFAULT_BATCH_CONCURRENCY = 8
+
+# Idle seconds after which a subscription event stream sends a comment,
+# keeping proxies from closing the connection
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Columns a binary body may carry, besides `symbol` in Arrow batch bodies
+_BODY_COLUMNS = ("close", "open", "high", "low", "volume", "timestamp")
+
+# OpenAPI entries documenting the binary alternatives to a JSON body
+_BINARY_CONTENT = {kind: {"schema": {"type": "string", "format": "binary"}} for kind in media.BINARY_TYPES}
+
+_SERIES_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": SeriesPayload.model_json_schema()}, **_BINARY_CONTENT},
+    }
+}
+
+# OpenAPI entries documenting the encodings a response can be negotiated to
+_RESULT_RESPONSES = {
+    200: {"content": {kind: {"schema": {"type": "string", "format": "binary"}} for kind in media.RESULT_TYPES[1:]}}
+}
+_PAYLOAD_RESPONSES = {200: {"content": {media.MSGPACK: {"schema": {"type": "string", "format": "binary"}}}}}
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _request_market_data(
+    series: Optional[str], precision: Optional[Precision] = None, **columns: Any
+) -> ColumnarMarketData:
+    """Resolve request input, mapping lookup and validation errors to HTTP."""
+    try:
+        with span("convert"):
+            return resolve_market_data(series, precision, **columns)
+    except SeriesNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def _negotiate(request: Request, offered: Tuple[str, ...] = media.RESULT_TYPES) -> str:
+    """The response type the request's `Accept` header asks for; 406 if none fits."""
+    kind = media.negotiate(request.headers.get("accept"), offered)
+    if kind is None:
+        raise HTTPException(
+            status_code=406, detail=f"no acceptable response type; available: {', '.join(offered)}"
+        )
+    return kind
+
+
+def _result_response(result: Any, kind: str) -> Response:
+    """Send an indicator result in the negotiated encoding.
+
+    JSON is written straight from the output arrays by `FastJSONResponse`
+    rather than validating the payload through `response_model`; the model
+    still documents the response shape.
+    """
+    if kind == media.JSON:
+        return FastJSONResponse(result_to_payload(result, builtin=False))
+    if kind in media.STREAM_TYPES:
+        # A sync iterator: Starlette serializes each chunk on a worker
+        # thread and sends it before the next one is built
+        return StreamingResponse(iter_spanned(iter_result(result, kind), "encode"), media_type=kind)
+    try:
+        return Response(encode_result(result, kind), media_type=kind)
+    except media.UnsupportedMediaTypeError as e:
+        raise HTTPException(status_code=406, detail=str(e)) from e
+
+
+def _payload_response(payload: Dict[str, Any], kind: str) -> Response:
+    """Send a payload, which may hold ndarrays, as JSON or MessagePack."""
+    if kind == media.JSON:
+        return FastJSONResponse(payload)
+    try:
+        return Response(encode_msgpack(payload), media_type=kind)
+    except media.UnsupportedMediaTypeError as e:
+        raise HTTPException(status_code=406, detail=str(e)) from e
+
+
+async def _json_body(request: Request, model: Type[M]) -> M:
+    """Validate a JSON body the way FastAPI validates a body parameter.
+
+    Endpoints that also take binary bodies read the request themselves;
+    other non-JSON content types are answered with 415.
+    """
+    kind = media.media_type(request.headers.get("content-type"))
+    if kind and kind != "application/json" and not kind.endswith("+json"):
+        raise HTTPException(status_code=415, detail=str(media.UnsupportedMediaTypeError(
+            f"unsupported content type '{kind}'; use application/json or one of {', '.join(media.BINARY_TYPES)}"
+        )))
+    with span("read"):
+        body = await request.body()
+    try:
+        with span("parse"):
+            return model.model_validate_json(body)
+    except ValidationError as e:
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        raise RequestValidationError(errors, body=body.decode(errors="replace")) from e
+
+
+async def _binary_columns(request: Request, allowed: Tuple[str, ...] = _BODY_COLUMNS) -> Dict[str, np.ndarray]:
+    """Decode a binary body into columns named by the `columns` query parameter."""
+    with span("read"):
+        body = await request.body()
+    try:
+        with span("decode"):
+            columns = media.decode_columns(
+                body,
+                request.headers.get("content-type"),
+                media.parse_columns(request.query_params.get("columns")),
+            )
+    except media.UnsupportedMediaTypeError as e:
+        raise HTTPException(status_code=415, detail=str(e)) from e
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    unknown = sorted(set(columns) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"unknown columns {unknown}; expected some of {', '.join(allowed)}"
+        )
+    return columns
+
+
+def _query_precision(request: Request) -> Optional[Precision]:
+    precision = request.query_params.get("precision")
+    if precision is not None and precision not in PRECISIONS:
+        raise HTTPException(
+            status_code=422, detail=f"`precision` must be one of {', '.join(PRECISIONS)}, got '{precision}'"
+        )
+    return precision
+
+
+def _query_params(
+    request: Request, reserved: Tuple[str, ...] = ("columns", "precision", *PROJECTION_FIELDS)
+) -> Dict[str, Any]:
+    return media.parse_query_params(request.query_params.multi_items(), reserved)
+
+
+def _query_projection(request: Request) -> Projection:
+    """The projection named by `outputs`, `drop_lookback`, `tail` and `slice` query parameters."""
+    query = request.query_params
+    try:
+        return Projection.from_options(
+            outputs=media.parse_columns(query["outputs"]) if "outputs" in query else None,
+            drop_lookback=query.get("drop_lookback", "false").strip().lower() in ("1", "true", "yes", "on"),
+            tail=int(query["tail"]) if "tail" in query else None,
+            slice=query.get("slice"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+def _project(result: Any, projection: Projection) -> Any:
+    try:
+        return project(result, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+async def _binary_market_data(request: Request) -> ColumnarMarketData:
+    columns = await _binary_columns(request)
+    return _request_market_data(None, precision=_query_precision(request), **columns)
+
+
+async def _series_market_data(request: Request) -> ColumnarMarketData:
+    """Columns of a series PUT/append from a JSON or binary body."""
+    if media.is_binary(request.headers.get("content-type")):
+        return await _binary_market_data(request)
+    payload = await _json_body(request, SeriesPayload)
+    return _request_market_data(None, **payload.model_dump())
+
+
+def _subscribe(name: str, query: Any) -> Subscription:
+    """Subscribe to the indicator named by a stream request's query string.
+
+    Raises ``LookupError`` for an unknown series and ``ValueError`` for an
+    invalid subscription.
+    """
+    indicator = query.get("indicator")
+    if not indicator:
+        raise ValueError("the `indicator` query parameter is required")
+    params = media.parse_query_params(query.multi_items(), reserved=("indicator",))
+    return get_subscription_hub().subscribe(name, indicator, params)
+
+
+def _sse_event(message: Dict[str, Any]) -> bytes:
+    return b"event: " + message["type"].encode() + b"\ndata: " + dumps(message) + b"\n\n"
+
+
+def _symbol_runs(symbols: np.ndarray) -> List[Tuple[str, slice]]:
+    """Split a `symbol` column into `(symbol, rows)` runs.
+
+    Rows of one symbol must be contiguous, so each group's columns are
+    slices (views) of the decoded body.
+    """
+    if len(symbols) == 0:
+        return []
+    starts = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+    bounds = [0, *starts.tolist(), len(symbols)]
+    runs = [(str(symbols[start]), slice(start, stop)) for start, stop in zip(bounds, bounds[1:])]
+    names = [symbol for symbol, _ in runs]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=422, detail="rows of each symbol must be contiguous in an Arrow batch body")
+    return runs
 
 
 def create_http_api_app() -> FastAPI:
@@ -20,6 +255,12 @@ def create_http_api_app() -> FastAPI:
 
     - POST `/api/tools/{tool_name}`: JSON body with `close` (list of floats)
       and other parameters passed to the indicator.
+    - POST `/api/batch`: many `{symbol, series, params}` jobs in one body
+    - POST `/api/multi`: several indicators over one shared series
+    - POST `/api/sweep/{tool_name}`: one indicator over a parameter grid
+    - PUT/GET/DELETE `/api/series/{name}`, POST `/api/series/{name}/append`:
+      manage stored series referenced by handle in the calls above
+    - GET/DELETE `/api/cache`: result cache statistics / clear the cache
     - GET `/api/tools`: list available tools
     - GET `/api/health`: health check
     """
@@ -28,27 +269,32 @@ def create_http_api_app() -> FastAPI:
         title="mcp-talib HTTP API",
         description="Pure HTTP API for TA-Lib indicators (no MCP)",
         docs_url="/docs",
-        redoc_url=None
+        redoc_url=None,
+        default_response_class=FastJSONResponse,
     )
 
     api.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
-        allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         allow_headers=["*"],
-        expose_headers=["mcp-session-id"],
+        expose_headers=["mcp-session-id", PROFILE_ID_HEADER],
         max_age=3600,
     )
+    api.add_middleware(ServerTimingMiddleware, transport="http")
+    api.add_middleware(MetricsMiddleware, transport="http")
 
     @api.get("/api/health")
     async def health_check():
         """Health check endpoint."""
         return {"status": "ok"}
 
-    @api.post("/api/tools/{tool_name}", response_model=ToolResult, openapi_extra={
+    @api.post("/api/tools/{tool_name}", response_model=ToolResult, responses=_RESULT_RESPONSES, openapi_extra={
         "requestBody": {
+            "required": True,
             "content": {
                 "application/json": {
+                    "schema": ToolRequest.model_json_schema(),
                     "examples": {
                         "sma": {
                             "summary": "sma",
@@ -123,32 +369,342 @@ def create_http_api_app() -> FastAPI:
                             "value": {"close": [1,2,3,4,5], "timeperiod": 30}
                         },
                     }
-                }
+                },
+                **_BINARY_CONTENT,
             }
         }
     })
-    async def call_tool(tool_name: str, payload: ToolRequest):
+    async def call_tool(tool_name: str, request: Request):
         """Generic wrapper to call a registered indicator.
 
-        Expected JSON shape: { "close": [...], ...params }
+        Expected JSON shape: { "close": [...], ...params } or
+        { "series": "<handle>", ...params }. A binary body (see `media`)
+        carries the columns instead, with `columns`, `precision` and the
+        indicator parameters in the query string. The `Accept` header
+        selects JSON, MessagePack, raw frames or Arrow IPC output.
+
+        With profiling enabled, an `X-Profile: 1` header profiles the
+        calculation; the response's `X-Profile-Id` names the profile to
+        fetch from `/api/profiles/{profile_id}`.
         """
         indicator = registry.get_indicator(tool_name)
         if not indicator:
             raise HTTPException(status_code=404, detail="tool not found")
+        kind = _negotiate(request)
+
+        if media.is_binary(request.headers.get("content-type")):
+            market_data = await _binary_market_data(request)
+            params = _query_params(request)
+            projection = _query_projection(request)
+        else:
+            payload = await _json_body(request, ToolRequest)
+            params = payload.model_dump(exclude={"close", "series", "precision", *PROJECTION_FIELDS})
+            market_data = _request_market_data(payload.series, precision=payload.precision, close=payload.close)
+            projection = payload.projection()
+        try:
+            with span("calculate"):
+                result, profile = await run_with_profile(
+                    indicator, market_data, params or {}, wants_profile(request.headers.get(PROFILE_HEADER))
+                )
+        except ProfilingDisabledError as e:
+            raise HTTPException(status_code=403, detail=str(e)) from e
+        with span("project"):
+            result = _project(result, projection)
+        # Streamed encodings serialize after the headers are sent, so
+        # their encode time only reaches the trace file
+        with span("encode"):
+            response = _result_response(result, kind)
+        if profile is not None:
+            response.headers[PROFILE_ID_HEADER] = profile.id
+        return response
+
+    @api.post("/api/batch", response_model=BatchResult, responses=_PAYLOAD_RESPONSES, openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": BatchRequest.model_json_schema()},
+                media.ARROW_STREAM: _BINARY_CONTENT[media.ARROW_STREAM],
+                media.ARROW_FILE: _BINARY_CONTENT[media.ARROW_FILE],
+            },
+        }
+    })
+    async def call_batch(request: Request):
+        """Run many `{symbol, series, params}` jobs in one request.
+
+        Jobs run concurrently with at most `max_concurrency` in flight. Each
+        job reports its own result or error; one failing job never fails the
+        whole batch.
+
+        An Arrow IPC body holds every job in one table: a `symbol` column
+        groups the rows (each symbol's rows contiguous) and the other
+        columns are prices. `tool`, `max_concurrency`, `precision` and the
+        shared indicator parameters come from the query string.
+        """
+        response_kind = _negotiate(request, media.PAYLOAD_TYPES)
+        Loader = Callable[[], ColumnarMarketData]
+
+        async def run_job(symbol: str, tool_name: Optional[str], load: Loader, params: Dict[str, Any]) -> Dict[str, Any]:
+            indicator = registry.get_indicator(tool_name) if tool_name else None
+            if not indicator:
+                job_result = {"success": False, "values": None, "metadata": None, "error": "tool not found"}
+            else:
+                try:
+                    job_result = result_to_payload(await run_indicator(indicator, load(), params), builtin=False)
+                except Exception as e:
+                    job_result = {"success": False, "values": None, "metadata": None, "error": str(e)}
+            return {"symbol": symbol, "tool": tool_name, **job_result}
+
+        def json_loader(job: BatchJob) -> Loader:
+            if isinstance(job.series, str):
+                return lambda: resolve_market_data(job.series)
+            return lambda: resolve_market_data(None, **job.series.model_dump())
+
+        def arrow_loader(columns: Dict[str, np.ndarray], rows: slice, precision: Optional[Precision]) -> Loader:
+            return lambda: resolve_market_data(None, precision, **{name: col[rows] for name, col in columns.items()})
+
+        kind = media.media_type(request.headers.get("content-type"))
+        if kind in (media.ARROW_STREAM, media.ARROW_FILE):
+            columns = await _binary_columns(request, allowed=_BODY_COLUMNS + ("symbol",))
+            if "symbol" not in columns:
+                raise HTTPException(status_code=422, detail="an Arrow batch body needs a `symbol` column")
+            symbols = columns.pop("symbol")
+            precision = _query_precision(request)
+            params = _query_params(request, reserved=("tool", "max_concurrency", "precision"))
+            try:
+                limit = int(request.query_params.get("max_concurrency") or DEFAULT_BATCH_CONCURRENCY)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail="`max_concurrency` must be an integer") from e
+            tool_name = request.query_params.get("tool")
+            jobs = [
+                run_job(symbol, tool_name, arrow_loader(columns, rows, precision), params)
+                for symbol, rows in _symbol_runs(symbols)
+            ]
+        elif media.is_binary(kind):
+            raise HTTPException(status_code=415, detail="batch bodies must be JSON or Arrow IPC")
+        else:
+            payload = await _json_body(request, BatchRequest)
+            limit = payload.max_concurrency or DEFAULT_BATCH_CONCURRENCY
+            jobs = [run_job(job.symbol, job.tool or payload.tool, json_loader(job), job.params) for job in payload.jobs]
+
+        results = await gather_bounded(jobs, limit)
+        failed = sum(1 for r in results if not r["success"])
+
+        return _payload_response({
+            "success": failed == 0,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        }, response_kind)
+
+    @api.post("/api/multi", response_model=MultiResult, responses=_PAYLOAD_RESPONSES)
+    async def call_multi(payload: MultiRequest, request: Request):
+        """Compute several indicators on one OHLCV payload.
+
+        The series is converted once and shared by every spec. Results are
+        keyed by each spec's `key`, defaulting to its indicator name.
+        """
+        kind = _negotiate(request, media.PAYLOAD_TYPES)
+        try:
+            keys = resolve_spec_keys([(spec.key, spec.indicator) for spec in payload.indicators])
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        market_data = _request_market_data(
+            payload.series, **payload.model_dump(exclude={"indicators", "series", *PROJECTION_FIELDS})
+        )
+
+        specs = [(key, spec.indicator, spec.params) for key, spec in zip(keys, payload.indicators)]
+        results = await run_indicator_set(market_data, specs)
+
+        # The request sets the window, each spec its outputs
+        projections = {
+            key: Projection.from_options(spec.outputs, payload.drop_lookback, payload.tail, payload.slice)
+            for key, spec in zip(keys, payload.indicators)
+        }
+        payloads = {
+            key: result_to_payload(_project(result, projections[key]), builtin=False) for key, result in results.items()
+        }
+        return _payload_response({
+            "success": all(p["success"] for p in payloads.values()),
+            "results": payloads,
+        }, kind)
+
+    @api.post("/api/sweep/{tool_name}", response_model=ToolResult, responses=_RESULT_RESPONSES)
+    async def call_sweep(tool_name: str, payload: SweepRequest, request: Request):
+        """Evaluate one indicator over a parameter grid.
+
+        Each output is returned as a matrix with one row per grid point
+        (listed in `metadata.points`) and one column per input bar.
+        """
+        if not registry.get_indicator(tool_name):
+            raise HTTPException(status_code=404, detail="tool not found")
+        kind = _negotiate(request)
+        market_data = _request_market_data(
+            payload.series, **payload.model_dump(exclude={"grid", "params", "series", *PROJECTION_FIELDS})
+        )
+        try:
+            result = await run_sweep(tool_name, market_data, payload.grid, payload.params)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        return _result_response(_project(result, payload.projection()), kind)
+
+    @api.put("/api/series/{name}", response_model=SeriesInfo, openapi_extra=_SERIES_BODY)
+    async def put_series(name: str, request: Request):
+        """Store (or replace) an OHLCV series under `name`."""
+        market_data = await _series_market_data(request)
+        try:
+            info = get_series_store().put(name, market_data)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        get_subscription_hub().reset(name)
+        return info
+
+    @api.post("/api/series/{name}/append", response_model=SeriesInfo, openapi_extra=_SERIES_BODY)
+    async def append_series(name: str, request: Request):
+        """Append bars to `name`, creating it if needed.
+
+        The appended columns must match the stored series. Subscriptions
+        to the series receive the indicator values of the new bars.
+        """
+        market_data = await _series_market_data(request)
+        try:
+            info = get_series_store().append(name, market_data)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        get_subscription_hub().publish(name, market_data)
+        return info
+
+    @api.websocket("/api/series/{name}/stream")
+    async def stream_series_socket(websocket: WebSocket, name: str):
+        """Follow an indicator over `name`, pushing bars on the same socket.
+
+        Query: `indicator` plus its parameters. The server sends a
+        `subscribed` message, then a `values` message with the new
+        indicator values whenever bars are appended to the series, by this
+        client (as `{"close": [...]}` text messages) or by anyone else.
+        """
+        await websocket.accept()
+        try:
+            subscription = _subscribe(name, websocket.query_params)
+        except (LookupError, ValueError) as e:
+            await websocket.send_text(dumps({"type": "error", "error": str(e)}).decode())
+            await websocket.close(code=1008)
+            return
+        hub = get_subscription_hub()
+
+        async def receive_bars() -> None:
+            while True:
+                message = await websocket.receive_text()
+                try:
+                    payload = SeriesPayload.model_validate_json(message)
+                    market_data = resolve_market_data(None, **payload.model_dump())
+                    get_series_store().append(name, market_data)
+                except ValueError as e:
+                    subscription.notify({"type": "error", "error": str(e)})
+                    continue
+                hub.publish(name, market_data)
+
+        async def send_messages() -> None:
+            # The only sender, so messages never interleave
+            await websocket.send_text(dumps({"type": "subscribed", **subscription.describe()}).decode())
+            while True:
+                message = await subscription.next_message()
+                await websocket.send_text(dumps(message).decode())
+                if message["type"] == "closed":
+                    await websocket.close()
+                    return
+
+        tasks = [asyncio.create_task(receive_bars()), asyncio.create_task(send_messages())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is not None and not isinstance(error, WebSocketDisconnect):
+                    raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            hub.unsubscribe(subscription)
+
+    @api.get("/api/series/{name}/stream")
+    async def stream_series_events(name: str, request: Request):
+        """Follow an indicator over `name` as server-sent events.
+
+        The receive-only counterpart of the WebSocket at the same path: a
+        `subscribed` event, then a `values` event for each append to the
+        series.
+        """
+        try:
+            subscription = _subscribe(name, request.query_params)
+        except LookupError as e:
+            raise HTTPException(status_code=404, detail=str(e)) from e
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+
+        async def events():
+            try:
+                yield _sse_event({"type": "subscribed", **subscription.describe()})
+                while True:
+                    try:
+                        message = await asyncio.wait_for(subscription.next_message(), SSE_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield b": keepalive\n\n"
+                        continue
+                    yield _sse_event(message)
+                    if message["type"] == "closed":
+                        return
+            finally:
+                get_subscription_hub().unsubscribe(subscription)
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    @api.get("/api/series")
+    async def list_series() -> Dict[str, List[SeriesInfo]]:
+        """Describe every stored series."""
+        return {"series": get_series_store().list()}
+
+    @api.get("/api/series/{name}", response_model=SeriesInfo)
+    async def get_series(name: str):
+        """Describe one stored series."""
+        try:
+            return get_series_store().info(name)
+        except SeriesNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e)) from e
+
+    @api.delete("/api/series/{name}")
+    async def delete_series(name: str) -> Dict[str, str]:
+        """Remove a stored series."""
+        if not get_series_store().delete(name):
+            raise HTTPException(status_code=404, detail=f"series '{name}' not found")
+        # Subscriptions cannot warm up again, so they close
+        get_subscription_hub().reset(name)
+        return {"deleted": name}
 
-        close = payload.close
-        params = {k: v for k, v in payload.model_dump().items() if k != "close"}
+    @api.get("/api/cache")
+    async def cache_stats() -> Dict[str, Any]:
+        """Result cache hit, miss and eviction counters."""
+        return get_result_cache().stats()
 
-        market_data = MarketData(close=close)
-        result = await indicator.calculate(market_data, params or {})
+    @api.delete("/api/cache")
+    async def clear_cache() -> Dict[str, Any]:
+        """Drop every cached result; counters are kept."""
+        cache = get_result_cache()
+        cache.clear()
+        return cache.stats()
 
-        if getattr(result, "success", False):
-            values = result.values if isinstance(result.values, (list, dict)) else None
-            metadata = result.metadata if isinstance(result.metadata, dict) else None
-            return ToolResult(success=True, values=values, metadata=metadata)
+    @api.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Request, calculation and cache metrics in the Prometheus text format."""
+        return Response(get_metrics().render(), media_type=CONTENT_TYPE)
 
-        err = getattr(result, "error", None) or "calculation error"
-        return ToolResult(success=False, error=str(err))
+    @api.get("/api/profiles/{profile_id}")
+    async def get_profile(profile_id: str) -> Dict[str, str]:
+        """A stored profile: its hot-function `table` and `collapsed` stacks."""
+        try:
+            return load_profile(profile_id)
+        except ProfilingDisabledError as e:
+            raise HTTPException(status_code=403, detail=str(e)) from e
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=f"profile '{profile_id}' not found") from e
 
     @api.get("/api/tools")
     async def list_tools() -> Dict[str, List[str]]:
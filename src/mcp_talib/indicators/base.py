@@ -1,14 +1,77 @@
 """Base indicator interface."""
 
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
 
 from ..models.indicator_result import IndicatorResult
 from ..models.market_data import MarketData
 
 
+def runs_without_gil(call: Callable[[], Any], seconds: float = 0.02) -> bool:
+    """Whether ``call`` lets other threads run while it works.
+
+    A second thread counts for as long as ``call`` is repeated, for at
+    least ``seconds``. It can only count while the GIL is free, so a call
+    that holds it throughout leaves the count near zero: the interpreter
+    hands the GIL over once per switch interval at most.
+    """
+    ticks = 0
+    running = threading.Event()
+    done = False
+
+    def count() -> None:
+        nonlocal ticks
+        running.set()
+        while not done:
+            ticks += 1
+            time.sleep(0)
+
+    counter = threading.Thread(target=count, daemon=True)
+    counter.start()
+    running.wait()
+    started = time.perf_counter()
+    counted = ticks
+    while time.perf_counter() - started < seconds:
+        call()
+    counted, elapsed = ticks - counted, time.perf_counter() - started
+    done = True
+    counter.join()
+    # Switch intervals alone would allow about one tick each
+    return counted > 4 * elapsed / sys.getswitchinterval()
+
+
+@lru_cache(maxsize=1)
+def talib_releases_gil() -> bool:
+    """Whether the installed TA-Lib binding runs its C routines without the GIL.
+
+    Older bindings hold it for the whole call, so this is measured once,
+    on first use, rather than assumed.
+    """
+    import talib
+
+    close = np.arange(200_000, dtype=np.float64)
+    return runs_without_gil(lambda: talib.KAMA(close, timeperiod=30))
+
+
+def releases_gil(indicator: Any) -> bool:
+    """Whether ``indicator`` does its heavy work with the GIL released."""
+    flag = getattr(indicator, "releases_gil", False)
+    return talib_releases_gil() if flag is None else bool(flag)
+
+
 class BaseIndicator(ABC):
     """Base class for all technical indicators."""
+
+    # Whether `calculate` does its heavy work with the GIL released, so the
+    # thread executor can run several at once. None means the work is a
+    # TA-Lib call, which releases it if `talib_releases_gil()`.
+    releases_gil: Optional[bool] = None
     
     def __init__(self, name: str, description: str):
         self._name = name
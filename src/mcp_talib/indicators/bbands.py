@@ -1,11 +1,10 @@
 """Bollinger Bands (BBANDS) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
-import talib as ta
 
+from . import shared
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -36,17 +35,17 @@ class BBANDSIndicator(BaseIndicator):
         nbdevdn = options.get("nbdevdn", 2.0)
         matype = options.get("matype", 0)
 
-        close = np.asarray(market_data.close, dtype=float)
+        close = as_float_array(market_data.close)
         try:
-            upper, middle, lower = ta.BBANDS(close, timeperiod=timeperiod, nbdevup=nbdevup, nbdevdn=nbdevdn, matype=matype)
+            upper, middle, lower = shared.bbands(close, timeperiod, nbdevup, nbdevdn, matype)
 
             return IndicatorResult(
                 indicator_name=self.name,
                 success=True,
                 values={
-                    "upperband": upper.tolist(),
-                    "middleband": middle.tolist(),
-                    "lowerband": lower.tolist(),
+                    "upperband": upper,
+                    "middleband": middle,
+                    "lowerband": lower,
                 },
                 metadata={
                     "timeperiod": timeperiod,
@@ -1,11 +1,10 @@
 """Double Exponential Moving Average (DEMA) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
-import talib as ta
 
+from . import shared
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -29,14 +28,14 @@ class DEMAIndicator(BaseIndicator):
             options = {}
 
         timeperiod = options.get("timeperiod", 30)
-        close = np.asarray(market_data.close, dtype=float)
+        close = as_float_array(market_data.close)
 
         try:
-            out = ta.DEMA(close, timeperiod=timeperiod)
+            out = shared.dema(close, timeperiod)
             return IndicatorResult(
                 indicator_name=self.name,
                 success=True,
-                values={"dema": out.tolist()},
+                values={"dema": out},
                 metadata={"timeperiod": timeperiod, "input_points": len(close), "output_points": len(out)},
             )
         except Exception as e:
@@ -1,8 +1,10 @@
 """Exponential Moving Average (EMA) indicator implementation."""
 
-from typing import List, Dict, Any
+from typing import Dict, Any
+
+from . import shared
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -45,7 +47,15 @@ class EMAIndicator(BaseIndicator):
             options = {}
         
         timeperiod = options.get("timeperiod", 20)
-        close_prices = market_data.close
+        close_prices = as_float_array(market_data.close)
+        
+        if timeperiod < 1:
+            return IndicatorResult(
+                indicator_name=self.name,
+                success=False,
+                values={},
+                error_message=f"timeperiod must be at least 1, got {timeperiod}"
+            )
         
         if len(close_prices) < timeperiod:
             return IndicatorResult(
@@ -55,19 +65,18 @@ class EMAIndicator(BaseIndicator):
                 error_message=f"Not enough data points. Need at least {timeperiod}, got {len(close_prices)}"
             )
         
-        # Calculate EMA
-        # Multiplier: (2 / (timeperiod + 1))
-        multiplier = 2.0 / (timeperiod + 1)
-        
-        # Initialize EMA with SMA of first timeperiod values
-        ema_values = []
-        initial_sma = sum(close_prices[:timeperiod]) / timeperiod
-        ema_values.append(initial_sma)
-        
-        # Calculate EMA for remaining values
-        for i in range(timeperiod, len(close_prices)):
-            ema = (close_prices[i] - ema_values[-1]) * multiplier + ema_values[-1]
-            ema_values.append(ema)
+        try:
+            if timeperiod == 1:
+                # A one-bar EMA is the input itself; talib.EMA rejects the period
+                ema_values = close_prices.copy()
+            else:
+                # TA-Lib seeds with the SMA of the first timeperiod values, like
+                # the original loop did, and runs the recursion in C. Output is
+                # identical to talib.EMA; only the NaN lookback prefix is dropped.
+                # The full series is shared with DEMA/TEMA/T3/MA in the same request.
+                ema_values = shared.ema_layers(close_prices, timeperiod, 1)[0][timeperiod - 1:]
+        except Exception as e:
+            return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
         
         return IndicatorResult(
             indicator_name=self.name,
@@ -75,7 +84,7 @@ class EMAIndicator(BaseIndicator):
             values={"ema": ema_values},
             metadata={
                 "timeperiod": timeperiod,
-                "multiplier": multiplier,
+                "multiplier": 2.0 / (timeperiod + 1),
                 "input_points": len(close_prices),
                 "output_points": len(ema_values)
             }
@@ -1,11 +1,10 @@
 """Hilbert Transform - Instantaneous Trendline (HT_TRENDLINE) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
 import talib as ta
 
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -18,13 +17,13 @@ class HTTrendlineIndicator(BaseIndicator):
         return {"type": "object", "properties": {"close_prices": {"type": "array", "items": {"type": "number"}}}, "required": ["close_prices"]}
 
     async def calculate(self, market_data: MarketData, options: Dict[str, Any] = None) -> IndicatorResult:
-        close = np.asarray(market_data.close, dtype=float)
+        close = as_float_array(market_data.close)
         try:
             out = ta.HT_TRENDLINE(close)
             return IndicatorResult(
                 indicator_name=self.name,
                 success=True,
-                values={"ht_trendline": out.tolist()},
+                values={"ht_trendline": out},
                 metadata={"input_points": len(close), "output_points": len(out)},
             )
         except Exception as e:
@@ -1,11 +1,10 @@
 """Kaufman Adaptive Moving Average (KAMA) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
 import talib as ta
 
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -21,10 +20,10 @@ class KAMAIndicator(BaseIndicator):
         if options is None:
             options = {}
         timeperiod = options.get("timeperiod", 10)
-        close = np.asarray(market_data.close, dtype=float)
+        close = as_float_array(market_data.close)
 
         try:
             out = ta.KAMA(close, timeperiod=timeperiod)
-            return IndicatorResult(indicator_name=self.name, success=True, values={"kama": out.tolist()}, metadata={"timeperiod": timeperiod, "input_points": len(close), "output_points": len(out)})
+            return IndicatorResult(indicator_name=self.name, success=True, values={"kama": out}, metadata={"timeperiod": timeperiod, "input_points": len(close), "output_points": len(out)})
         except Exception as e:
             return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
@@ -0,0 +1,98 @@
+"""NumPy kernels shared by the indicator adapters.
+
+These operate on 1-D float64 arrays and never loop in Python, so their cost
+is O(n) regardless of the window length.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def compensated_cumsum(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return prefix sums of ``values`` as a ``(high, low)`` pair.
+
+    ``high`` is the plain running sum produced by ``np.cumsum``. ``low``
+    accumulates the exact rounding error of every addition (the TwoSum
+    error term), so ``high + low`` tracks the true prefix sum to within a
+    few ulps even on very long series.
+    """
+    high = np.cumsum(values)
+    if not high.size:
+        return high, np.zeros_like(high)
+    previous = np.empty_like(high)
+    previous[0] = 0.0
+    previous[1:] = high[:-1]
+
+    # TwoSum: recover the part of each `previous + value` lost to rounding.
+    virtual = high - previous
+    error = (previous - (high - virtual)) + (values - virtual)
+    return high, np.cumsum(error)
+
+
+class PrefixSums:
+    """Compensated prefix sums of a series, reusable across window lengths.
+
+    Values are shifted by the first finite element before accumulating so
+    the prefix sums stay small, which keeps window differences well
+    conditioned for series far from zero. Building this once and calling
+    `window_sums` for many windows costs O(n) per window instead of
+    recomputing the prefix for each.
+
+    NaN and infinite values are left out of the sums and counted instead,
+    so they only affect the windows that contain them: such a window sums
+    to NaN, or to the infinity it holds, as a direct sum would.
+    """
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        self.length = values.shape[0]
+        finite = np.isfinite(values)
+        # Prefix counts of NaN, +inf and -inf, and of finite values (which
+        # get the shift added back); None for all-finite input
+        self._nonfinite = self._finite = None
+        if finite.all():
+            self.shift = values[0] if self.length else 0.0
+            values = values - self.shift
+        else:
+            flags = np.stack((np.isnan(values), values == np.inf, values == -np.inf))
+            self._nonfinite = np.concatenate((np.zeros((3, 1), dtype=np.int64), np.cumsum(flags, axis=1)), axis=1)
+            self._finite = np.concatenate(([0], np.cumsum(finite)))
+            self.shift = values[np.argmax(finite)] if finite.any() else 0.0
+            values = np.where(finite, values - self.shift, 0.0)
+        high, low = compensated_cumsum(values)
+        self._high = np.concatenate(([0.0], high))
+        self._low = np.concatenate(([0.0], low))
+
+    def window_sums(self, window: int) -> np.ndarray:
+        """Sum of every full ``window``; ``length - window + 1`` elements."""
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if self.length < window:
+            return np.empty(0, dtype=np.float64)
+        high, low = self._high, self._low
+        sums = (high[window:] - high[:-window]) + (low[window:] - low[:-window])
+        if self._nonfinite is None:
+            return sums + self.shift * window
+        sums = sums + self.shift * (self._finite[window:] - self._finite[:-window])
+        nan, positive, negative = self._nonfinite[:, window:] - self._nonfinite[:, :-window]
+        sums[positive > 0] = np.inf
+        sums[negative > 0] = -np.inf
+        sums[(nan > 0) | ((positive > 0) & (negative > 0))] = np.nan
+        return sums
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of every full ``window`` of ``values``.
+
+    The result has ``len(values) - window + 1`` elements; element ``i`` is
+    the sum of ``values[i:i + window]``.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    return PrefixSums(values).window_sums(window)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Arithmetic mean of every full ``window`` of ``values``."""
+    return rolling_sum(values, window) / window
@@ -1,11 +1,10 @@
 """Moving Average (MA) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
-import talib as ta
 
+from . import shared
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -30,10 +29,10 @@ class MAIndicator(BaseIndicator):
             options = {}
         timeperiod = options.get("timeperiod", 30)
         matype = options.get("matype", 0)
-        close = np.asarray(market_data.close, dtype=float)
+        close = as_float_array(market_data.close)
 
         try:
-            out = ta.MA(close, timeperiod=timeperiod, matype=matype)
-            return IndicatorResult(indicator_name=self.name, success=True, values={"ma": out.tolist()}, metadata={"timeperiod": timeperiod, "matype": matype, "input_points": len(close), "output_points": len(out)})
+            out = shared.moving_average(close, timeperiod, matype)
+            return IndicatorResult(indicator_name=self.name, success=True, values={"ma": out}, metadata={"timeperiod": timeperiod, "matype": matype, "input_points": len(close), "output_points": len(out)})
         except Exception as e:
             return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
@@ -1,11 +1,10 @@
 """MESA Adaptive Moving Average (MAMA) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
 import talib as ta
 
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -30,14 +29,14 @@ class MAMAIndicator(BaseIndicator):
             options = {}
         fastlimit = options.get("fastlimit", 0.5)
         slowlimit = options.get("slowlimit", 0.05)
-        close = np.asarray(market_data.close, dtype=float)
+        close = as_float_array(market_data.close)
 
         try:
             mama, fama = ta.MAMA(close, fastlimit=fastlimit, slowlimit=slowlimit)
             return IndicatorResult(
                 indicator_name=self.name,
                 success=True,
-                values={"mama": mama.tolist(), "fama": fama.tolist()},
+                values={"mama": mama, "fama": fama},
                 metadata={"fastlimit": fastlimit, "slowlimit": slowlimit, "input_points": len(close), "output_points": len(mama)},
             )
         except Exception as e:
@@ -5,7 +5,7 @@ import numpy as np
 import talib as ta
 
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -29,7 +29,7 @@ class MAVPIndicator(BaseIndicator):
     async def calculate(self, market_data: MarketData, options: Dict[str, Any] = None) -> IndicatorResult:
         if options is None:
             options = {}
-        close = np.asarray(market_data.close, dtype=float)
+        close = as_float_array(market_data.close)
         periods = options.get("periods", None)
         minperiod = options.get("minperiod", 2)
         maxperiod = options.get("maxperiod", 30)
@@ -44,6 +44,6 @@ class MAVPIndicator(BaseIndicator):
             else:
                 out = ta.MAVP(close, None)
 
-            return IndicatorResult(indicator_name=self.name, success=True, values={"mavp": out.tolist()}, metadata={"periods": periods, "minperiod": minperiod, "maxperiod": maxperiod, "input_points": len(close), "output_points": len(out)})
+            return IndicatorResult(indicator_name=self.name, success=True, values={"mavp": out}, metadata={"periods": periods, "minperiod": minperiod, "maxperiod": maxperiod, "input_points": len(close), "output_points": len(out)})
         except Exception as e:
             return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
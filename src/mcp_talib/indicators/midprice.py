@@ -1,11 +1,10 @@
 """Midpoint Price over period (MIDPRICE) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
 import talib as ta
 
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -30,11 +29,11 @@ class MIDPRICEIndicator(BaseIndicator):
             options = {}
         timeperiod = options.get("timeperiod", 14)
 
-        high = np.asarray(market_data.high or [], dtype=float)
-        low = np.asarray(market_data.low or [], dtype=float)
+        high = as_float_array(market_data.high)
+        low = as_float_array(market_data.low)
 
         try:
             out = ta.MIDPRICE(high, low, timeperiod=timeperiod)
-            return IndicatorResult(indicator_name=self.name, success=True, values={"midprice": out.tolist()}, metadata={"timeperiod": timeperiod, "input_points": len(high), "output_points": len(out)})
+            return IndicatorResult(indicator_name=self.name, success=True, values={"midprice": out}, metadata={"timeperiod": timeperiod, "input_points": len(high), "output_points": len(out)})
         except Exception as e:
             return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
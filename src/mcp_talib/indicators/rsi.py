@@ -1,8 +1,10 @@
 """Relative Strength Index (RSI) indicator implementation."""
 
-from typing import List, Dict, Any
+from typing import Dict, Any
+import talib as ta
+
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -45,7 +47,7 @@ class RSIIndicator(BaseIndicator):
             options = {}
         
         timeperiod = options.get("timeperiod", 14)
-        close_prices = market_data.close
+        close_prices = as_float_array(market_data.close)
         
         if len(close_prices) < timeperiod + 1:
             return IndicatorResult(
@@ -55,33 +57,13 @@ class RSIIndicator(BaseIndicator):
                 error_message=f"Not enough data points. Need at least {timeperiod + 1}, got {len(close_prices)}"
             )
         
-        # Calculate price changes
-        deltas = [close_prices[i] - close_prices[i-1] for i in range(1, len(close_prices))]
-        
-        # Separate gains and losses
-        gains = [d if d > 0 else 0 for d in deltas]
-        losses = [-d if d < 0 else 0 for d in deltas]
-        
-        # Calculate initial average gain and loss
-        avg_gain = sum(gains[:timeperiod]) / timeperiod
-        avg_loss = sum(losses[:timeperiod]) / timeperiod
-        
-        rsi_values = []
-        
-        # Calculate subsequent values using exponential smoothing
-        for i in range(timeperiod, len(gains)):
-            avg_gain = (avg_gain * (timeperiod - 1) + gains[i]) / timeperiod
-            avg_loss = (avg_loss * (timeperiod - 1) + losses[i]) / timeperiod
-            
-            # Calculate RS (Relative Strength)
-            if avg_loss == 0:
-                rs = float('inf')
-            else:
-                rs = avg_gain / avg_loss
-            
-            # Calculate RSI: 100 - (100 / (1 + RS))
-            rsi = 100 - (100 / (1 + rs))
-            rsi_values.append(min(max(rsi, 0), 100))  # Clamp between 0 and 100
+        try:
+            # Wilder smoothing in C. The first value uses the plain average
+            # gain/loss of the first timeperiod changes, matching talib.RSI
+            # exactly; RSI is bounded to [0, 100] by construction.
+            rsi_values = ta.RSI(close_prices, timeperiod=timeperiod)[timeperiod:]
+        except Exception as e:
+            return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
         
         return IndicatorResult(
             indicator_name=self.name,
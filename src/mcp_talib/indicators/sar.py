@@ -1,11 +1,10 @@
 """Parabolic SAR (SAR) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
 import talib as ta
 
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -32,11 +31,11 @@ class SARIndicator(BaseIndicator):
         acceleration = options.get("acceleration", 0.02)
         maximum = options.get("maximum", 0.2)
 
-        high = np.asarray(market_data.high or [], dtype=float)
-        low = np.asarray(market_data.low or [], dtype=float)
+        high = as_float_array(market_data.high)
+        low = as_float_array(market_data.low)
 
         try:
             out = ta.SAR(high, low, acceleration=acceleration, maximum=maximum)
-            return IndicatorResult(indicator_name=self.name, success=True, values={"sar": out.tolist()}, metadata={"acceleration": acceleration, "maximum": maximum, "input_points": len(high), "output_points": len(out)})
+            return IndicatorResult(indicator_name=self.name, success=True, values={"sar": out}, metadata={"acceleration": acceleration, "maximum": maximum, "input_points": len(high), "output_points": len(out)})
         except Exception as e:
             return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
@@ -1,11 +1,10 @@
 """Parabolic SAR - Extended (SAREXT) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
 import talib as ta
 
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -35,8 +34,8 @@ class SAREXTIndicator(BaseIndicator):
     async def calculate(self, market_data: MarketData, options: Dict[str, Any] = None) -> IndicatorResult:
         if options is None:
             options = {}
-        high = np.asarray(market_data.high or [], dtype=float)
-        low = np.asarray(market_data.low or [], dtype=float)
+        high = as_float_array(market_data.high)
+        low = as_float_array(market_data.low)
 
         # Map our input option keys (snake_case) to TA-Lib SAREXT parameter names
         key_map = {
@@ -57,6 +56,6 @@ class SAREXTIndicator(BaseIndicator):
 
         try:
             out = ta.SAREXT(high, low, **params)
-            return IndicatorResult(indicator_name=self.name, success=True, values={"sarext": out.tolist()}, metadata={"input_points": len(high), "output_points": len(out)})
+            return IndicatorResult(indicator_name=self.name, success=True, values={"sarext": out}, metadata={"input_points": len(high), "output_points": len(out)})
         except Exception as e:
             return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
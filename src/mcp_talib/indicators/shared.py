@@ -0,0 +1,158 @@
+"""Intermediate series shared between indicators within one request.
+
+EMA, DEMA and TEMA are combinations of nested EMAs of the same input
+(``EMA(x, n)``, ``EMA(EMA(x, n), n)``, ...), and MA and BBANDS both need the
+moving average of the input. The adapters build their outputs from the
+helpers here, which compute each intermediate series at most once while a
+`shared_scope` is active. The executors open one per batch of
+calculations (`execution.run_indicators`), so a multi-indicator request
+for EMA, DEMA and TEMA of the same period evaluates three EMAs instead of
+six. Outside a scope every call
+computes directly.
+
+T3 is not rebuilt from EMA layers: TA-Lib runs its six EMAs in a single
+pass, which is faster than six separate EMA calls even when three of them
+are shared. Its output is still memoized for MA with ``matype=8``.
+
+All helpers return full-length, NaN-padded arrays, like TA-Lib.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import talib as ta
+
+# TA-Lib MA types that have a shared implementation here
+MA_SMA, MA_EMA, MA_DEMA, MA_TEMA, MA_T3 = 0, 1, 3, 4, 8
+
+_memo: ContextVar[Optional[Dict[Hashable, Tuple[np.ndarray, np.ndarray]]]] = ContextVar("shared_series_memo", default=None)
+
+
+@contextmanager
+def shared_scope() -> Iterator[None]:
+    """Share intermediate series between indicator calls in this block.
+
+    Nested scopes reuse the outermost one.
+    """
+    if _memo.get() is not None:
+        yield
+        return
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def _memoized(values: np.ndarray, key: Tuple[Any, ...], compute: Callable[[], np.ndarray]) -> np.ndarray:
+    memo = _memo.get()
+    if memo is None:
+        return compute()
+    full_key = (id(values),) + key
+    entry = memo.get(full_key)
+    # Holding `values` in the entry keeps its id from being reused
+    if entry is None or entry[0] is not values:
+        entry = memo[full_key] = (values, compute())
+    return entry[1]
+
+
+def _first_defined(values: np.ndarray, block: int = 4096) -> int:
+    """Index of the first non-NaN value, scanning only the NaN prefix."""
+    for start in range(0, values.shape[0], block):
+        defined = np.flatnonzero(~np.isnan(values[start:start + block]))
+        if defined.size:
+            return start + int(defined[0])
+    return values.shape[0]
+
+
+def ema_layers(values: np.ndarray, timeperiod: int, depth: int) -> List[np.ndarray]:
+    """``[EMA(x), EMA(EMA(x)), ...]`` up to ``depth`` levels of nesting."""
+    layers: List[np.ndarray] = []
+    for level in range(depth):
+        source = layers[-1] if layers else values
+        # The talib wrapper skips a leading NaN run (the previous layer's
+        # lookback) and pads the output to match, as TA-Lib's DEMA does.
+        layers.append(_memoized(values, ("ema", timeperiod, level), lambda: ta.EMA(source, timeperiod=timeperiod)))
+    return layers
+
+
+def dema(values: np.ndarray, timeperiod: int) -> np.ndarray:
+    """Double EMA, ``2 * EMA - EMA(EMA)``; matches ``talib.DEMA`` exactly."""
+    e1, e2 = ema_layers(values, timeperiod, 2)
+    out = e1 * 2.0
+    out -= e2
+    return out
+
+
+def tema(values: np.ndarray, timeperiod: int) -> np.ndarray:
+    """Triple EMA, ``3 * EMA - 3 * EMA(EMA) + EMA(EMA(EMA))``; matches
+    ``talib.TEMA`` exactly."""
+    e1, e2, e3 = ema_layers(values, timeperiod, 3)
+    out = e1 * 3.0
+    out -= e2 * 3.0
+    out += e3
+    return out
+
+
+def t3(values: np.ndarray, timeperiod: int, vfactor: float) -> np.ndarray:
+    """Tillson T3 (``talib.T3``), memoized for MA's ``matype=8``."""
+    return _memoized(values, ("t3", timeperiod, vfactor), lambda: ta.T3(values, timeperiod=timeperiod, vfactor=vfactor))
+
+
+def moving_average(values: np.ndarray, timeperiod: int, matype: int) -> np.ndarray:
+    """``talib.MA(values, timeperiod, matype)``, sharing EMA layers."""
+    if timeperiod != 1:
+        if matype == MA_EMA:
+            return ema_layers(values, timeperiod, 1)[0]
+        if matype == MA_DEMA:
+            return _memoized(values, ("dema", timeperiod), lambda: dema(values, timeperiod))
+        if matype == MA_TEMA:
+            return _memoized(values, ("tema", timeperiod), lambda: tema(values, timeperiod))
+        if matype == MA_T3:
+            # TA-Lib's MA uses T3 with its default volume factor
+            return t3(values, timeperiod, 0.7)
+    return _memoized(values, ("ma", timeperiod, matype), lambda: ta.MA(values, timeperiod=timeperiod, matype=matype))
+
+
+def stddev(values: np.ndarray, timeperiod: int, start: Optional[int] = None) -> np.ndarray:
+    """Population standard deviation over each window (``talib.STDDEV``).
+
+    ``start`` is the first output index. TA-Lib's running sums depend on
+    where they begin, so BBANDS passes its moving average's lookback to
+    reproduce ``talib.BBANDS`` exactly.
+    """
+    first = timeperiod - 1 if start is None else max(start, timeperiod - 1)
+
+    def compute() -> np.ndarray:
+        out = np.full(values.shape[0], np.nan)
+        offset = first - (timeperiod - 1)
+        if offset < values.shape[0]:
+            out[offset:] = ta.STDDEV(values[offset:], timeperiod=timeperiod, nbdev=1.0)
+        return out
+
+    if first == timeperiod - 1:
+        return _memoized(values, ("stddev", timeperiod), lambda: ta.STDDEV(values, timeperiod=timeperiod, nbdev=1.0))
+    return _memoized(values, ("stddev", timeperiod, first), compute)
+
+
+def bbands(
+    values: np.ndarray, timeperiod: int, nbdevup: float, nbdevdn: float, matype: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands from the shared moving average and deviation.
+
+    With nothing to share (no active scope), TA-Lib's fused kernel is
+    faster and is used directly.
+    """
+    if _memo.get() is None:
+        return ta.BBANDS(values, timeperiod=timeperiod, nbdevup=nbdevup, nbdevdn=nbdevdn, matype=matype)
+    middle = moving_average(values, timeperiod, matype)
+    # TA-Lib starts the deviation at the moving average's first value
+    deviation = stddev(values, timeperiod, _first_defined(middle))
+    # In place, with the same roundings as TA-Lib's `middle +/- nbdev * std`
+    upper = deviation * nbdevup
+    upper += middle
+    lower = deviation * -nbdevdn
+    lower += middle
+    return upper, middle, lower
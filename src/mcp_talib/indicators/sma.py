@@ -1,13 +1,18 @@
 """Simple Moving Average (SMA) indicator implementation."""
 
-from typing import List, Dict, Any
+from typing import Dict, Any
+
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from .kernels import rolling_mean
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
 class SMAIndicator(BaseIndicator):
     """Simple Moving Average (SMA) indicator implementation."""
+
+    # The NumPy kernel's array loops run without the GIL
+    releases_gil = True
     
     def __init__(self):
         """Initialize SMA indicator."""
@@ -53,7 +58,15 @@ class SMAIndicator(BaseIndicator):
             options = {}
         
         timeperiod = options.get("timeperiod", 20)
-        close_prices = market_data.close
+        close_prices = as_float_array(market_data.close)
+        
+        if timeperiod < 1:
+            return IndicatorResult(
+                indicator_name=self.name,
+                success=False,
+                values={},
+                error_message=f"timeperiod must be at least 1, got {timeperiod}"
+            )
         
         if len(close_prices) < timeperiod:
             return IndicatorResult(
@@ -63,11 +76,8 @@ class SMAIndicator(BaseIndicator):
                 error_message=f"Not enough data points. Need at least {timeperiod}, got {len(close_prices)}"
             )
         
-        # Calculate SMA
-        sma_values = []
-        for i in range(timeperiod - 1, len(close_prices)):
-            avg = sum(close_prices[i - timeperiod + 1:i + 1]) / timeperiod
-            sma_values.append(avg)
+        # Rolling mean over compensated prefix sums: O(n) for any timeperiod
+        sma_values = rolling_mean(close_prices, timeperiod)
         
         return IndicatorResult(
             indicator_name=self.name,
@@ -0,0 +1,357 @@
+"""Incremental (streaming) state for the recursive moving averages.
+
+A state is warmed up once from a history series and then advanced one bar
+at a time with `update`, which costs O(1) regardless of how long the
+history is. Every state reproduces TA-Lib's full-series output: feeding
+``close[:k]`` as warm-up and then ``close[k:]`` bar by bar yields the same
+values as ``talib.<NAME>(close)`` from position ``k`` on, up to float
+rounding. Values inside the lookback window are NaN, as in TA-Lib.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import numpy as np
+import talib as ta
+
+from .kernels import rolling_mean
+from ..models.market_data import as_float_array
+
+# TA-Lib's TA_IS_ZERO tolerance, used by its RSI to avoid dividing by ~0
+_TA_EPSILON = 1e-14
+
+
+def _check_period(timeperiod: Any, minimum: int = 2) -> int:
+    if not isinstance(timeperiod, (int, np.integer)) or isinstance(timeperiod, bool):
+        raise ValueError(f"timeperiod must be an integer, got {timeperiod!r}")
+    if not minimum <= timeperiod <= 100000:
+        raise ValueError(f"timeperiod must be between {minimum} and 100000, got {timeperiod}")
+    return int(timeperiod)
+
+
+def _check_value(value: Any) -> float:
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError("streamed values must be finite")
+    return value
+
+
+class StreamingState(ABC):
+    """Running state of one indicator over one series."""
+
+    name: str = ""
+
+    def __init__(self) -> None:
+        self.value = math.nan
+        self.count = 0
+
+    @property
+    @abstractmethod
+    def lookback(self) -> int:
+        """Number of leading inputs that produce NaN."""
+
+    @property
+    def ready(self) -> bool:
+        """Whether the lookback window has been filled."""
+        return self.count > self.lookback
+
+    @abstractmethod
+    def _step(self, value: float) -> float:
+        """Advance by one finite input and return the new output."""
+
+    def update(self, value: float) -> float:
+        """Append one bar and return the indicator value for it."""
+        self.value = self._step(_check_value(value))
+        self.count += 1
+        return self.value
+
+    def extend(self, values: Sequence[float]) -> np.ndarray:
+        """Append several bars; returns one output per input."""
+        values = as_float_array(values)
+        if values.size and not np.isfinite(values).all():
+            raise ValueError("streamed values must be finite")
+        out = np.empty(values.shape[0], dtype=np.float64)
+        for i, value in enumerate(values.tolist()):
+            out[i] = self._step(value)
+            self.count += 1
+        if values.shape[0]:
+            self.value = float(out[-1])
+        return out
+
+
+class SMAState(StreamingState):
+    """Simple moving average over a ring buffer with a compensated sum."""
+
+    name = "sma"
+
+    def __init__(self, timeperiod: int = 20):
+        super().__init__()
+        self.timeperiod = _check_period(timeperiod, minimum=1)
+        self._window: List[float] = []
+        self._position = 0
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    @property
+    def lookback(self) -> int:
+        return self.timeperiod - 1
+
+    def _add(self, value: float) -> None:
+        # Neumaier summation, so adding and removing values for millions of
+        # ticks does not drift away from the true window sum.
+        total = self._sum + value
+        if abs(self._sum) >= abs(value):
+            self._compensation += (self._sum - total) + value
+        else:
+            self._compensation += (value - total) + self._sum
+        self._sum = total
+
+    def _step(self, value: float) -> float:
+        if len(self._window) < self.timeperiod:
+            self._window.append(value)
+        else:
+            self._add(-self._window[self._position])
+            self._window[self._position] = value
+            self._position = (self._position + 1) % self.timeperiod
+        self._add(value)
+        if len(self._window) < self.timeperiod:
+            return math.nan
+        return (self._sum + self._compensation) / self.timeperiod
+
+    def extend(self, values: Sequence[float]) -> np.ndarray:
+        values = as_float_array(values)
+        if self.count or values.shape[0] < self.timeperiod:
+            return super().extend(values)
+        if not np.isfinite(values).all():
+            raise ValueError("streamed values must be finite")
+        out = np.full(values.shape[0], np.nan)
+        out[self.lookback:] = rolling_mean(values, self.timeperiod)
+        self._window = values[-self.timeperiod:].tolist()
+        self._position = 0
+        self._sum, self._compensation = math.fsum(self._window), 0.0
+        self.count = values.shape[0]
+        self.value = float(out[-1])
+        return out
+
+
+class EMAState(StreamingState):
+    """Exponential moving average seeded with the SMA of the first window."""
+
+    name = "ema"
+
+    def __init__(self, timeperiod: int = 20):
+        super().__init__()
+        self.timeperiod = _check_period(timeperiod, minimum=1)
+        self.k = 2.0 / (self.timeperiod + 1)
+        self._seed = 0.0
+
+    @property
+    def lookback(self) -> int:
+        return self.timeperiod - 1
+
+    def _step(self, value: float) -> float:
+        if self.timeperiod == 1:
+            # TA-Lib copies the input; `(value - prev) * 1 + prev` would round
+            return value
+        if self.count < self.timeperiod:
+            self._seed += value
+            return self._seed / self.timeperiod if self.count + 1 == self.timeperiod else math.nan
+        return (value - self.value) * self.k + self.value
+
+    def extend(self, values: Sequence[float]) -> np.ndarray:
+        values = as_float_array(values)
+        if values.size and not np.isfinite(values).all():
+            raise ValueError("streamed values must be finite")
+        if self.count or values.shape[0] < self.timeperiod:
+            # `_step` reads the previous output, so keep `value` current
+            out = np.empty(values.shape[0], dtype=np.float64)
+            for i, value in enumerate(values.tolist()):
+                self.value = out[i] = self._step(value)
+                self.count += 1
+            return out
+        # Fresh state with a full window: warm up in C
+        out = ta.EMA(values, timeperiod=self.timeperiod)
+        self.count = values.shape[0]
+        self.value = float(out[-1])
+        return out
+
+
+def _extend_defined(state: StreamingState, values: np.ndarray) -> np.ndarray:
+    """Feed the non-NaN tail of an upstream output into ``state``."""
+    out = np.full(values.shape[0], np.nan)
+    defined = np.flatnonzero(~np.isnan(values))
+    if defined.size:
+        out[defined[0]:] = state.extend(values[defined[0]:])
+    return out
+
+
+class _EMAChainState(StreamingState):
+    """Base for indicators built from EMAs of EMAs of the input."""
+
+    depth = 1
+
+    def __init__(self, timeperiod: int):
+        super().__init__()
+        self.timeperiod = _check_period(timeperiod, minimum=1)
+        self._emas = [EMAState(self.timeperiod) for _ in range(self.depth)]
+
+    @property
+    def lookback(self) -> int:
+        return self.depth * (self.timeperiod - 1)
+
+    @abstractmethod
+    def _combine(self, layers: List[Any]) -> Any:
+        """Combine the EMA layers (scalars or arrays) into the output."""
+
+    def _step(self, value: float) -> float:
+        layers = []
+        for ema in self._emas:
+            value = ema.update(value)
+            if math.isnan(value):
+                return math.nan
+            layers.append(value)
+        return self._combine(layers)
+
+    def extend(self, values: Sequence[float]) -> np.ndarray:
+        values = as_float_array(values)
+        layers = [self._emas[0].extend(values)]
+        for ema in self._emas[1:]:
+            layers.append(_extend_defined(ema, layers[-1]))
+        out = self._combine(layers)
+        self.count += values.shape[0]
+        if values.shape[0]:
+            self.value = float(out[-1])
+        return out
+
+
+class DEMAState(_EMAChainState):
+    """Double EMA: ``2 * EMA - EMA(EMA)``."""
+
+    name = "dema"
+    depth = 2
+
+    def __init__(self, timeperiod: int = 30):
+        super().__init__(timeperiod)
+
+    def _combine(self, layers: List[Any]) -> Any:
+        return 2.0 * layers[0] - layers[1]
+
+
+class TEMAState(_EMAChainState):
+    """Triple EMA: ``3 * EMA - 3 * EMA(EMA) + EMA(EMA(EMA))``."""
+
+    name = "tema"
+    depth = 3
+
+    def __init__(self, timeperiod: int = 30):
+        super().__init__(timeperiod)
+
+    def _combine(self, layers: List[Any]) -> Any:
+        return 3.0 * layers[0] - 3.0 * layers[1] + layers[2]
+
+
+class T3State(_EMAChainState):
+    """Tillson T3: a weighted sum of the 3rd to 6th nested EMAs."""
+
+    name = "t3"
+    depth = 6
+
+    def __init__(self, timeperiod: int = 5, vfactor: float = 0.7):
+        super().__init__(timeperiod)
+        if not 0.0 <= vfactor <= 1.0:
+            raise ValueError(f"vfactor must be between 0 and 1, got {vfactor}")
+        self.vfactor = float(vfactor)
+        v = self.vfactor
+        self._c1 = -v * v * v
+        self._c2 = 3.0 * (v * v + v * v * v)
+        self._c3 = -6.0 * v * v - 3.0 * (v + v * v * v)
+        self._c4 = 1.0 + 3.0 * v + v * v * v + 3.0 * v * v
+
+    def _combine(self, layers: List[Any]) -> Any:
+        return self._c1 * layers[5] + self._c2 * layers[4] + self._c3 * layers[3] + self._c4 * layers[2]
+
+
+class RSIState(StreamingState):
+    """Wilder RSI, keeping the smoothed average gain and loss."""
+
+    name = "rsi"
+
+    def __init__(self, timeperiod: int = 14):
+        super().__init__()
+        self.timeperiod = _check_period(timeperiod)
+        self._previous: Optional[float] = None
+        self._gain = 0.0
+        self._loss = 0.0
+
+    @property
+    def lookback(self) -> int:
+        return self.timeperiod
+
+    def _rsi(self) -> float:
+        total = self._gain + self._loss
+        if -_TA_EPSILON < total < _TA_EPSILON:
+            return 0.0
+        return 100.0 * (self._gain / total)
+
+    def _step(self, value: float) -> float:
+        previous, self._previous = self._previous, value
+        if previous is None:
+            return math.nan
+        change = value - previous
+        period = self.timeperiod
+        if self.count <= period:
+            # Seed: plain average of the first `timeperiod` changes
+            if change < 0:
+                self._loss -= change
+            else:
+                self._gain += change
+            if self.count < period:
+                return math.nan
+            self._loss /= period
+            self._gain /= period
+            return self._rsi()
+        self._loss *= period - 1
+        self._gain *= period - 1
+        if change < 0:
+            self._loss -= change
+        else:
+            self._gain += change
+        self._loss /= period
+        self._gain /= period
+        return self._rsi()
+
+
+STREAMING_STATES: Dict[str, Type[StreamingState]] = {
+    "sma": SMAState,
+    "ema": EMAState,
+    "rsi": RSIState,
+    "dema": DEMAState,
+    "tema": TEMAState,
+    "t3": T3State,
+}
+
+
+def create_state(
+    indicator_name: str,
+    options: Optional[Dict[str, Any]] = None,
+    warmup: Optional[Sequence[float]] = None,
+) -> StreamingState:
+    """Create the streaming state of ``indicator_name`` and warm it up.
+
+    ``options`` takes the same parameters as the indicator's ``calculate``.
+    Raises ``ValueError`` for an indicator without incremental support or
+    for invalid options.
+    """
+    state_class = STREAMING_STATES.get(indicator_name)
+    if state_class is None:
+        raise ValueError(
+            f"indicator '{indicator_name}' has no streaming state; supported: {', '.join(sorted(STREAMING_STATES))}"
+        )
+    try:
+        state = state_class(**(options or {}))
+    except TypeError as e:
+        raise ValueError(f"invalid options for '{indicator_name}': {e}") from e
+    if warmup is not None:
+        state.extend(warmup)
+    return state
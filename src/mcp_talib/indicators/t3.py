@@ -1,11 +1,10 @@
 """Triple Exponential Moving Average (T3) adapter using TA-Lib."""
 
 from typing import Dict, Any
-import numpy as np
-import talib as ta
 
+from . import shared
 from .base import BaseIndicator
-from ..models.market_data import MarketData
+from ..models.market_data import MarketData, as_float_array
 from ..models.indicator_result import IndicatorResult
 
 
@@ -22,10 +21,10 @@ class T3Indicator(BaseIndicator):
             options = {}
         timeperiod = options.get("timeperiod", 5)
         vfactor = options.get("vfactor", 0.7)
-        close = np.asarray(market_data.close, dtype=float)
+        close = as_float_array(market_data.close)
 
         try:
-            out = ta.T3(close, timeperiod=timeperiod, vfactor=vfactor)
-            return IndicatorResult(indicator_name=self.name, success=True, values={"t3": out.tolist()}, metadata={"timeperiod": timeperiod, "vfactor": vfactor, "input_points": len(close), "output_points": len(out)})
+            out = shared.t3(close, timeperiod, vfactor)
+            return IndicatorResult(indicator_name=self.name, success=True, values={"t3": out}, metadata={"timeperiod": timeperiod, "vfactor": vfactor, "input_points": len(close), "output_points": len(out)})
         except Exception as e:
             return IndicatorResult(indicator_name=self.name, success=False, values={}, error_message=str(e))
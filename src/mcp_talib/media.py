@@ -0,0 +1,235 @@
+"""Binary request bodies and response negotiation for the HTTP API.
+
+Large series parse much faster from binary than from JSON text. Besides
+``application/json``, the endpoints that take price columns accept:
+
+``application/octet-stream``
+    Raw little-endian float64 values. With several ``columns`` the body
+    holds them one after another, each ``len(body) / 8 / len(columns)``
+    values long.
+``application/x-npy``
+    A NumPy ``.npy`` file holding a 1-D array (one column), a 2-D
+    ``(columns, length)`` array, or a structured array whose field names
+    are the columns.
+``application/vnd.apache.arrow.stream`` / ``application/vnd.apache.arrow.file``
+    Arrow IPC record batches whose column names are the columns; needs
+    the optional ``pyarrow`` dependency.
+
+Raw and ``.npy`` bodies name their columns with the ``columns`` query
+parameter (default ``close``). Column arrays are views of the request body
+wherever the layout allows (raw, 1-D and 2-D ``.npy``, single-batch Arrow
+columns without nulls), so no per-value work happens before validation.
+
+Responses follow the ``Accept`` header (see `negotiate`): JSON by default,
+or MessagePack, raw frames, Arrow IPC or one of the streamed encodings,
+encoded by `serialization`.
+"""
+
+import io
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RAW = "application/octet-stream"
+NPY = "application/x-npy"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+BINARY_TYPES = (RAW, NPY, ARROW_STREAM, ARROW_FILE)
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+# A JSON header followed by the raw output buffers, see `serialization.encode_frames`
+FRAMES = "application/vnd.mcp-talib.frames"
+# Streamed in chunks of bars, see `serialization.iter_ndjson` / `iter_frame_stream`
+NDJSON = "application/x-ndjson"
+FRAME_STREAM = "application/vnd.mcp-talib.frame-stream"
+STREAM_TYPES = (NDJSON, FRAME_STREAM)
+# Response types in order of preference when the client has none
+RESULT_TYPES = (JSON, MSGPACK, FRAMES, ARROW_STREAM, ARROW_FILE, *STREAM_TYPES)
+PAYLOAD_TYPES = (JSON, MSGPACK)
+
+# Older names clients still send
+_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+
+class UnsupportedMediaTypeError(ValueError):
+    """Raised for a request body type the API cannot decode."""
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """The bare media type of a Content-Type header, lower-cased."""
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def is_binary(content_type: Optional[str]) -> bool:
+    """Whether ``content_type`` is one of the binary body types."""
+    return media_type(content_type) in BINARY_TYPES
+
+
+def negotiate(accept: Optional[str], offered: Sequence[str] = RESULT_TYPES) -> Optional[str]:
+    """The ``offered`` type an ``Accept`` header prefers, or None if none is acceptable.
+
+    Follows RFC 9110: the highest quality wins, a ``type/*`` or ``*/*``
+    range matches any subtype, and ties go to the earlier ``offered`` type.
+    A missing or empty header accepts the first offered type.
+    """
+    if not accept or not accept.strip():
+        return offered[0] if offered else None
+    ranges: List[Tuple[str, float]] = []
+    for item in accept.split(","):
+        kind, *parameters = item.split(";")
+        kind = media_type(kind)
+        quality = 1.0
+        for parameter in parameters:
+            key, _, value = parameter.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if kind:
+            ranges.append((_ALIASES.get(kind, kind), quality))
+
+    def quality_of(kind: str) -> float:
+        # The most specific matching range decides, as the RFC requires
+        major = kind.split("/", 1)[0]
+        for pattern in (kind, f"{major}/*", "*/*"):
+            matches = [quality for candidate, quality in ranges if candidate == pattern]
+            if matches:
+                return max(matches)
+        return 0.0
+
+    best, best_quality = None, 0.0
+    for kind in offered:
+        quality = quality_of(kind)
+        if quality > best_quality:
+            best, best_quality = kind, quality
+    return best
+
+
+def parse_columns(value: Optional[str]) -> List[str]:
+    """Column names from a comma-separated ``columns`` query parameter."""
+    names = [name.strip() for name in (value or "close").split(",") if name.strip()]
+    if not names:
+        raise ValueError("`columns` names no columns")
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate names in `columns`: {','.join(names)}")
+    return names
+
+
+def parse_query_params(items: Iterable[Tuple[str, str]], reserved: Sequence[str] = ()) -> Dict[str, Any]:
+    """Indicator parameters from query items, skipping ``reserved`` keys.
+
+    Values are read as JSON where possible (``14``, ``0.5``, ``true``,
+    ``[3,4]``) and kept as strings otherwise.
+    """
+    params: Dict[str, Any] = {}
+    for key, value in items:
+        if key in reserved:
+            continue
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+
+def decode_columns(
+    body: bytes, content_type: Optional[str], columns: Optional[Sequence[str]] = None
+) -> Dict[str, np.ndarray]:
+    """Decode a binary request body into named column arrays.
+
+    ``columns`` names the columns of raw and ``.npy`` bodies (default
+    ``["close"]``); Arrow bodies carry their own names. Raises
+    `UnsupportedMediaTypeError` for other content types and ``ValueError``
+    for malformed bodies.
+    """
+    kind = media_type(content_type)
+    if kind == RAW:
+        return _decode_raw(body, list(columns or ["close"]))
+    if kind == NPY:
+        return _decode_npy(body, list(columns or ["close"]))
+    if kind in (ARROW_STREAM, ARROW_FILE):
+        return _decode_arrow(body, kind)
+    raise UnsupportedMediaTypeError(
+        f"unsupported content type '{kind}'; use application/json or one of {', '.join(BINARY_TYPES)}"
+    )
+
+
+def _split(values: np.ndarray, columns: List[str]) -> Dict[str, np.ndarray]:
+    if values.shape[0] % len(columns):
+        raise ValueError(f"{values.shape[0]} values cannot be split evenly into {len(columns)} columns")
+    length = values.shape[0] // len(columns)
+    return {name: values[i * length:(i + 1) * length] for i, name in enumerate(columns)}
+
+
+def _decode_raw(body: bytes, columns: List[str]) -> Dict[str, np.ndarray]:
+    if len(body) % 8:
+        raise ValueError(f"raw float64 body has {len(body)} bytes, not a multiple of 8")
+    return _split(np.frombuffer(body, dtype="<f8"), columns)
+
+
+_NPY_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+
+def _decode_npy(body: bytes, columns: List[str]) -> Dict[str, np.ndarray]:
+    header = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(header)
+        read_header = _NPY_HEADER_READERS.get(version)
+        if read_header is None:
+            raise ValueError(f"unsupported format version {version}")
+        shape, fortran_order, dtype = read_header(header)
+    except ValueError as e:
+        raise ValueError(f"invalid .npy body: {e}") from e
+    if dtype.hasobject:
+        raise ValueError(".npy bodies cannot hold Python objects")
+    count = int(np.prod(shape))
+    offset = header.tell()
+    if len(body) - offset != count * dtype.itemsize:
+        raise ValueError(
+            f".npy body holds {len(body) - offset} data bytes; its header describes {count * dtype.itemsize}"
+        )
+    array = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+    array = array.reshape(shape, order="F" if fortran_order else "C")
+
+    if dtype.names:
+        # Field views are strided; validation makes them contiguous
+        return {name: array[name] for name in dtype.names}
+    if array.ndim == 1:
+        return _split(array, columns)
+    if array.ndim == 2:
+        if array.shape[0] != len(columns):
+            raise ValueError(f".npy array has {array.shape[0]} rows but `columns` names {len(columns)}")
+        return {name: array[i] for i, name in enumerate(columns)}
+    raise ValueError(f".npy array must be 1-D or 2-D, got shape {shape}")
+
+
+def _decode_arrow(body: bytes, kind: str) -> Dict[str, np.ndarray]:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise UnsupportedMediaTypeError("Arrow request bodies need the optional `pyarrow` package") from e
+    buffer = pa.py_buffer(body)
+    try:
+        if kind == ARROW_STREAM:
+            table = pa.ipc.open_stream(buffer).read_all()
+        else:
+            table = pa.ipc.open_file(buffer).read_all()
+    except pa.ArrowInvalid as e:
+        raise ValueError(f"invalid Arrow IPC body: {e}") from e
+    columns: Dict[str, np.ndarray] = {}
+    for name, column in zip(table.column_names, table.columns):
+        if column.null_count:
+            raise ValueError(f"Arrow column '{name}' contains nulls")
+        if column.num_chunks == 0:
+            columns[name] = np.empty(0)
+            continue
+        # A single chunk without nulls converts as a view of the body
+        chunk = column.chunks[0] if column.num_chunks == 1 else column.combine_chunks()
+        columns[name] = chunk.to_numpy(zero_copy_only=False)
+    return columns
@@ -0,0 +1,273 @@
+"""Runtime metrics in the Prometheus text format.
+
+Both FastAPI apps serve ``GET /metrics`` and the MCP server exposes the
+same text as the resource ``metrics://prometheus``. Recorded per process:
+
+- requests, errors, latency histograms and bytes in and out, by
+  ``transport`` and ``tool``. HTTP requests are measured by
+  `MetricsMiddleware`, with ``tool`` the indicator of ``/api/tools/{name}``
+  and the route path otherwise. MCP tool calls are measured by the tool
+  wrapper, so their ``tool`` is the MCP tool name and their transport is
+  the one serving them (`current_transport`). Requests reach FastMCP
+  already parsed, so MCP calls count response bytes only.
+- input and output points and calculation time of each indicator run, from
+  `execution.run_indicators` and, for shared-kernel sweeps, one per grid
+  point from `sweep.run_sweep`. Cached results count toward the points
+  but not the calculation time.
+- the result cache counters and occupancy, read when rendered.
+
+The implementation has no dependencies; it keeps label sets small by
+mapping unknown tool names to ``"unknown"``.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .cache import get_result_cache
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POINT_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Transport label of MCP tool calls; each transport sets it before serving
+current_transport: ContextVar[str] = ContextVar("metrics_transport", default="mcp")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, List[Any]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            # Counts per bucket plus +Inf, then the sum
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self, name: str) -> Iterable[str]:
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}"
+            yield f"{name}_sum{_format_labels(labels)} {_format_value(total)}"
+            yield f"{name}_count{_format_labels(labels)} {cumulative}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels) + "}"
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Metrics:
+    """Thread-safe registry of the request and calculation metrics."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {
+            "requests": {},
+            "errors": {},
+            "bytes_in": {},
+            "bytes_out": {},
+        }
+        self._latency = Histogram(LATENCY_BUCKETS)
+        self._calculation = Histogram(LATENCY_BUCKETS)
+        self._input_points = Histogram(POINT_BUCKETS)
+        self._output_points = Histogram(POINT_BUCKETS)
+
+    def _add(self, counter: str, labels: Labels, amount: float) -> None:
+        values = self._counters[counter]
+        values[labels] = values.get(labels, 0) + amount
+
+    def observe_request(
+        self,
+        transport: str,
+        tool: str,
+        seconds: float,
+        ok: bool = True,
+        bytes_in: Optional[int] = None,
+        bytes_out: Optional[int] = None,
+    ) -> None:
+        """Record one request; ``bytes_in``/``bytes_out`` are left out when unknown."""
+        labels = (("transport", transport), ("tool", tool))
+        with self._lock:
+            self._add("requests", labels, 1)
+            if not ok:
+                self._add("errors", labels, 1)
+            self._latency.observe(labels, seconds)
+            if bytes_in is not None:
+                self._add("bytes_in", labels, bytes_in)
+            if bytes_out is not None:
+                self._add("bytes_out", labels, bytes_out)
+
+    def observe_calculation(
+        self,
+        indicator: str,
+        input_points: Optional[int],
+        output_points: Optional[int],
+        seconds: Optional[float] = None,
+    ) -> None:
+        """Record one indicator result; ``seconds`` only for fresh calculations."""
+        labels = (("indicator", indicator),)
+        with self._lock:
+            if input_points is not None:
+                self._input_points.observe(labels, input_points)
+            if output_points is not None:
+                self._output_points.observe(labels, output_points)
+            if seconds is not None:
+                self._calculation.observe(labels, seconds)
+
+    def value(self, counter: str, **labels: str) -> float:
+        """Current value of a counter, e.g. ``value("requests", transport="http", tool="sma")``."""
+        with self._lock:
+            return self._counters[counter].get(tuple(labels.items()), 0)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Iterable[str]) -> None:
+            lines.extend((f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"))
+            lines.extend(samples)
+
+        def counter(name: str, key: str, help_text: str) -> None:
+            samples = (f"{name}{_format_labels(labels)} {_format_value(v)}" for labels, v in sorted(self._counters[key].items()))
+            family(name, "counter", help_text, samples)
+
+        with self._lock:
+            counter("mcp_talib_requests_total", "requests", "Requests handled, by transport and tool.")
+            counter("mcp_talib_request_errors_total", "errors", "Requests that failed, by transport and tool.")
+            family(
+                "mcp_talib_request_duration_seconds",
+                "histogram",
+                "Time from receiving a request to sending the last response byte.",
+                self._latency.samples("mcp_talib_request_duration_seconds"),
+            )
+            counter("mcp_talib_request_bytes_total", "bytes_in", "Request body bytes received.")
+            counter("mcp_talib_response_bytes_total", "bytes_out", "Response body bytes sent.")
+            family(
+                "mcp_talib_calculation_seconds",
+                "histogram",
+                "Indicator calculation time, excluding cached results.",
+                self._calculation.samples("mcp_talib_calculation_seconds"),
+            )
+            family(
+                "mcp_talib_input_points",
+                "histogram",
+                "Input bars per indicator result.",
+                self._input_points.samples("mcp_talib_input_points"),
+            )
+            family(
+                "mcp_talib_output_points",
+                "histogram",
+                "Output bars per indicator result.",
+                self._output_points.samples("mcp_talib_output_points"),
+            )
+
+        cache = get_result_cache().stats()
+        for key, kind, help_text in (
+            ("hits", "counter", "Result cache lookups answered from the cache."),
+            ("misses", "counter", "Result cache lookups that had to calculate."),
+            ("evictions", "counter", "Results evicted from the cache."),
+            ("entries", "gauge", "Results held by the cache."),
+            ("bytes", "gauge", "Bytes held by the cache."),
+        ):
+            name = f"mcp_talib_cache_{key}" + ("_total" if kind == "counter" else "")
+            family(name, kind, help_text, [f"{name} {cache[key]}"])
+        return "\n".join(lines) + "\n"
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """The ``tool`` label of an HTTP request, once it has been routed."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return "unmatched"
+    tool = scope.get("path_params", {}).get("tool_name")
+    if tool is not None and path == "/api/tools/{tool_name}":
+        from .indicators import registry
+
+        return tool if registry.get_indicator(tool) else "unknown"
+    return path
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording every HTTP request of an app under ``transport``.
+
+    Latency runs until the last body chunk is sent, so streamed responses
+    count in full; requests that raise count as errors.
+    """
+
+    def __init__(self, app: Any, transport: str = "http"):
+        self.app = app
+        self.transport = transport
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        received = sent = 0
+        status = 500
+
+        async def counting_receive() -> Dict[str, Any]:
+            nonlocal received
+            message = await receive()
+            received += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Dict[str, Any]) -> None:
+            nonlocal sent, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            get_metrics().observe_request(
+                self.transport,
+                route_label(scope),
+                time.perf_counter() - started,
+                ok=status < 400,
+                bytes_in=received,
+                bytes_out=sent,
+            )
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """Return the process-wide metrics shared by every transport."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
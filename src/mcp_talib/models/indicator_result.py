@@ -5,11 +5,15 @@ from pydantic import BaseModel, Field
 
 
 class IndicatorResult(BaseModel):
-    """Result of indicator calculation."""
+    """Result of indicator calculation.
+
+    Output series in `values` are kept as ndarrays; transports convert them
+    once, when sending, via `mcp_talib.serialization`.
+    """
     
     indicator_name: str = Field(..., description="Name of calculated indicator")
     success: bool = Field(default=True, description="Whether calculation succeeded")
-    values: Dict[str, Any] = Field(..., description="Calculated indicator values")
+    values: Dict[str, Any] = Field(..., description="Calculated indicator values (one ndarray per output series)")
     error_message: Optional[str] = Field(None, description="Error details if calculation failed")
     calculation_time: Optional[float] = Field(None, description="Time taken for calculation in milliseconds")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional calculation metadata")
\ No newline at end of file
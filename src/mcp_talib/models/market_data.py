@@ -1,7 +1,9 @@
 """Market data model."""
 
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator, field_validator
+from typing import List, Literal, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator, model_validator
 
 
 class MarketData(BaseModel):
@@ -42,4 +44,122 @@ class MarketData(BaseModel):
     @property
     def length(self) -> int:
         """Total number of data points."""
-        return len(self.close)
\ No newline at end of file
+        return len(self.close)
+
+_PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Storage precision of price columns. float32 halves memory and payloads;
+# calculations still run in double precision (see `as_float_array`).
+Precision = Literal["float64", "float32"]
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+
+def as_float_array(values: Optional[Sequence[float]]) -> np.ndarray:
+    """Return a price column as a float64 ndarray.
+
+    Columns that already are contiguous float64 arrays (as held by
+    `ColumnarMarketData`) are returned as-is without copying; lists are
+    converted. float32 columns are upcast, because TA-Lib only computes in
+    double precision. A missing column becomes an empty array.
+    """
+    if values is None:
+        return np.empty(0, dtype=np.float64)
+    return np.asarray(values, dtype=np.float64)
+
+
+class ColumnarMarketData(BaseModel):
+    """OHLCV market data stored as contiguous float64 columns.
+
+    Accepts lists or ndarrays. Float64 ndarrays are kept by reference, so
+    adapters receive the caller's buffer without any per-element work.
+    Validation is vectorized: every column must be one-dimensional,
+    non-empty, finite and share a single length. `close` is optional so
+    high/low-only indicators (SAR, MIDPRICE) need no placeholder series.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    close: Optional[np.ndarray] = Field(None, description="Closing prices array")
+    open: Optional[np.ndarray] = Field(None, description="Opening prices array")
+    high: Optional[np.ndarray] = Field(None, description="Highest prices array")
+    low: Optional[np.ndarray] = Field(None, description="Lowest prices array")
+    volume: Optional[np.ndarray] = Field(None, description="Trading volumes array (optional)")
+    timestamp: Optional[np.ndarray] = Field(None, description="Unix timestamps (optional)")
+
+    # Content hash of the columns, computed once by the result cache
+    _fingerprint: Optional[bytes] = PrivateAttr(None)
+
+    @field_validator(*_PRICE_COLUMNS, mode="before")
+    @classmethod
+    def validate_price_column(cls, v):
+        if v is None:
+            return v
+        arr = np.ascontiguousarray(v, dtype=np.float64)
+        if arr.ndim != 1:
+            raise ValueError("Price arrays must be one-dimensional")
+        if arr.size == 0:
+            raise ValueError("Price arrays cannot be empty")
+        # A single reduction catches NaN/inf without allocating a mask; only
+        # fall back to the elementwise check if the sum itself overflowed.
+        if not np.isfinite(np.add.reduce(arr)) and not np.isfinite(arr).all():
+            raise ValueError("Price arrays must contain only finite values")
+        return arr
+
+    @field_validator("timestamp", mode="before")
+    @classmethod
+    def validate_timestamp_column(cls, v):
+        if v is None:
+            return v
+        arr = np.ascontiguousarray(v, dtype=np.int64)
+        if arr.ndim != 1:
+            raise ValueError("Timestamp array must be one-dimensional")
+        return arr
+
+    @model_validator(mode="after")
+    def validate_lengths(self):
+        columns = {name: getattr(self, name) for name in _PRICE_COLUMNS}
+        present = {name: len(col) for name, col in columns.items() if col is not None}
+        if not any(name in present for name in ("close", "high", "low")):
+            raise ValueError("At least one of close, high or low is required")
+        if len(set(present.values())) > 1:
+            raise ValueError(f"Price arrays must have matching lengths, got {present}")
+        if self.timestamp is not None and len(self.timestamp) != self.length:
+            raise ValueError("Timestamp array must match price array length")
+        return self
+
+    @classmethod
+    def from_market_data(cls, market_data: MarketData) -> "ColumnarMarketData":
+        """Convert a list-based `MarketData` into columnar form."""
+        return cls(**market_data.model_dump(exclude_none=True))
+
+    @property
+    def precision(self) -> Precision:
+        """Storage precision of the price columns."""
+        for name in ("close", "high", "low"):
+            column = getattr(self, name)
+            if column is not None:
+                return "float32" if column.dtype == np.float32 else "float64"
+        return "float64"
+
+    def with_precision(self, precision: Optional[Precision]) -> "ColumnarMarketData":
+        """Return this data with price columns stored at ``precision``.
+
+        Returns ``self`` when nothing changes; timestamps are kept as-is.
+        """
+        if precision is None or precision == self.precision:
+            return self
+        dtype = PRECISIONS[precision]
+        columns = {name: getattr(self, name) for name in _PRICE_COLUMNS + ("timestamp",)}
+        return ColumnarMarketData.model_construct(**{
+            name: column.astype(dtype) if column is not None and name != "timestamp" else column
+            for name, column in columns.items()
+        })
+
+    @property
+    def length(self) -> int:
+        """Total number of data points."""
+        for name in ("close", "high", "low"):
+            column = getattr(self, name)
+            if column is not None:
+                return len(column)
+        return 0
@@ -0,0 +1,318 @@
+"""On-demand profiling of a single calculation.
+
+When ``MCP_TALIB_PROFILING`` is enabled, a request can ask for its
+calculation to be profiled: HTTP tool calls with an ``X-Profile: 1``
+header (answered with an ``X-Profile-Id`` header), MCP ``calculate_*``
+tools with ``profile=true`` (answered with a ``profile`` entry). That one
+calculation then runs inline under `StackProfiler`, bypassing the result
+cache and the executor but otherwise treated like any other (output
+precision, metrics), and yields a `Profile` with:
+
+- a hot-function table (calls, self and total time per function) and a
+  hot-line table (time per source line, callees excluded)
+- collapsed stacks (``frame;frame;file.py:line microseconds`` per line),
+  the input format of ``flamegraph.pl``, speedscope and similar tools
+
+The profiler is deterministic: it traces every Python call and line of the
+calculating thread. Compiled TA-Lib functions report no calls of their
+own, and a sampling thread cannot run while they hold the GIL, so their
+time shows up on the line of the indicator that calls them.
+
+Profiles are also written to ``MCP_TALIB_PROFILE_DIR`` (default
+``<tempdir>/mcp-talib-profiles``) as ``<id>.txt`` and ``<id>.collapsed``,
+where `load_profile` reads them back. Only the newest
+``MCP_TALIB_PROFILE_MAX_COUNT`` profiles are kept.
+"""
+
+import linecache
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import get_settings
+from .execution import match_input_precision, observe_results, run_indicator
+from .indicators.base import BaseIndicator
+from .indicators.shared import shared_scope
+from .models.indicator_result import IndicatorResult
+
+# Request header asking for a profile, and response header naming it
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+
+# Rows of the hot-function and hot-line tables
+HOT_ROWS = 25
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ProfilingDisabledError(PermissionError):
+    """Raised when a profile is requested but ``MCP_TALIB_PROFILING`` is off."""
+
+
+def _check_enabled() -> None:
+    if not get_settings().profiling:
+        raise ProfilingDisabledError("profiling is disabled; set MCP_TALIB_PROFILING=1 to enable it")
+
+
+def _frame_label(frame: Any) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class StackProfiler:
+    """Deterministic profiler recording the time spent on each line of each call stack.
+
+    A stack is the functions entered, outermost first, followed by the
+    ``file.py:line`` the innermost one was on. Only the thread that calls
+    `start` is profiled.
+    """
+
+    def __init__(self) -> None:
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+        self.calls: Dict[str, int] = {}
+        self._functions: List[str] = []
+        self._lines: List[str] = []
+        # (filename, line number) -> "file.py:line"
+        self._line_labels: Dict[Tuple[str, int], str] = {}
+        self._last = 0.0
+
+    def _line_label(self, frame: Any) -> str:
+        key = (frame.f_code.co_filename, frame.f_lineno)
+        label = self._line_labels.get(key)
+        if label is None:
+            label = self._line_labels[key] = f"{os.path.basename(key[0])}:{key[1]}"
+        return label
+
+    def _event(self, frame: Any, event: str, arg: Any) -> Any:
+        now = time.perf_counter()
+        if self._functions:
+            key = (*self._functions, self._lines[-1])
+            self.stacks[key] = self.stacks.get(key, 0.0) + now - self._last
+        if event == "call":
+            label = _frame_label(frame)
+            self._functions.append(label)
+            self._lines.append(self._line_label(frame))
+            self.calls[label] = self.calls.get(label, 0) + 1
+        elif event == "line":
+            self._lines[-1] = self._line_label(frame)
+        elif event == "return":
+            self._functions.pop()
+            self._lines.pop()
+        # Leave the hook's own time out of the next span
+        self._last = time.perf_counter()
+        return self._event
+
+    def start(self) -> None:
+        self._last = time.perf_counter()
+        sys.settrace(self._event)
+
+    def stop(self) -> None:
+        sys.settrace(None)
+
+    def profile(self, seconds: float) -> "Profile":
+        """The recorded stacks as a `Profile`, without the call to `stop`."""
+        stop = f"{__name__}:StackProfiler.stop"
+        stacks = {key: spent for key, spent in self.stacks.items() if stop not in key}
+        calls = {name: count for name, count in self.calls.items() if name != stop}
+        sources = {
+            label: linecache.getline(filename, line).strip() for (filename, line), label in self._line_labels.items()
+        }
+        return Profile.from_stacks(stacks, calls, sources, seconds)
+
+
+@dataclass
+class FunctionStats:
+    name: str
+    calls: int
+    self_ms: float
+    total_ms: float
+
+
+@dataclass
+class LineStats:
+    line: str
+    function: str
+    ms: float
+    source: str
+
+
+@dataclass
+class Profile:
+    """The hot functions, hot lines and collapsed stacks of one profiled calculation."""
+
+    seconds: float
+    functions: List[FunctionStats]
+    lines: List[LineStats]
+    stacks: Dict[Tuple[str, ...], float]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @classmethod
+    def from_stacks(
+        cls,
+        stacks: Dict[Tuple[str, ...], float],
+        calls: Dict[str, int],
+        sources: Dict[str, str],
+        seconds: float,
+    ) -> "Profile":
+        own: Dict[str, float] = {}
+        total: Dict[str, float] = {}
+        lines: Dict[Tuple[str, str], float] = {}
+        for stack, spent in stacks.items():
+            *functions, line = stack
+            own[functions[-1]] = own.get(functions[-1], 0.0) + spent
+            # Recursive functions count once per stack
+            for name in set(functions):
+                total[name] = total.get(name, 0.0) + spent
+            lines[line, functions[-1]] = lines.get((line, functions[-1]), 0.0) + spent
+        function_stats = [
+            FunctionStats(name, calls.get(name, 0), own.get(name, 0.0) * 1000, total[name] * 1000) for name in total
+        ]
+        function_stats.sort(key=lambda f: (f.self_ms, f.total_ms), reverse=True)
+        line_stats = [
+            LineStats(line, function, spent * 1000, sources.get(line, "")) for (line, function), spent in lines.items()
+        ]
+        line_stats.sort(key=lambda line: line.ms, reverse=True)
+        return cls(seconds=seconds, functions=function_stats, lines=line_stats, stacks=stacks)
+
+    def table(self, limit: Optional[int] = HOT_ROWS) -> str:
+        """The hot-function and hot-line tables as text."""
+        rows = [
+            f"profile {self.id}: {self.seconds * 1000:.3f} ms",
+            "",
+            f"{'self ms':>10} {'total ms':>10} {'calls':>8}  function",
+        ]
+        rows += [f"{f.self_ms:>10.3f} {f.total_ms:>10.3f} {f.calls:>8}  {f.name}" for f in self.functions[:limit]]
+        rows += ["", f"{'ms':>10}  line"]
+        rows += [f"{line.ms:>10.3f}  {line.line}  {line.source}" for line in self.lines[:limit]]
+        return "\n".join(rows) + "\n"
+
+    def collapsed(self) -> str:
+        """Collapsed stacks weighted in microseconds, for flame graph tools."""
+        lines = [
+            f"{';'.join(stack)} {round(spent * 1e6)}"
+            for stack, spent in sorted(self.stacks.items())
+            if round(spent * 1e6)
+        ]
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self, limit: int = HOT_ROWS) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "milliseconds": self.seconds * 1000,
+            "functions": [vars(f) for f in self.functions[:limit]],
+            "lines": [vars(line) for line in self.lines[:limit]],
+            "collapsed": self.collapsed(),
+        }
+
+
+def profile_dir() -> str:
+    return get_settings().profile_dir or os.path.join(tempfile.gettempdir(), "mcp-talib-profiles")
+
+
+_save_lock = threading.Lock()
+
+
+def save_profile(profile: Profile) -> None:
+    """Write ``profile`` to the profile directory, removing the oldest beyond the cap."""
+    directory = profile_dir()
+    with _save_lock:
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{profile.id}.txt"), "w") as fh:
+            fh.write(profile.table())
+        with open(os.path.join(directory, f"{profile.id}.collapsed"), "w") as fh:
+            fh.write(profile.collapsed())
+        _evict_profiles(directory, get_settings().profile_max_count)
+
+
+def _evict_profiles(directory: str, keep: int) -> None:
+    stored = []
+    for entry in os.scandir(directory):
+        profile_id, extension = os.path.splitext(entry.name)
+        if extension == ".collapsed" and _PROFILE_ID.match(profile_id):
+            stored.append((entry.stat().st_mtime, profile_id))
+    stored.sort()
+    for _, profile_id in stored[:max(0, len(stored) - keep)]:
+        for extension in (".txt", ".collapsed"):
+            try:
+                os.remove(os.path.join(directory, profile_id + extension))
+            except FileNotFoundError:
+                # Removed concurrently by another server process
+                pass
+
+
+def load_profile(profile_id: str) -> Dict[str, str]:
+    """The stored tables and collapsed stacks of a profile.
+
+    Raises ``KeyError`` for an unknown or malformed id, and
+    `ProfilingDisabledError` while profiling is off.
+    """
+    _check_enabled()
+    if not _PROFILE_ID.match(profile_id):
+        raise KeyError(profile_id)
+    base = os.path.join(profile_dir(), profile_id)
+    try:
+        with open(base + ".txt") as table, open(base + ".collapsed") as collapsed:
+            return {"id": profile_id, "table": table.read(), "collapsed": collapsed.read()}
+    except FileNotFoundError as e:
+        raise KeyError(profile_id) from e
+
+
+def wants_profile(value: Any) -> bool:
+    """Whether a header or option value asks for a profile."""
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "0", "false", "no", "off")
+    return bool(value)
+
+
+# One profile at a time: `sys.settrace` is per thread, but the profiled
+# coroutine must not interleave with another one on the same loop
+_profile_lock = threading.Lock()
+
+
+async def run_profiled(
+    indicator: BaseIndicator, market_data: Any, options: Optional[Dict[str, Any]] = None
+) -> Tuple[IndicatorResult, Profile]:
+    """Calculate ``indicator`` under `StackProfiler` and store the profile.
+
+    Raises `ProfilingDisabledError` unless ``MCP_TALIB_PROFILING`` is set.
+    """
+    _check_enabled()
+    profiler = StackProfiler()
+    with _profile_lock, shared_scope():
+        coroutine = indicator.calculate(market_data, options or {})
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            # Run the coroutine here rather than awaiting it, so the event
+            # loop cannot run other tasks under the profiler; indicators
+            # calculate without suspending
+            coroutine.send(None)
+        except StopIteration as stop:
+            result = stop.value
+        else:
+            coroutine.close()
+            raise RuntimeError(f"{indicator.name} suspended during a profiled calculation")
+        finally:
+            profiler.stop()
+        seconds = time.perf_counter() - started
+    if isinstance(result, IndicatorResult) and result.calculation_time is None:
+        result.calculation_time = seconds * 1000
+    result = match_input_precision(market_data, result)
+    observe_results(market_data, [result], {0})
+    profile = profiler.profile(seconds)
+    save_profile(profile)
+    return result, profile
+
+
+async def run_with_profile(
+    indicator: BaseIndicator, market_data: Any, options: Dict[str, Any], profile: bool
+) -> Tuple[IndicatorResult, Optional[Profile]]:
+    """`run_profiled` when ``profile`` is requested, else `run_indicator`."""
+    if profile:
+        return await run_profiled(indicator, market_data, options)
+    return await run_indicator(indicator, market_data, options), None
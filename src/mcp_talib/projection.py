@@ -0,0 +1,121 @@
+"""Per-request projection of indicator results.
+
+A `Projection` picks output keys and a window of bars from a result before
+it is serialized, so responses only carry what the client reads:
+
+- ``outputs`` keeps the named outputs (``["upperband"]`` of BBANDS)
+- ``drop_lookback`` drops the leading bars where any kept output is NaN
+- ``tail`` keeps the last N bars; ``slice`` keeps input bars
+  ``"start:end"`` (Python slice syntax, negative indices count from the
+  end). They are exclusive.
+
+Some adapters trim the lookback prefix from their outputs (SMA, EMA, RSI)
+while the TA-Lib ones pad it with NaN. A projected result therefore
+records ``offset`` in its metadata, the input bar of its first value, so
+clients can align the values either way. Bar windows apply to the last
+axis, which covers both single results and sweep matrices. The arrays of
+a projected result are views of the original, so projecting never copies.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def parse_slice(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """Parse ``"start:end"`` into its bounds; either may be empty."""
+    start, sep, end = text.partition(":")
+    if not sep or ":" in end:
+        raise ValueError(f"`slice` must look like 'start:end', got {text!r}")
+    try:
+        return (int(start) if start.strip() else None, int(end) if end.strip() else None)
+    except ValueError as e:
+        raise ValueError(f"`slice` bounds must be integers, got {text!r}") from e
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Which outputs and bars of a result to return; see the module docs."""
+
+    outputs: Optional[Tuple[str, ...]] = None
+    drop_lookback: bool = False
+    tail: Optional[int] = None
+    slice: Optional[Tuple[Optional[int], Optional[int]]] = None
+
+    @classmethod
+    def from_options(
+        cls,
+        outputs: Optional[Sequence[str]] = None,
+        drop_lookback: Optional[bool] = False,
+        tail: Optional[int] = None,
+        slice: Optional[str] = None,
+    ) -> "Projection":
+        """Build a projection from request options, raising ``ValueError`` if invalid."""
+        if tail is not None and slice is not None:
+            raise ValueError("pass either `tail` or `slice`, not both")
+        if tail is not None and tail < 1:
+            raise ValueError(f"`tail` must be at least 1, got {tail}")
+        return cls(
+            outputs=tuple(outputs) if outputs is not None else None,
+            drop_lookback=bool(drop_lookback),
+            tail=tail,
+            slice=parse_slice(slice) if slice is not None else None,
+        )
+
+    @property
+    def is_identity(self) -> bool:
+        return self.outputs is None and not self.drop_lookback and self.tail is None and self.slice is None
+
+
+def _lookback(arrays: Sequence[np.ndarray]) -> int:
+    """Leading positions of the last axis where any array is non-finite."""
+    if not arrays:
+        return 0
+    finite = np.ones(arrays[0].shape[-1], dtype=bool)
+    for array in arrays:
+        if array.dtype.kind == "f":
+            valid = np.isfinite(array)
+            finite &= valid.all(axis=tuple(range(array.ndim - 1))) if array.ndim > 1 else valid
+    first = int(np.argmax(finite))
+    return first if finite[first] else len(finite)
+
+
+def project(result: Any, projection: Projection) -> Any:
+    """Apply ``projection`` to an `IndicatorResult`.
+
+    Raises ``ValueError`` for an output name the result does not have.
+    Failed results and identity projections are returned unchanged.
+    """
+    if projection.is_identity or not getattr(result, "success", False):
+        return result
+
+    values = dict(result.values)
+    if projection.outputs is not None:
+        unknown = [name for name in projection.outputs if name not in values]
+        if unknown:
+            raise ValueError(f"unknown outputs {unknown}; {result.indicator_name} returns {', '.join(values)}")
+        values = {name: values[name] for name in projection.outputs}
+
+    arrays = {name: np.asarray(array) for name, array in values.items()}
+    length = max((array.shape[-1] for array in arrays.values() if array.ndim), default=0)
+    metadata = dict(result.metadata or {})
+    total = int(metadata.get("input_points", length))
+    # Trimming adapters return only the bars after their lookback
+    offset = max(total - length, 0)
+
+    start, end = 0, total
+    if projection.tail is not None:
+        start = max(total - projection.tail, 0)
+    elif projection.slice is not None:
+        start, end, _ = slice(*projection.slice).indices(total)
+        end = max(start, end)
+    if projection.drop_lookback:
+        start = max(start, offset + _lookback(list(arrays.values())))
+    start = max(start, offset)
+    end = max(start, end)
+
+    window = slice(start - offset, end - offset)
+    projected = {name: array[..., window] if array.ndim else array for name, array in arrays.items()}
+    metadata.update({"offset": start, "output_points": end - start})
+    return result.model_copy(update={"values": projected, "metadata": metadata})
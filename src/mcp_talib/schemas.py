@@ -1,21 +1,65 @@
 """Pydantic request/response schemas for the HTTP API."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, StrictInt, model_validator
 
+from .models.market_data import Precision
+from .projection import Projection
 
-class ToolRequest(BaseModel):
+
+class WindowOptions(BaseModel):
+    """Which bars of each result to return (see `mcp_talib.projection`)."""
+
+    # Drop the leading bars where an output is still NaN
+    drop_lookback: bool = False
+    # Keep only the last `tail` bars, or the input bars of a "start:end" slice
+    tail: Optional[int] = Field(None, ge=1)
+    slice: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_projection(self):
+        self.projection()
+        return self
+
+    def projection(self) -> Projection:
+        return Projection.from_options(
+            getattr(self, "outputs", None), self.drop_lookback, self.tail, self.slice
+        )
+
+
+class ProjectionOptions(WindowOptions):
+    """`WindowOptions` plus the output keys to return."""
+
+    outputs: Optional[List[str]] = Field(None, min_length=1)
+
+
+# Request fields that shape the response rather than parameterize the indicator
+PROJECTION_FIELDS = tuple(ProjectionOptions.model_fields)
+
+
+class ToolRequest(ProjectionOptions):
     """Request body for calling a tool.
 
-    Accepts a `close` list and any additional parameters which are included
-    as extra fields and forwarded to the indicator.calculate call.
+    Accepts a `close` list, or the handle of a stored `series`, and any
+    additional parameters which are included as extra fields and forwarded
+    to the indicator.calculate call.
     """
 
     # Pydantic v2 configuration
     model_config = ConfigDict(extra="allow")
 
-    close: List[float]
+    close: Optional[List[float]] = None
+    # Handle of a series stored through /api/series
+    series: Optional[str] = None
+    # "float32" computes on and returns float32 values (7 significant digits)
+    precision: Optional[Precision] = None
+
+    @model_validator(mode="after")
+    def require_input(self):
+        if self.close is None and self.series is None:
+            raise ValueError("either `close` or `series` is required")
+        return self
 
 
 class ToolResult(BaseModel):
@@ -26,3 +70,95 @@ class ToolResult(BaseModel):
     values: Optional[Any] = None
     metadata: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+
+
+class SeriesPayload(BaseModel):
+    """OHLCV columns for one instrument; only the columns a tool reads are needed."""
+
+    close: Optional[List[float]] = None
+    open: Optional[List[float]] = None
+    high: Optional[List[float]] = None
+    low: Optional[List[float]] = None
+    volume: Optional[List[float]] = None
+    # "float32" stores the columns and returns outputs at float32 precision
+    precision: Optional[Precision] = None
+
+
+class BatchJob(BaseModel):
+    """One indicator calculation inside a batch request."""
+
+    symbol: str
+    # Inline columns or the handle of a stored series
+    series: Union[SeriesPayload, str]
+    params: Dict[str, Any] = Field(default_factory=dict)
+    # Overrides BatchRequest.tool for this job
+    tool: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    """Many `{symbol, series, params}` jobs computed in one request."""
+
+    tool: Optional[str] = None
+    jobs: List[BatchJob] = Field(..., max_length=10_000)
+    max_concurrency: Optional[int] = Field(None, ge=1, le=64)
+
+
+class BatchJobResult(ToolResult):
+    symbol: str
+    tool: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    success: bool
+    succeeded: int
+    failed: int
+    results: List[BatchJobResult]
+
+
+class IndicatorSpec(BaseModel):
+    """One indicator to compute in a multi-indicator request."""
+
+    indicator: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    # Result key; defaults to the indicator name
+    key: Optional[str] = None
+    # Output keys to return; all by default
+    outputs: Optional[List[str]] = Field(None, min_length=1)
+
+
+class MultiRequest(SeriesPayload, WindowOptions):
+    """A single OHLCV payload plus the indicators to compute on it."""
+
+    # Handle of a stored series, used instead of inline columns
+    series: Optional[str] = None
+    indicators: List[IndicatorSpec] = Field(..., min_length=1)
+
+
+class MultiResult(BaseModel):
+    success: bool
+    results: Dict[str, ToolResult]
+
+
+class SweepRequest(SeriesPayload, ProjectionOptions):
+    """Parameter sweep of one indicator over a single series.
+
+    Each `grid` axis is a list of values or a `{"start", "stop", "step"}`
+    range with inclusive stop; integer bounds stay integers, so a range of
+    periods expands to ints. `params` are fixed for every grid point.
+    """
+
+    # Handle of a stored series, used instead of inline columns
+    series: Optional[str] = None
+    grid: Dict[str, Union[List[Any], Dict[str, Union[StrictInt, float]]]]
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+
+class SeriesInfo(BaseModel):
+    """Description of a series held by the server-side store."""
+
+    name: str
+    length: int
+    columns: List[str]
+    precision: Precision = "float64"
+    nbytes: int
+    expires_in: float
@@ -0,0 +1,367 @@
+"""Conversion of indicator results into transport payloads.
+
+Indicators keep their output series as ndarrays, and payloads keep them
+until the transport encodes its response. `dumps` is the JSON writer
+shared by the HTTP API, the MCP tools and the CLI. With the optional
+``orjson`` package it writes arrays straight from their buffers; without
+it, arrays are materialized as Python lists by `to_builtin`. Either way,
+non-finite floats, such as the NaN lookback prefix TA-Lib emits, become
+``null`` (or the ``MCP_TALIB_JSON_NAN`` sentinel), so every transport
+produces standard JSON. float32 outputs are written with `FLOAT32_DIGITS`
+significant digits.
+
+`encode_result` writes the compact encodings the HTTP API negotiates.
+MessagePack carries the JSON payload in binary form, with each output
+array packed from its buffer. MessagePack, raw frames and Arrow IPC copy
+the output buffers as they are, so lookback positions stay NaN there. `iter_result` streams a result in chunks of bars, so a
+response of any length is serialized a bounded chunk at a time.
+"""
+
+import json
+import math
+import struct
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+from starlette.responses import JSONResponse
+
+from . import media
+from .config import get_settings
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library writer is the fallback
+    orjson = None
+
+# Marks "use the configured sentinel" where None already means null
+_CONFIGURED = object()
+
+
+# Significant digits emitted for float32 values. float32 resolves about 7.2
+# decimal digits, so this keeps its precision without the float64 noise
+# digits (0.1f would otherwise render as 0.10000000149011612).
+FLOAT32_DIGITS = 7
+
+
+def round_significant(array: np.ndarray, digits: int = FLOAT32_DIGITS) -> np.ndarray:
+    """Round to ``digits`` significant digits, as float64.
+
+    Each result is the double closest to a short decimal, so it prints
+    with at most ``digits`` significant digits. Non-finite values pass
+    through.
+    """
+    values = array.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = np.floor(np.log10(np.abs(values)))
+    shift = np.where(np.isfinite(exponent), digits - 1 - exponent, 0.0)
+    # Scale by an exact power of ten, dividing rather than multiplying by
+    # its inverse, so the quotient is correctly rounded
+    scale = 10.0 ** np.abs(shift)
+    return np.where(shift >= 0, np.round(values * scale) / scale, np.round(values / scale) * scale)
+
+
+def json_nan() -> Any:
+    """The value written for NaN and infinity, from ``MCP_TALIB_JSON_NAN``.
+
+    The setting is a JSON scalar: ``null`` (the default), a number such as
+    ``0`` or a string such as ``"NaN"``.
+    """
+    raw = get_settings().json_nan
+    try:
+        value = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"invalid MCP_TALIB_JSON_NAN {raw!r}: {e}") from e
+    if isinstance(value, (list, dict)) or (isinstance(value, float) and not math.isfinite(value)):
+        raise ValueError(f"MCP_TALIB_JSON_NAN must be a finite JSON scalar, got {raw!r}")
+    return value
+
+
+def _array_to_list(array: np.ndarray, nan: Any = None) -> list:
+    if array.ndim > 1:
+        return [_array_to_list(row, nan) for row in array]
+    values = (round_significant(array) if array.dtype == np.float32 else array).tolist()
+    if array.dtype.kind == "f":
+        # Only the (usually short) non-finite stretch is touched in Python.
+        for index in np.flatnonzero(~np.isfinite(array)).tolist():
+            values[index] = nan
+    return values
+
+
+def to_builtin(value: Any, nan: Any = None) -> Any:
+    """Recursively convert ndarrays and NumPy scalars to JSON-ready objects.
+
+    Non-finite floats become ``nan`` (``None`` by default).
+    """
+    if isinstance(value, np.ndarray):
+        return _array_to_list(value, nan)
+    if isinstance(value, dict):
+        return {key: to_builtin(item, nan) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(item, nan) for item in value]
+    if isinstance(value, np.float32):
+        value = round_significant(np.asarray(value))[()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return nan
+    return value
+
+
+def _for_orjson(value: Any, nan: Any) -> Any:
+    """Prepare ``value`` for orjson, leaving numeric arrays in place.
+
+    orjson writes C-contiguous float64, integer and bool arrays from their
+    buffers and writes non-finite floats as ``null``. float32 arrays are
+    rounded to `FLOAT32_DIGITS` first, and a non-null ``nan`` sentinel is
+    substituted here.
+    """
+    if isinstance(value, np.ndarray):
+        if value.ndim == 0 or value.dtype.kind not in "fiub":
+            return to_builtin(value, nan)
+        if value.dtype.kind == "f":
+            if value.dtype == np.float32:
+                value = round_significant(value)
+            elif value.dtype != np.float64:
+                value = value.astype(np.float64)
+            if nan is not None and not np.isfinite(value).all():
+                if isinstance(nan, str):
+                    return _array_to_list(value, nan)
+                value = np.where(np.isfinite(value), value, float(nan))
+        return np.ascontiguousarray(value)
+    if isinstance(value, dict):
+        return {key: _for_orjson(item, nan) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_for_orjson(item, nan) for item in value]
+    if isinstance(value, (float, np.generic)):
+        return to_builtin(value, nan)
+    return value
+
+
+def dumps(value: Any, nan: Any = _CONFIGURED) -> bytes:
+    """Serialize a payload that may hold ndarrays to compact JSON bytes.
+
+    Non-finite floats are written as ``nan``, by default the
+    ``MCP_TALIB_JSON_NAN`` setting (``null``). Non-string dict keys are
+    written as strings, as the standard library does. Uses orjson when it
+    is installed.
+    """
+    if nan is _CONFIGURED:
+        nan = json_nan()
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(_for_orjson(value, nan), option=option)
+    return json.dumps(to_builtin(value, nan), separators=(",", ":"), allow_nan=False).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """A JSON response rendered by `dumps`, so its content may hold ndarrays."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def result_to_payload(result: Any, builtin: bool = True) -> Dict[str, Any]:
+    """Build the `ToolResult`-shaped payload for an indicator result.
+
+    Accepts `IndicatorResult` or any object exposing ``success``, ``values``
+    and ``metadata`` attributes. With ``builtin=False`` the values and
+    metadata keep their ndarrays for `dumps` to write.
+    """
+    if getattr(result, "success", False):
+        values = getattr(result, "values", None)
+        metadata = getattr(result, "metadata", None)
+        convert = to_builtin if builtin else (lambda value: value)
+        return {
+            "success": True,
+            "values": convert(values) if isinstance(values, (list, dict)) else None,
+            "metadata": convert(metadata) if isinstance(metadata, dict) else None,
+            "error": None,
+        }
+
+    error = getattr(result, "error_message", None) or getattr(result, "error", None) or "calculation error"
+    return {"success": False, "values": None, "metadata": None, "error": str(error)}
+
+
+def _optional(module: str, kind: str) -> Any:
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise media.UnsupportedMediaTypeError(f"{kind} responses need the optional `{module}` package") from e
+
+
+def _result_parts(result: Any) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Split a result into its JSON-ready header and its output arrays."""
+    payload = result_to_payload(result, builtin=False)
+    values = payload["values"]
+    arrays = {name: np.asarray(array) for name, array in values.items()} if isinstance(values, dict) else {}
+    return {"success": payload["success"], "metadata": to_builtin(payload["metadata"]), "error": payload["error"]}, arrays
+
+
+# MessagePack extension type code of an ndarray
+MSGPACK_NDARRAY = 1
+
+
+def _for_msgpack(value: Any, msgpack: Any) -> Any:
+    """Replace numeric ndarrays with `MSGPACK_NDARRAY` extension values.
+
+    Each extension holds the MessagePack array ``[dtype, shape, buffer]``:
+    a NumPy dtype string such as ``<f8``, the shape, and the raw
+    little-endian C-order bytes, NaN included. Everything else is
+    converted by `to_builtin`.
+    """
+    if isinstance(value, np.ndarray) and value.ndim and value.dtype.kind in "fiub":
+        array = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+        data = msgpack.packb([array.dtype.str, list(array.shape), array.data], use_bin_type=True)
+        return msgpack.ExtType(MSGPACK_NDARRAY, data)
+    if isinstance(value, dict):
+        return {key: _for_msgpack(item, msgpack) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_for_msgpack(item, msgpack) for item in value]
+    return to_builtin(value)
+
+
+def encode_msgpack(payload: Any) -> bytes:
+    """MessagePack encoding of a payload, which may hold ndarrays.
+
+    The payload has the JSON payload's shape, but output arrays are packed
+    from their buffers as `MSGPACK_NDARRAY` extension values rather than
+    as one float per value; `decode_msgpack` turns them back into arrays.
+    """
+    msgpack = _optional("msgpack", media.MSGPACK)
+    return msgpack.packb(_for_msgpack(payload, msgpack), use_bin_type=True)
+
+
+def decode_msgpack(data: bytes) -> Any:
+    """Decode `encode_msgpack` output, with output arrays as read-only ndarrays."""
+    msgpack = _optional("msgpack", media.MSGPACK)
+
+    def ext_hook(code: int, ext: bytes) -> Any:
+        if code != MSGPACK_NDARRAY:
+            return msgpack.ExtType(code, ext)
+        dtype, shape, buffer = msgpack.unpackb(ext)
+        return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+    return msgpack.unpackb(data, ext_hook=ext_hook)
+
+
+def encode_frames(result: Any) -> bytes:
+    """Encode a result as a JSON header followed by its raw output buffers.
+
+    Layout: a little-endian uint32 header length, then the UTF-8 JSON
+    header padded with spaces to a multiple of 8 bytes, then each output
+    buffer padded to a multiple of 8 bytes. The header holds ``success``,
+    ``metadata`` and ``error``, plus ``columns``: one
+    ``{name, dtype, shape, offset, nbytes}`` entry per output. Offsets
+    count from the end of the header, and dtypes are NumPy dtype strings
+    such as ``<f8``.
+    """
+    header, arrays = _result_parts(result)
+    columns, buffers, offset = [], [], 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        columns.append({
+            "name": name,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+            "nbytes": array.nbytes,
+        })
+        padding = -array.nbytes % 8
+        buffers.extend((array.data, b"\0" * padding))
+        offset += array.nbytes + padding
+    encoded = json.dumps({**header, "columns": columns}, separators=(",", ":")).encode()
+    encoded += b" " * (-(4 + len(encoded)) % 8)
+    return b"".join([struct.pack("<I", len(encoded)), encoded, *buffers])
+
+
+def encode_arrow(result: Any, kind: str = media.ARROW_STREAM) -> bytes:
+    """Encode a result as an Arrow IPC stream or file with one column per output.
+
+    2-D outputs (sweeps) become fixed-size list columns with one row per
+    grid point. The JSON header of `encode_frames`, without ``columns``,
+    is stored under the ``mcp_talib`` schema metadata key.
+    """
+    pa = _optional("pyarrow", kind)
+    header, arrays = _result_parts(result)
+    columns = {}
+    for name, array in arrays.items():
+        if array.ndim == 2:
+            columns[name] = pa.FixedSizeListArray.from_arrays(pa.array(array.ravel()), array.shape[1])
+        else:
+            columns[name] = pa.array(array)
+    table = pa.table(columns).replace_schema_metadata({"mcp_talib": json.dumps(header)})
+    sink = pa.BufferOutputStream()
+    open_writer = pa.ipc.new_file if kind == media.ARROW_FILE else pa.ipc.new_stream
+    with open_writer(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _chunks(length: int, chunk_points: int) -> Iterator[slice]:
+    step = max(1, chunk_points)
+    for start in range(0, length, step):
+        yield slice(start, min(start + step, length))
+
+
+def iter_ndjson(result: Any, chunk_points: Optional[int] = None) -> Iterator[bytes]:
+    """Stream a result as newline-delimited JSON, one chunk of bars per line.
+
+    The first line is the header of `encode_frames` with ``columns``
+    reduced to the output names. Each later line is
+    ``{"start": i, "values": {name: [...]}}`` with the bars of one chunk
+    of at most ``chunk_points`` (default ``MCP_TALIB_STREAM_CHUNK_POINTS``)
+    values, counted from the first returned value. Only one chunk is
+    serialized at a time.
+    """
+    chunk_points = chunk_points or get_settings().stream_chunk_points
+    nan = json_nan()
+    header, arrays = _result_parts(result)
+    yield dumps({**header, "columns": list(arrays)}, nan) + b"\n"
+    length = max((array.shape[-1] for array in arrays.values() if array.ndim), default=0)
+    for window in _chunks(length, chunk_points):
+        chunk = {name: array[..., window] for name, array in arrays.items()}
+        yield dumps({"start": window.start, "values": chunk}, nan) + b"\n"
+
+
+def iter_frame_stream(result: Any, chunk_points: Optional[int] = None) -> Iterator[bytes]:
+    """Stream a result as length-prefixed binary frames.
+
+    Every frame is a little-endian uint32 byte count followed by that many
+    bytes. The first frame is the JSON header of `encode_frames`, whose
+    ``columns`` entries give each output's ``name``, ``dtype`` and full
+    ``shape``. Each later frame holds one chunk of at most ``chunk_points``
+    bars: the outputs' raw little-endian buffers, in ``columns`` order,
+    each C-contiguous with the chunk as its last axis.
+    """
+    chunk_points = chunk_points or get_settings().stream_chunk_points
+    header, arrays = _result_parts(result)
+    arrays = {name: array.astype(array.dtype.newbyteorder("<"), copy=False) for name, array in arrays.items()}
+    columns = [{"name": name, "dtype": array.dtype.str, "shape": list(array.shape)} for name, array in arrays.items()]
+    encoded = json.dumps({**header, "columns": columns, "chunk_points": chunk_points}, separators=(",", ":")).encode()
+    yield struct.pack("<I", len(encoded)) + encoded
+    length = max((array.shape[-1] for array in arrays.values() if array.ndim), default=0)
+    for window in _chunks(length, chunk_points):
+        parts = [np.ascontiguousarray(array[..., window]).data for array in arrays.values()]
+        yield struct.pack("<I", sum(part.nbytes for part in parts)) + b"".join(parts)
+
+
+def iter_result(result: Any, kind: str, chunk_points: Optional[int] = None) -> Iterator[bytes]:
+    """Stream a result as ``kind``, one of `media.STREAM_TYPES`."""
+    if kind == media.FRAME_STREAM:
+        return iter_frame_stream(result, chunk_points)
+    return iter_ndjson(result, chunk_points)
+
+
+def encode_result(result: Any, kind: str) -> bytes:
+    """Encode an indicator result as ``kind``, one of `media.RESULT_TYPES`.
+
+    Raises `media.UnsupportedMediaTypeError` when the encoding needs an
+    optional package that is not installed.
+    """
+    if kind == media.MSGPACK:
+        return encode_msgpack(result_to_payload(result, builtin=False))
+    if kind == media.FRAMES:
+        return encode_frames(result)
+    if kind in (media.ARROW_STREAM, media.ARROW_FILE):
+        return encode_arrow(result, kind)
+    return dumps(result_to_payload(result, builtin=False))
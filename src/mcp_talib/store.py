@@ -0,0 +1,240 @@
+"""Server-side store of named OHLCV series.
+
+Clients upload a series once under a name (its handle) and then reference
+the handle in indicator calls instead of re-sending the arrays. Columns are
+kept as buffers with spare capacity, at the precision they were uploaded
+with (float64, or float32 at half the memory), so appending a few bars
+copies only the new values; every read returns a `ColumnarMarketData`
+whose columns are views of those buffers.
+
+Series expire after a period without use, and the least recently used ones
+are evicted once the store exceeds its byte budget. Both limits come from
+`config.Settings`.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .config import get_settings
+from .models.market_data import ColumnarMarketData, Precision
+
+_COLUMNS = ("close", "open", "high", "low", "volume", "timestamp")
+
+
+class SeriesNotFoundError(KeyError):
+    """Raised when a series handle is unknown or has expired."""
+
+    def __str__(self) -> str:
+        return f"series '{self.args[0]}' not found"
+
+
+def _columns_of(market_data: ColumnarMarketData) -> Dict[str, np.ndarray]:
+    return {name: getattr(market_data, name) for name in _COLUMNS if getattr(market_data, name) is not None}
+
+
+class _StoredSeries:
+    """Growable column buffers of one series plus bookkeeping."""
+
+    def __init__(self, market_data: ColumnarMarketData, now: float):
+        self.columns: Dict[str, np.ndarray] = {}
+        self.length = 0
+        self.touched = now
+        self._snapshot: Optional[ColumnarMarketData] = None
+        self.append(market_data)
+
+    @property
+    def nbytes(self) -> int:
+        # Bytes of data; spare capacity kept for appends is not counted
+        return self.length * sum(buffer.itemsize for buffer in self.columns.values())
+
+    def _incoming(self, market_data: ColumnarMarketData) -> Dict[str, np.ndarray]:
+        incoming = _columns_of(market_data)
+        if self.columns and set(incoming) != set(self.columns):
+            raise ValueError(
+                f"appended columns {sorted(incoming)} do not match stored columns {sorted(self.columns)}"
+            )
+        return incoming
+
+    def appended_nbytes(self, market_data: ColumnarMarketData) -> int:
+        """`nbytes` once ``market_data`` is appended, checking its columns first."""
+        self._incoming(market_data)
+        return self.nbytes + market_data.length * sum(buffer.itemsize for buffer in self.columns.values())
+
+    def append(self, market_data: ColumnarMarketData) -> None:
+        needed = self.length + market_data.length
+        for name, values in self._incoming(market_data).items():
+            buffer = self.columns.get(name)
+            if buffer is None or buffer.shape[0] < needed:
+                # Grow geometrically so repeated appends stay amortized O(1);
+                # appended bars take the stored precision
+                capacity = max(needed, 2 * (buffer.shape[0] if buffer is not None else 0))
+                grown = np.empty(capacity, dtype=buffer.dtype if buffer is not None else values.dtype)
+                if buffer is not None:
+                    grown[:self.length] = buffer[:self.length]
+                self.columns[name] = buffer = grown
+            buffer[self.length:needed] = values
+        self.length = needed
+        self._snapshot = None
+
+    def market_data(self) -> ColumnarMarketData:
+        # Earlier snapshots stay valid: appends only write past their end
+        if self._snapshot is None:
+            self._snapshot = ColumnarMarketData.model_construct(
+                **{name: buffer[:self.length] for name, buffer in self.columns.items()}
+            )
+        return self._snapshot
+
+
+class SeriesStore:
+    """Thread-safe named series with an idle TTL and a byte budget."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600.0,
+        max_bytes: int = 512 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._series: "OrderedDict[str, _StoredSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def put(self, name: str, market_data: ColumnarMarketData) -> Dict[str, Any]:
+        """Store ``market_data`` under ``name``, replacing any previous series."""
+        with self._lock:
+            self._expire()
+            self._check_budget(name, sum(values.nbytes for values in _columns_of(market_data).values()))
+            stored = _StoredSeries(market_data, self._clock())
+            self._series.pop(name, None)
+            self._admit(name, stored)
+            return self._info(name, stored)
+
+    def append(self, name: str, market_data: ColumnarMarketData) -> Dict[str, Any]:
+        """Append bars to ``name``; creates the series if it does not exist.
+
+        The appended columns must match the stored ones. A rejected append
+        leaves the stored series unchanged.
+        """
+        with self._lock:
+            self._expire()
+            stored = self._series.get(name)
+            if stored is None:
+                self._check_budget(name, sum(values.nbytes for values in _columns_of(market_data).values()))
+                stored = _StoredSeries(market_data, self._clock())
+            else:
+                self._check_budget(name, stored.appended_nbytes(market_data))
+                stored.append(market_data)
+                stored.touched = self._clock()
+            self._admit(name, stored)
+            return self._info(name, stored)
+
+    def get(self, name: str) -> ColumnarMarketData:
+        """Return the series stored under ``name``.
+
+        Raises `SeriesNotFoundError` if it is unknown or has expired.
+        """
+        with self._lock:
+            stored = self._lookup(name)
+            return stored.market_data()
+
+    def info(self, name: str) -> Dict[str, Any]:
+        """Describe one stored series without returning its data."""
+        with self._lock:
+            return self._info(name, self._lookup(name))
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Describe every live series, most recently used last."""
+        with self._lock:
+            self._expire()
+            return [self._info(name, stored) for name, stored in self._series.items()]
+
+    def delete(self, name: str) -> bool:
+        """Remove ``name``; returns whether it existed."""
+        with self._lock:
+            self._expire()
+            return self._series.pop(name, None) is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of data currently held by all stored series."""
+        with self._lock:
+            return sum(stored.nbytes for stored in self._series.values())
+
+    def _lookup(self, name: str) -> _StoredSeries:
+        self._expire()
+        stored = self._series.get(name)
+        if stored is None:
+            raise SeriesNotFoundError(name)
+        stored.touched = self._clock()
+        self._series.move_to_end(name)
+        return stored
+
+    def _check_budget(self, name: str, nbytes: int) -> None:
+        if nbytes > self.max_bytes:
+            raise ValueError(f"series '{name}' needs {nbytes} bytes; the store holds at most {self.max_bytes}")
+
+    def _admit(self, name: str, stored: _StoredSeries) -> None:
+        self._series[name] = stored
+        self._series.move_to_end(name)
+        total = sum(s.nbytes for s in self._series.values())
+        while total > self.max_bytes:
+            _, evicted = self._series.popitem(last=False)
+            total -= evicted.nbytes
+            self.evictions += 1
+
+    def _expire(self) -> None:
+        deadline = self._clock() - self.ttl_seconds
+        # Entries are ordered by last use, so expired ones are at the front
+        while self._series:
+            name, stored = next(iter(self._series.items()))
+            if stored.touched > deadline:
+                break
+            del self._series[name]
+
+    def _info(self, name: str, stored: _StoredSeries) -> Dict[str, Any]:
+        return {
+            "name": name,
+            "length": stored.length,
+            "columns": sorted(stored.columns),
+            "precision": stored.market_data().precision,
+            "nbytes": stored.nbytes,
+            "expires_in": max(0.0, stored.touched + self.ttl_seconds - self._clock()),
+        }
+
+
+_store: Optional[SeriesStore] = None
+_store_lock = threading.Lock()
+
+
+def get_series_store() -> SeriesStore:
+    """Return the process-wide store shared by the HTTP API and MCP tools."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            settings = get_settings()
+            _store = SeriesStore(ttl_seconds=settings.series_ttl_seconds, max_bytes=settings.series_max_bytes)
+        return _store
+
+
+def resolve_market_data(
+    series: Optional[str], precision: Optional[Precision] = None, **columns: Any
+) -> ColumnarMarketData:
+    """Market data from a stored series handle or from inline columns.
+
+    Exactly one source may be given. ``precision`` converts the columns;
+    by default inline columns are float64 and stored series keep the
+    precision they were stored with. Raises `SeriesNotFoundError` for an
+    unknown handle and ``ValueError`` for invalid or conflicting input.
+    """
+    columns = {name: values for name, values in columns.items() if values is not None}
+    if series is not None:
+        if columns:
+            raise ValueError(f"pass either a series handle or inline columns, not both (got {sorted(columns)})")
+        return get_series_store().get(series).with_precision(precision)
+    return ColumnarMarketData(**columns).with_precision(precision)
@@ -0,0 +1,159 @@
+"""Live indicator subscriptions over stored series.
+
+A subscription follows one indicator over one stored series. It is warmed
+up once from the stored closes with `indicators.streaming.create_state`,
+then advanced by each batch of appended bars in O(1) per bar, so a client
+receives only the new values instead of re-requesting the whole history.
+
+Bars reach subscriptions through `SubscriptionHub.publish`, which the
+series append endpoints call after the store accepts the bars, whatever
+the client that sent them. Replacing a series calls `reset`, which warms
+every subscription up again from the new data. All hub methods run on the
+event loop.
+
+Each subscription buffers its pending messages in a bounded queue. A
+subscriber that falls `MAX_PENDING` messages behind is closed, rather
+than letting its backlog grow without limit.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from .indicators.streaming import STREAMING_STATES, create_state
+from .models.market_data import ColumnarMarketData
+from .store import get_series_store
+
+# Messages a subscriber may have pending before it is closed
+MAX_PENDING = 1024
+
+
+class Subscription:
+    """One indicator followed over one stored series.
+
+    Read messages with `next_message`; each is a dict for `serialization.dumps`
+    whose ``type`` is ``"values"``, ``"reset"`` or ``"closed"`` (or a type
+    the transport queued itself with `notify`).
+    """
+
+    def __init__(self, series: str, indicator: str, params: Dict[str, Any]):
+        self.series = series
+        self.indicator = indicator
+        self.params = params
+        self.closed = False
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=MAX_PENDING)
+        self._warm_up()
+
+    def _warm_up(self) -> None:
+        market_data = get_series_store().get(self.series)
+        if market_data.close is None:
+            raise ValueError(f"series '{self.series}' has no close column")
+        self.state = create_state(self.indicator, self.params, warmup=market_data.close)
+
+    @property
+    def length(self) -> int:
+        """Bars consumed so far, including the warm-up."""
+        return self.state.count
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "series": self.series,
+            "indicator": self.indicator,
+            "params": self.params,
+            "length": self.length,
+            "value": self.state.value,
+        }
+
+    def _advance(self, close: np.ndarray) -> None:
+        start = self.length
+        self.notify({"type": "values", "start": start, "values": {self.indicator: self.state.extend(close)}})
+
+    def _reset(self) -> None:
+        try:
+            self._warm_up()
+        except (KeyError, ValueError) as e:
+            self.close(str(e))
+            return
+        self.notify({"type": "reset", **self.describe()})
+
+    def notify(self, message: Dict[str, Any]) -> None:
+        """Queue a message for the subscriber."""
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.close(f"subscriber fell more than {MAX_PENDING} messages behind")
+
+    def close(self, reason: Optional[str] = None) -> None:
+        """Stop the subscription; `next_message` then returns a ``closed`` message."""
+        if self.closed:
+            return
+        self.closed = True
+        # Make room so the final message is always delivered
+        while self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait({"type": "closed", "error": reason})
+
+    async def next_message(self) -> Dict[str, Any]:
+        return await self._queue.get()
+
+
+class SubscriptionHub:
+    """Routes appended bars to the subscriptions of each series."""
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, series: str, indicator: str, params: Optional[Dict[str, Any]] = None) -> Subscription:
+        """Start following ``indicator`` over the stored ``series``.
+
+        Raises `store.SeriesNotFoundError` for an unknown series and
+        ``ValueError`` for an indicator without a streaming state or for
+        invalid params.
+        """
+        subscription = Subscription(series, indicator, dict(params or {}))
+        self._subscriptions.setdefault(series, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        subscribers = self._subscriptions.get(subscription.series)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[subscription.series]
+
+    def publish(self, series: str, market_data: ColumnarMarketData) -> None:
+        """Advance the subscriptions of ``series`` by bars just appended to it."""
+        if market_data.close is None:
+            return
+        for subscription in list(self._subscriptions.get(series, ())):
+            subscription._advance(market_data.close)
+
+    def reset(self, series: str) -> None:
+        """Warm the subscriptions of ``series`` up again after it was replaced."""
+        for subscription in list(self._subscriptions.get(series, ())):
+            subscription._reset()
+
+    def count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscriptions.values())
+
+
+def supported_indicators() -> List[str]:
+    return sorted(STREAMING_STATES)
+
+
+_hub: Optional[SubscriptionHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_subscription_hub() -> SubscriptionHub:
+    """Return the process-wide hub shared by the HTTP API and MCP tools."""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = SubscriptionHub()
+        return _hub
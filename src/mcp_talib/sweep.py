@@ -0,0 +1,214 @@
+"""Vectorized parameter sweeps over a single series.
+
+`run_sweep` evaluates one indicator over the cartesian product of parameter
+values and returns each output as a 2-D matrix: one row per grid point, one
+column per input bar (lookback positions are NaN so every row aligns with
+the input). SMA and BBANDS share intermediate work across the grid, one
+set of prefix sums for every window and one rolling mean and deviation per
+window for every band width; other indicators run once per grid point on
+the shared, already-converted input.
+"""
+
+import itertools
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .execution import run_indicators, with_output_precision
+from .indicators import registry
+from .indicators.kernels import PrefixSums
+from .metrics import get_metrics
+from .models.indicator_result import IndicatorResult
+from .models.market_data import as_float_array
+
+# Upper bounds that keep a single sweep from exhausting server memory
+MAX_SWEEP_POINTS = 10_000
+MAX_SWEEP_CELLS = 20_000_000
+
+GridSpec = Dict[str, Union[Sequence[Any], Dict[str, Any]]]
+
+
+def expand_range(spec: Union[Sequence[Any], Dict[str, Any]]) -> List[Any]:
+    """Expand a parameter axis into its list of values.
+
+    An axis is either an explicit list or a ``{"start", "stop", "step"}``
+    range; ``stop`` is inclusive and ``step`` defaults to 1.
+    """
+    if not isinstance(spec, dict):
+        values = list(spec)
+    else:
+        try:
+            start, stop = spec["start"], spec["stop"]
+        except KeyError as e:
+            raise ValueError(f"range is missing {e.args[0]!r}") from e
+        step = spec.get("step", 1)
+        if step <= 0:
+            raise ValueError("range step must be positive")
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        if all(isinstance(v, int) for v in (start, stop, step)):
+            values = list(range(start, stop + 1, step))
+        else:
+            values = [round(start + i * step, 12) for i in range(max(count, 0))]
+    if not values:
+        raise ValueError("parameter axis is empty")
+    return values
+
+
+def expand_grid(grid: GridSpec) -> Tuple[Dict[str, List[Any]], List[Dict[str, Any]]]:
+    """Return the expanded axes and every grid point, in row order.
+
+    The last axis varies fastest, like nested loops in declaration order.
+    """
+    if not grid:
+        raise ValueError("grid must sweep at least one parameter")
+    axes = {name: expand_range(spec) for name, spec in grid.items()}
+    points = [dict(zip(axes, combo)) for combo in itertools.product(*axes.values())]
+    if len(points) > MAX_SWEEP_POINTS:
+        raise ValueError(f"grid has {len(points)} points; the limit is {MAX_SWEEP_POINTS}")
+    return axes, points
+
+
+def _aligned(out: np.ndarray, length: int) -> np.ndarray:
+    """Left-pad a trimmed output with NaN so it aligns with the input."""
+    out = np.asarray(out, dtype=np.float64)
+    if out.shape[0] == length:
+        return out
+    row = np.full(length, np.nan)
+    row[length - out.shape[0]:] = out
+    return row
+
+
+def _sweep_sma(market_data: Any, points: List[Dict[str, Any]], errors: Dict[int, str]) -> Optional[Dict[str, np.ndarray]]:
+    if any(set(point) - {"timeperiod"} for point in points):
+        return None
+    close = as_float_array(market_data.close)
+    prefix = PrefixSums(close)
+    matrix = np.full((len(points), close.shape[0]), np.nan)
+    for row, point in enumerate(points):
+        window = int(point.get("timeperiod", 20))
+        if not 1 <= window <= close.shape[0]:
+            errors[row] = f"timeperiod {window} is outside 1..{close.shape[0]}"
+            continue
+        matrix[row, window - 1:] = prefix.window_sums(window) / window
+    return {"sma": matrix}
+
+
+def _sweep_bbands(market_data: Any, points: List[Dict[str, Any]], errors: Dict[int, str]) -> Optional[Dict[str, np.ndarray]]:
+    if any(set(point) - {"timeperiod", "nbdevup", "nbdevdn", "matype"} for point in points):
+        return None
+    if any(point.get("matype", 0) != 0 for point in points):
+        return None
+
+    close = as_float_array(market_data.close)
+    length = close.shape[0]
+    centered = close - (close[0] if length else 0.0)
+    sums = PrefixSums(centered)
+    squares = PrefixSums(centered * centered)
+
+    # One rolling mean and deviation per window, reused for every band width
+    moments: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+    shape = (len(points), length)
+    upper, middle, lower = np.full(shape, np.nan), np.full(shape, np.nan), np.full(shape, np.nan)
+    for row, point in enumerate(points):
+        window = int(point.get("timeperiod", 20))
+        if not 2 <= window <= length:
+            errors[row] = f"timeperiod {window} is outside 2..{length}"
+            continue
+        if window not in moments:
+            mean = sums.window_sums(window) / window
+            variance = squares.window_sums(window) / window - mean * mean
+            moments[window] = (mean + (close[0] if length else 0.0), np.sqrt(np.maximum(variance, 0.0)))
+        mean, deviation = moments[window]
+        middle[row, window - 1:] = mean
+        upper[row, window - 1:] = mean + float(point.get("nbdevup", 2.0)) * deviation
+        lower[row, window - 1:] = mean - float(point.get("nbdevdn", 2.0)) * deviation
+    return {"upperband": upper, "middleband": middle, "lowerband": lower}
+
+
+SharedSweep = Callable[[Any, List[Dict[str, Any]], Dict[int, str]], Optional[Dict[str, np.ndarray]]]
+
+_SHARED_SWEEPS: Dict[str, SharedSweep] = {
+    "sma": _sweep_sma,
+    "bbands": _sweep_bbands,
+}
+
+
+def _observe_shared(indicator_name: str, values: Dict[str, np.ndarray], errors: Dict[int, str], seconds: float) -> None:
+    """Record a shared-kernel sweep in the metrics as one calculation per grid point.
+
+    The kernel's time is split evenly over the points; points run without a
+    shared kernel are recorded by `run_indicators` instead.
+    """
+    metrics = get_metrics()
+    first = next(iter(values.values()))
+    rows, length = first.shape
+    for row in range(rows):
+        if row not in errors:
+            output_points = length - int(np.argmax(~np.isnan(first[row]))) if length else 0
+            metrics.observe_calculation(indicator_name, length, output_points, seconds / rows)
+
+
+async def run_sweep(
+    indicator_name: str,
+    market_data: Any,
+    grid: GridSpec,
+    params: Optional[Dict[str, Any]] = None,
+) -> IndicatorResult:
+    """Evaluate ``indicator_name`` over every point of ``grid``.
+
+    ``params`` holds fixed options applied to every point; swept values
+    take precedence. Raises ``ValueError`` for an unknown indicator or an
+    invalid or oversized grid.
+    """
+    indicator = registry.get_indicator(indicator_name)
+    if not indicator:
+        raise ValueError("tool not found")
+
+    axes, swept = expand_grid(grid)
+    points = [{**(params or {}), **point} for point in swept]
+    length = market_data.length
+    if len(points) * length > MAX_SWEEP_CELLS:
+        raise ValueError(f"sweep would produce {len(points) * length} values per output; the limit is {MAX_SWEEP_CELLS}")
+
+    errors: Dict[int, str] = {}
+    started = time.perf_counter()
+    shared = _SHARED_SWEEPS.get(indicator_name)
+    values = shared(market_data, points, errors) if shared else None
+    shared_computation = values is not None
+    if shared_computation:
+        _observe_shared(indicator_name, values, errors, time.perf_counter() - started)
+
+    if values is None:
+        # No shared kernel for this indicator/grid: run each point on the
+        # shared input and stack the aligned outputs. Points that differ
+        # only in non-period options (e.g. BBANDS with matype 1 and several
+        # band widths) still reuse intermediate series.
+        outputs: List[Dict[str, np.ndarray]] = []
+        for row, result in enumerate(await run_indicators(market_data, [(indicator, point) for point in points])):
+            if not result.success:
+                errors[row] = result.error_message or "calculation error"
+            outputs.append({key: _aligned(out, length) for key, out in result.values.items()})
+        keys = list(dict.fromkeys(key for output in outputs for key in output))
+        empty = np.full(length, np.nan)
+        values = {key: np.vstack([output.get(key, empty) for output in outputs]) for key in keys}
+
+    result = IndicatorResult(
+        indicator_name=indicator_name,
+        success=True,
+        values=values,
+        calculation_time=(time.perf_counter() - started) * 1000,
+        metadata={
+            "grid": axes,
+            "points": swept,
+            "fixed_params": params or {},
+            "rows": len(points),
+            "input_points": length,
+            "shared_computation": shared_computation,
+            # Keyed by the row as a string, the form JSON gives object keys
+            "errors": {str(row): errors[row] for row in sorted(errors)},
+        },
+    )
+    precision = getattr(market_data, "precision", "float64")
+    return result if precision == "float64" else with_output_precision(result, precision)
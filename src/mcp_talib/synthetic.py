@@ -0,0 +1,52 @@
+"""Seeded synthetic OHLCV series for benchmarks and load tests.
+
+`generate_ohlcv` draws a geometric random walk of closes and derives
+consistent bars around it: each open is the previous close, high and low
+bracket the open and close, and volumes are log-normal. The same
+``points`` and ``seed`` always give the same series, so timings from
+different runs and machines measure the same work.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from .models.market_data import ColumnarMarketData
+
+# One bar a minute from 2024-01-01T00:00:00Z
+START_TIMESTAMP = 1_704_067_200
+BAR_SECONDS = 60
+
+
+def generate_ohlcv(
+    points: int,
+    seed: int = 0,
+    start: float = 100.0,
+    volatility: float = 0.01,
+) -> ColumnarMarketData:
+    """A ``points``-bar OHLCV series; ``volatility`` is the per-bar log-return stdev."""
+    if points < 1:
+        raise ValueError(f"points must be at least 1, got {points}")
+    rng = np.random.default_rng(seed)
+    close = start * np.exp(np.cumsum(rng.normal(0.0, volatility, points)))
+    open_ = np.empty(points)
+    open_[0] = start
+    open_[1:] = close[:-1]
+    # Intrabar excursions beyond the open/close range
+    wick = np.abs(rng.normal(0.0, volatility / 2, (2, points)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = np.round(rng.lognormal(10.0, 0.5, points))
+    timestamp = START_TIMESTAMP + BAR_SECONDS * np.arange(points, dtype=np.int64)
+    return ColumnarMarketData(open=open_, high=high, low=low, close=close, volume=volume, timestamp=timestamp)
+
+
+def columns_payload(market_data: ColumnarMarketData, columns: Sequence[str]) -> Dict[str, List[float]]:
+    """The named columns as JSON-ready lists, the shape request bodies take."""
+    payload: Dict[str, Any] = {}
+    for column in columns:
+        values = getattr(market_data, column)
+        if values is None:
+            raise ValueError(f"series has no '{column}' column")
+        payload[column] = values.tolist()
+    return payload
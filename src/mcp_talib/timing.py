@@ -0,0 +1,241 @@
+"""Per-stage timing of requests.
+
+A `Timings` collects the spans of one request: reading the body, parsing
+and validating it, converting columns to arrays, the calculation,
+projection and response encoding. Code on the request path wraps each
+stage in `span`, which records into the request's timings when one is
+active and does nothing otherwise, so the helpers shared with other
+callers need no timing arguments.
+
+HTTP apps time every request with `ServerTimingMiddleware`, which returns
+the spans as a ``Server-Timing`` header (``parse;dur=1.204, ...,
+total;dur=3.870``, in milliseconds). Spans that end after the headers are
+sent, such as encoding a streamed body, only reach the trace file. MCP
+tool calls are timed by the tool wrapper; with ``MCP_TALIB_TIMING_METADATA``
+their results also carry the spans as ``metadata.timing``.
+
+With ``MCP_TALIB_TRACE_FILE`` set, each finished request is appended to
+that file as one JSON line: ``time``, ``transport``, ``tool``,
+``total_ms`` and ``spans`` (milliseconds per stage), ready for
+aggregation with pandas or ``jq``. A background `TraceWriter` writes the
+lines, so disk latency never adds to a response.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .config import get_settings
+from .metrics import route_label
+from .serialization import dumps
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+_current: ContextVar[Optional["Timings"]] = ContextVar("request_timings", default=None)
+
+
+class Timings:
+    """Stage spans of one request."""
+
+    def __init__(self, transport: str, tool: Optional[str] = None):
+        self.transport = transport
+        self.tool = tool
+        self.time = time.time()
+        self.started = time.perf_counter()
+        self.ended: Optional[float] = None
+        # (stage, start, end) in perf_counter seconds
+        self.spans: List[Tuple[str, float, float]] = []
+
+    def add(self, name: str, started: float, ended: float) -> None:
+        self.spans.append((name, started, ended))
+
+    def mark(self, name: str) -> None:
+        """Record the time since the last span ended (or the request began) as ``name``."""
+        last = max((end for _, _, end in self.spans), default=self.started)
+        self.add(name, last, time.perf_counter())
+
+    @property
+    def total_ms(self) -> float:
+        return ((self.ended or time.perf_counter()) - self.started) * 1000
+
+    def durations(self) -> Dict[str, float]:
+        """Milliseconds per stage, summed over repeated spans, in first-seen order."""
+        totals: Dict[str, float] = {}
+        for name, started, ended in self.spans:
+            totals[name] = totals.get(name, 0.0) + (ended - started) * 1000
+        return totals
+
+    def server_timing(self) -> str:
+        """The spans so far as a ``Server-Timing`` header value."""
+        entries = [*self.durations().items(), ("total", self.total_ms)]
+        return ", ".join(f"{name};dur={ms:.3f}" for name, ms in entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "time": self.time,
+            "transport": self.transport,
+            "tool": self.tool,
+            "total_ms": self.total_ms,
+            "spans": self.durations(),
+        }
+
+
+def current_timings() -> Optional[Timings]:
+    """The timings of the request being handled, if it is timed."""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the block as stage ``name`` of the current request, if any."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, started, time.perf_counter())
+
+
+def iter_spanned(chunks: Iterable[T], name: str) -> Iterator[T]:
+    """Yield ``chunks``, timing the production of each as stage ``name``."""
+    iterator = iter(chunks)
+    while True:
+        with span(name):
+            chunk = next(iterator, _END)
+        if chunk is _END:
+            return
+        yield chunk
+
+
+def mark(name: str) -> None:
+    """`Timings.mark` on the current request, if any."""
+    timings = _current.get()
+    if timings is not None:
+        timings.mark(name)
+
+
+@contextmanager
+def timed(transport: str, tool: Optional[str] = None) -> Iterator[Timings]:
+    """Time the request handled in this block, then export it to the trace file.
+
+    Inside an already timed request the block joins its timings instead.
+    """
+    timings = _current.get()
+    if timings is not None:
+        yield timings
+        return
+    timings = Timings(transport, tool)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+        finish(timings)
+
+
+def finish(timings: Timings) -> None:
+    """Stop the clock on ``timings`` and queue them for the configured trace file."""
+    timings.ended = time.perf_counter()
+    path = get_settings().trace_file
+    if path:
+        get_trace_writer().write(path, timings.to_dict())
+
+
+class TraceWriter:
+    """Appends JSON lines to trace files on a background thread.
+
+    Requests only queue their record; the thread encodes and writes it,
+    keeping the current file open and flushing whenever the queue drains.
+    """
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._file: Optional[BinaryIO] = None
+
+    def write(self, path: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mcp-talib-trace", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+        self._queue.put((path, record))
+
+    def flush(self) -> None:
+        """Block until every queued record is written and flushed."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            path, record = self._queue.get()
+            try:
+                if path != self._path:
+                    if self._file is not None:
+                        self._file.close()
+                    self._path, self._file = path, open(path, "ab")
+                self._file.write(dumps(record) + b"\n")
+                if self._queue.empty():
+                    self._file.flush()
+            except OSError:
+                logger.exception("could not write trace record to %s", path)
+                # Reopen on the next record
+                if self._file is not None:
+                    self._file.close()
+                self._path = self._file = None
+            finally:
+                self._queue.task_done()
+
+
+_trace_writer: Optional[TraceWriter] = None
+_trace_writer_lock = threading.Lock()
+
+
+def get_trace_writer() -> TraceWriter:
+    """Return the process-wide trace writer."""
+    global _trace_writer
+    with _trace_writer_lock:
+        if _trace_writer is None:
+            _trace_writer = TraceWriter()
+        return _trace_writer
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware timing each HTTP request and adding a ``Server-Timing`` header."""
+
+    def __init__(self, app: Any, transport: str = "http"):
+        self.app = app
+        self.transport = transport
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = Timings(self.transport)
+        token = _current.set(timings)
+
+        async def timing_send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            _current.reset(token)
+            timings.tool = route_label(scope)
+            finish(timings)
@@ -6,6 +6,8 @@ from mcp.server.fastmcp import FastMCP
 from starlette.middleware.cors import CORSMiddleware
 import uvicorn
 from .base import BaseTransport
+from ..executors import get_executor
+from ..metrics import current_transport
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -56,4 +58,12 @@ class HttpTransport(BaseTransport):
             log_level="debug" if self.debug else "info"
         )
         server = uvicorn.Server(config)
-        await server.serve()
\ No newline at end of file
+        # Tool calls run in tasks started by the server, which inherit the label
+        current_transport.set("mcp-http")
+        # Start any worker processes now rather than on the first request
+        executor = get_executor()
+        executor.start()
+        try:
+            await server.serve()
+        finally:
+            executor.shutdown()
\ No newline at end of file
@@ -4,6 +4,7 @@ import logging
 import uvicorn
 from .base import BaseTransport
 from ..http_api_server import create_http_api_app
+from ..executors import get_executor
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -39,4 +40,10 @@ class HttpApiTransport(BaseTransport):
             access_log=self.debug,
         )
         server = uvicorn.Server(config)
-        await server.serve()
+        # Start any worker processes now rather than on the first request
+        executor = get_executor()
+        executor.start()
+        try:
+            await server.serve()
+        finally:
+            executor.shutdown()
@@ -5,6 +5,7 @@ import os
 import sys
 from mcp.server.fastmcp import FastMCP
 from .base import BaseTransport
+from ..metrics import current_transport
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -23,6 +24,8 @@ class StdioTransport(BaseTransport):
         if self.debug:
             logger.debug("Starting MCP server with STDIO transport")
             
+        # Tool calls run in tasks started below, which inherit the label
+        current_transport.set("stdio")
         # FastMCP handles the stdio transport automatically
         # Use run_stdio_async for better control and cleaner output
         await self.server.run_stdio_async()
\ No newline at end of file
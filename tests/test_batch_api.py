@@ -0,0 +1,88 @@
+import asyncio
+
+import numpy as np
+import talib as ta
+from fastapi.testclient import TestClient
+
+from mcp_talib import indicators
+from mcp_talib.http_api_server import create_http_api_app
+
+
+def _series(seed, n=60):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(size=n))
+    return {"close": close.tolist(), "high": (close + 1).tolist(), "low": (close - 1).tolist()}
+
+
+def test_batch_runs_every_job():
+    client = TestClient(create_http_api_app())
+    jobs = [{"symbol": f"SYM{i}", "series": _series(i), "params": {"timeperiod": 5 + i}} for i in range(5)]
+
+    r = client.post("/api/batch", json={"tool": "wma", "jobs": jobs})
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["success"] is True
+    assert data["succeeded"] == 5 and data["failed"] == 0
+    assert [res["symbol"] for res in data["results"]] == [job["symbol"] for job in jobs]
+    for job, res in zip(jobs, data["results"]):
+        expected = ta.WMA(np.asarray(job["series"]["close"]), timeperiod=job["params"]["timeperiod"])
+        got = np.asarray([np.nan if v is None else v for v in res["values"]["wma"]])
+        np.testing.assert_allclose(got, expected, equal_nan=True)
+
+
+def test_batch_reports_per_job_errors():
+    client = TestClient(create_http_api_app())
+    jobs = [
+        {"symbol": "OK", "series": _series(1), "params": {"timeperiod": 3}},
+        {"symbol": "UNKNOWN", "tool": "nope", "series": _series(2)},
+        {"symbol": "SHORT", "series": {"close": [1.0, 2.0]}, "params": {"timeperiod": 10}},
+        {"symbol": "EMPTY", "series": {"close": []}},
+        {"symbol": "HL", "tool": "sar", "series": {"high": [2.0, 3.0, 4.0], "low": [1.0, 2.0, 3.0]}},
+    ]
+
+    r = client.post("/api/batch", json={"tool": "sma", "jobs": jobs})
+
+    assert r.status_code == 200
+    data = r.json()
+    by_symbol = {res["symbol"]: res for res in data["results"]}
+    assert data["success"] is False
+    assert data["failed"] == 3
+    assert by_symbol["OK"]["success"] is True
+    assert by_symbol["UNKNOWN"]["error"] == "tool not found"
+    assert "Not enough data" in by_symbol["SHORT"]["error"]
+    assert by_symbol["EMPTY"]["success"] is False
+    assert by_symbol["HL"]["success"] is True and by_symbol["HL"]["tool"] == "sar"
+
+
+def test_batch_bounds_concurrency(monkeypatch):
+    state = {"in_flight": 0, "peak": 0}
+
+    class SlowIndicator:
+        async def calculate(self, market_data, params):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+
+            class Result:
+                success = True
+                values = {"x": [1.0]}
+                metadata = {}
+
+            return Result()
+
+    monkeypatch.setattr(indicators.registry, "get_indicator", lambda name: SlowIndicator(), raising=False)
+    client = TestClient(create_http_api_app())
+    jobs = [{"symbol": str(i), "series": {"close": [1.0]}} for i in range(12)]
+
+    r = client.post("/api/batch", json={"tool": "slow", "jobs": jobs, "max_concurrency": 3})
+
+    assert r.json()["succeeded"] == 12
+    assert state["peak"] == 3
+
+
+def test_batch_rejects_invalid_concurrency():
+    client = TestClient(create_http_api_app())
+    r = client.post("/api/batch", json={"tool": "sma", "jobs": [], "max_concurrency": 0})
+    assert r.status_code == 422
@@ -0,0 +1,120 @@
+import io
+
+import numpy as np
+import pytest
+import talib as ta
+from fastapi.testclient import TestClient
+
+from mcp_talib import media
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.store import get_series_store
+
+rng = np.random.default_rng(15)
+CLOSE = 100 + np.cumsum(rng.normal(size=1000))
+HIGH, LOW = CLOSE + 1, CLOSE - 1
+
+
+def _npy(array):
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+def _arrow_stream(**columns):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_http_api_app())
+
+
+def test_decoded_columns_are_views_of_the_body():
+    body = np.concatenate([HIGH, LOW]).tobytes()
+    columns = media.decode_columns(body, "application/octet-stream", ["high", "low"])
+
+    np.testing.assert_array_equal(columns["low"], LOW)
+    assert columns["high"].base is not None and not columns["high"].flags.writeable
+
+    rows = media.decode_columns(_npy(np.stack([HIGH, LOW])), media.NPY, ["high", "low"])
+    np.testing.assert_array_equal(rows["high"], HIGH)
+    fields = np.zeros(3, dtype=[("close", "<f8"), ("volume", "<f8")])
+    assert set(media.decode_columns(_npy(fields), media.NPY)) == {"close", "volume"}
+
+
+def test_malformed_bodies_are_rejected():
+    with pytest.raises(ValueError, match="multiple of 8"):
+        media.decode_columns(b"abc", media.RAW)
+    with pytest.raises(ValueError, match="split evenly"):
+        media.decode_columns(np.zeros(3).tobytes(), media.RAW, ["high", "low"])
+    with pytest.raises(ValueError, match="invalid .npy"):
+        media.decode_columns(b"not npy", media.NPY)
+    with pytest.raises(ValueError, match="Python objects"):
+        media.decode_columns(_npy(np.array(["a"], dtype=object)), media.NPY)
+    with pytest.raises(media.UnsupportedMediaTypeError):
+        media.decode_columns(b"", "text/csv")
+    assert media.parse_query_params([("timeperiod", "5"), ("matype", "x"), ("columns", "close")], ["columns"]) == {
+        "timeperiod": 5,
+        "matype": "x",
+    }
+
+
+def test_raw_and_npy_tool_calls_match_json(client):
+    expected = client.post("/api/tools/sma", json={"close": CLOSE.tolist(), "timeperiod": 5}).json()
+    raw = client.post("/api/tools/sma?timeperiod=5", content=CLOSE.tobytes(), headers={"content-type": media.RAW})
+    npy = client.post(
+        "/api/tools/midprice?columns=high,low&timeperiod=5",
+        content=_npy(np.stack([HIGH, LOW])),
+        headers={"content-type": media.NPY},
+    )
+
+    assert raw.status_code == 200 and raw.json() == expected
+    assert npy.json()["values"]["midprice"][4:] == ta.MIDPRICE(HIGH, LOW, timeperiod=5)[4:].tolist()
+
+
+def test_binary_errors_map_to_http_statuses(client):
+    assert client.post("/api/tools/sma", content=b"abc", headers={"content-type": media.RAW}).status_code == 422
+    assert client.post("/api/tools/sma", content=b"1,2", headers={"content-type": "text/csv"}).status_code == 415
+    unknown = client.post("/api/tools/sma?columns=price", content=CLOSE.tobytes(), headers={"content-type": media.RAW})
+    assert unknown.status_code == 422 and "price" in unknown.json()["detail"]
+    invalid = client.post("/api/tools/sma", content=b"{", headers={"content-type": "application/json"})
+    assert invalid.status_code == 422 and invalid.json()["detail"][0]["loc"][0] == "body"
+
+
+def test_binary_series_upload_and_append(client):
+    put = client.put(
+        "/api/series/BIN?precision=float32", content=CLOSE[:600].tobytes(), headers={"content-type": media.RAW}
+    )
+    append = client.post("/api/series/BIN/append", content=_npy(CLOSE[600:]), headers={"content-type": media.NPY})
+
+    assert put.json()["precision"] == "float32"
+    assert append.json()["length"] == 1000
+    np.testing.assert_array_equal(get_series_store().get("BIN").close, CLOSE.astype(np.float32))
+
+
+def test_arrow_bodies(client):
+    body = _arrow_stream(close=CLOSE, high=HIGH, low=LOW)
+    response = client.post("/api/tools/sar", content=body, headers={"content-type": media.ARROW_STREAM})
+
+    assert response.status_code == 200
+    assert response.json()["values"]["sar"][1:] == ta.SAR(HIGH, LOW)[1:].tolist()
+
+
+def test_arrow_batch_groups_rows_by_symbol(client):
+    symbols = ["AAA"] * 400 + ["BBB"] * 600
+    body = _arrow_stream(symbol=symbols, close=CLOSE)
+    response = client.post("/api/batch?tool=ema&timeperiod=10", content=body, headers={"content-type": media.ARROW_STREAM})
+
+    results = response.json()["results"]
+    assert [r["symbol"] for r in results] == ["AAA", "BBB"]
+    expected = client.post("/api/tools/ema", json={"close": CLOSE[400:].tolist(), "timeperiod": 10}).json()
+    assert results[1]["values"] == expected["values"]
+
+    shuffled = _arrow_stream(symbol=["AAA", "BBB", "AAA"], close=[1.0, 2.0, 3.0])
+    rejected = client.post("/api/batch?tool=ema", content=shuffled, headers={"content-type": media.ARROW_STREAM})
+    assert rejected.status_code == 422
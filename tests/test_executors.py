@@ -0,0 +1,178 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+from mcp_talib.config import Settings
+from mcp_talib.executors import InlineExecutor, ProcessExecutor, ThreadExecutor, create_executor
+from mcp_talib.indicators import base, registry
+from mcp_talib.indicators.base import runs_without_gil, talib_releases_gil
+from mcp_talib.models.market_data import ColumnarMarketData
+
+rng = np.random.default_rng(12)
+CLOSE = 100 + np.cumsum(rng.normal(size=5000))
+MARKET = ColumnarMarketData(close=CLOSE, high=CLOSE + 1, low=CLOSE - 1)
+
+JOBS = [
+    ("sma", {"timeperiod": 20}),
+    ("rsi", {"timeperiod": 14}),
+    ("bbands", {"timeperiod": 20, "matype": 1}),
+    ("dema", {"timeperiod": 10}),
+    ("midprice", {"timeperiod": 5}),
+]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    executor = ProcessExecutor(workers=1, min_points=1000)
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+def _shm_blocks():
+    if not os.path.isdir("/dev/shm"):
+        return set()
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+def _jobs():
+    return [(registry.get_indicator(name), options) for name, options in JOBS]
+
+
+async def test_process_results_match_inline(pool):
+    offloaded = await pool.run(MARKET, _jobs())
+    inline = await InlineExecutor().run(MARKET, _jobs())
+
+    assert pool.offloads(MARKET, _jobs())
+    for got, expected in zip(offloaded, inline):
+        assert got.success and got.indicator_name == expected.indicator_name
+        assert got.metadata == expected.metadata
+        assert got.values.keys() == expected.values.keys()
+        for key in expected.values:
+            np.testing.assert_array_equal(got.values[key], expected.values[key])
+
+
+async def test_shared_memory_is_reused_and_freed_on_shutdown():
+    executor = ProcessExecutor(workers=1, min_points=1000)
+    before = _shm_blocks()
+    try:
+        for _ in range(5):
+            (result,) = await executor.run(MARKET, [(registry.get_indicator("kama"), {})])
+            assert result.success
+        # An input and an output block, reused by every call
+        assert len(_shm_blocks() - before) <= 2
+    finally:
+        executor.shutdown()
+    assert _shm_blocks() <= before
+
+
+class _FailingPool:
+    def __init__(self, error):
+        self.error = error
+
+    def submit(self, *args, **kwargs):
+        raise self.error
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize("error", [BrokenProcessPool("worker died"), RuntimeError("cannot pickle")])
+async def test_failed_dispatch_returns_its_blocks_to_the_pool(error):
+    executor = ProcessExecutor(workers=1, min_points=1000)
+    executor._pool = _FailingPool(error)
+    before = _shm_blocks()
+    try:
+        if isinstance(error, BrokenProcessPool):
+            (result,) = await executor.run(MARKET, [(registry.get_indicator("kama"), {})])
+            assert result.success
+        else:
+            with pytest.raises(RuntimeError):
+                await executor.run(MARKET, [(registry.get_indicator("kama"), {})])
+        # The input and spare output blocks are both free for reuse
+        assert len(executor._blocks._free) == 2
+    finally:
+        executor._pool = None
+        executor.shutdown()
+    assert _shm_blocks() <= before
+
+
+async def test_failed_calculations_come_back_as_results(pool):
+    (result,) = await pool.run(MARKET, [(registry.get_indicator("sma"), {"timeperiod": 0})])
+    assert not result.success and result.error_message
+
+
+async def test_event_loop_keeps_running_during_offloaded_work(pool):
+    big = ColumnarMarketData(close=100 + np.cumsum(rng.normal(size=2_000_000)))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        await pool.run(big, [(registry.get_indicator("t3"), {"timeperiod": 5})] * 3)
+    finally:
+        task.cancel()
+    assert ticks > 0
+
+
+async def test_small_inputs_and_unregistered_indicators_run_inline(pool):
+    class Echo:
+        async def calculate(self, market_data, options):
+            return os.getpid()
+
+    assert not pool.offloads(ColumnarMarketData(close=CLOSE[:10]), _jobs())
+    assert not pool.offloads(MARKET, [(Echo(), {})])
+    assert await pool.run(MARKET, [(Echo(), {})]) == [os.getpid()]
+
+
+def test_gil_probe_tells_held_from_released():
+    values = list(range(200_000, 0, -1))
+
+    assert not runs_without_gil(lambda: sorted(values))
+    assert runs_without_gil(lambda: time.sleep(0.002))
+    assert isinstance(talib_releases_gil(), bool)
+
+
+@pytest.mark.parametrize("talib_threads", [True, False])
+async def test_thread_executor_routes_by_gil_release(monkeypatch, talib_threads):
+    monkeypatch.setattr(base, "talib_releases_gil", lambda: talib_threads)
+
+    class Recording(InlineExecutor):
+        jobs = []
+
+        async def run(self, market_data, jobs):
+            self.jobs.extend(indicator.name for indicator, _ in jobs)
+            return await super().run(market_data, jobs)
+
+    fallback = Recording()
+    executor = ThreadExecutor(workers=2, min_points=1000, fallback=fallback)
+    try:
+        threaded = await executor.run(MARKET, _jobs())
+    finally:
+        executor.shutdown()
+
+    assert base.releases_gil(registry.get_indicator("sma"))
+    assert fallback.jobs == ([] if talib_threads else [name for name, _ in JOBS if name != "sma"])
+    for got, expected in zip(threaded, await InlineExecutor().run(MARKET, _jobs())):
+        assert got.indicator_name == expected.indicator_name
+        for key in expected.values:
+            np.testing.assert_array_equal(got.values[key], expected.values[key])
+
+
+def test_executor_settings():
+    settings = Settings.from_env({"MCP_TALIB_EXECUTOR": "process", "MCP_TALIB_WORKERS": "3"})
+    executor = create_executor(settings.executor, settings.workers, settings.offload_min_points)
+    assert isinstance(executor, ProcessExecutor) and executor.workers == 3
+    threaded = create_executor("thread", 2)
+    assert isinstance(threaded, ThreadExecutor) and isinstance(threaded.fallback, ProcessExecutor)
+    with pytest.raises(ValueError, match="unknown executor"):
+        create_executor("gpu")
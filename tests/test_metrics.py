@@ -0,0 +1,85 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from mcp_talib.cache import get_result_cache
+from mcp_talib.core.mcp_server import create_mcp_server
+from mcp_talib.execution import run_indicator
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.indicators import registry
+from mcp_talib.metrics import Metrics, get_metrics
+from mcp_talib.models.market_data import ColumnarMarketData
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(23).normal(size=2000))
+
+
+def _samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+def test_histograms_and_counters_render_in_text_format():
+    metrics = Metrics()
+    metrics.observe_request("http", "sma", 0.003, bytes_in=100, bytes_out=400)
+    metrics.observe_request("http", "sma", 0.2, ok=False)
+    metrics.observe_calculation("sma", 5000, 4981, 0.0004)
+    text = metrics.render()
+    samples = _samples(text)
+
+    assert "# TYPE mcp_talib_request_duration_seconds histogram" in text
+    assert samples['mcp_talib_requests_total{transport="http",tool="sma"}'] == "2"
+    assert samples['mcp_talib_request_errors_total{transport="http",tool="sma"}'] == "1"
+    assert samples['mcp_talib_request_bytes_total{transport="http",tool="sma"}'] == "100"
+    assert samples['mcp_talib_request_duration_seconds_bucket{transport="http",tool="sma",le="0.005"}'] == "1"
+    assert samples['mcp_talib_request_duration_seconds_bucket{transport="http",tool="sma",le="+Inf"}'] == "2"
+    assert samples['mcp_talib_input_points_bucket{indicator="sma",le="10000"}'] == "1"
+    assert samples['mcp_talib_calculation_seconds_count{indicator="sma"}'] == "1"
+    assert "mcp_talib_cache_hits_total" in samples
+
+
+async def test_results_carry_calculation_time_and_only_fresh_ones_are_timed():
+    get_result_cache().clear()
+    timed, counted = 'mcp_talib_calculation_seconds_count{indicator="kama"}', 'mcp_talib_input_points_count{indicator="kama"}'
+    before = _samples(get_metrics().render())
+    market_data = ColumnarMarketData(close=CLOSE)
+
+    first = await run_indicator(registry.get_indicator("kama"), market_data, {"timeperiod": 12})
+    again = await run_indicator(registry.get_indicator("kama"), market_data, {"timeperiod": 12})
+
+    assert first.calculation_time is not None and first.calculation_time > 0
+    assert again.calculation_time == first.calculation_time
+    after = _samples(get_metrics().render())
+    assert int(after[timed]) == int(before.get(timed, 0)) + 1
+    assert int(after[counted]) == int(before.get(counted, 0)) + 2
+
+
+def test_http_requests_are_recorded_per_tool():
+    client = TestClient(create_http_api_app())
+    metrics = get_metrics()
+    before = metrics.value("requests", transport="http", tool="wma")
+    sent_before = metrics.value("bytes_out", transport="http", tool="wma")
+    errors_before = metrics.value("errors", transport="http", tool="unknown")
+
+    ok = client.post("/api/tools/wma", json={"close": CLOSE.tolist()})
+    streamed = client.post("/api/tools/wma", json={"close": CLOSE.tolist()}, headers={"Accept": "application/x-ndjson"})
+    client.post("/api/tools/not-a-tool", json={"close": [1.0]})
+    response = client.get("/metrics")
+
+    assert metrics.value("requests", transport="http", tool="wma") == before + 2
+    assert metrics.value("bytes_out", transport="http", tool="wma") - sent_before == len(ok.content) + len(streamed.content)
+    assert metrics.value("errors", transport="http", tool="unknown") == errors_before + 1
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'mcp_talib_requests_total{transport="http",tool="wma"}' in response.text
+
+
+async def test_mcp_tool_calls_and_metrics_resource():
+    mcp = create_mcp_server()
+    metrics = get_metrics()
+    before = metrics.value("requests", transport="mcp", tool="calculate_trima")
+    errors_before = metrics.value("errors", transport="mcp", tool="calculate_trima")
+
+    await mcp.call_tool("calculate_trima", {"close": CLOSE[:100].tolist(), "timeperiod": 10})
+    await mcp.call_tool("calculate_trima", {"series": "missing"})
+    contents = await mcp.read_resource("metrics://prometheus")
+
+    assert metrics.value("requests", transport="mcp", tool="calculate_trima") == before + 2
+    assert metrics.value("errors", transport="mcp", tool="calculate_trima") == errors_before + 1
+    assert 'mcp_talib_requests_total{transport="mcp",tool="calculate_trima"}' in contents[0].content
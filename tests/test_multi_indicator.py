@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+import pytest
+import talib as ta
+from fastapi.testclient import TestClient
+
+from mcp_talib.core.mcp_server import create_mcp_server
+from mcp_talib.http_api_server import create_http_api_app
+
+
+CLOSE = (100 + np.cumsum(np.random.default_rng(9).normal(size=120))).tolist()
+
+
+def _arr(values):
+    return np.asarray([np.nan if v is None else v for v in values], dtype=float)
+
+
+def test_multi_computes_all_specs_on_one_series():
+    client = TestClient(create_http_api_app())
+    body = {
+        "close": CLOSE,
+        "indicators": [
+            {"indicator": "sma", "params": {"timeperiod": 10}},
+            {"indicator": "ema", "params": {"timeperiod": 10}},
+            {"indicator": "bbands", "params": {"timeperiod": 20}},
+            {"indicator": "kama", "key": "kama_fast", "params": {"timeperiod": 5}},
+            {"indicator": "kama", "key": "kama_slow", "params": {"timeperiod": 30}},
+            {"indicator": "t3"},
+        ],
+    }
+
+    r = client.post("/api/multi", json=body)
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["success"] is True
+    results = data["results"]
+    assert list(results) == ["sma", "ema", "bbands", "kama_fast", "kama_slow", "t3"]
+
+    close = np.asarray(CLOSE)
+    np.testing.assert_allclose(_arr(results["sma"]["values"]["sma"]), ta.SMA(close, 10)[9:])
+    np.testing.assert_allclose(_arr(results["kama_slow"]["values"]["kama"]), ta.KAMA(close, 30), equal_nan=True)
+    np.testing.assert_allclose(_arr(results["bbands"]["values"]["upperband"]), ta.BBANDS(close, 20)[0], equal_nan=True)
+    assert results["kama_fast"]["metadata"]["timeperiod"] == 5
+
+
+def test_multi_reports_per_spec_failures():
+    client = TestClient(create_http_api_app())
+    body = {"close": [1.0, 2.0, 3.0], "indicators": [{"indicator": "nope"}, {"indicator": "sma", "params": {"timeperiod": 2}}]}
+
+    data = client.post("/api/multi", json=body).json()
+
+    assert data["success"] is False
+    assert data["results"]["nope"]["error"] == "tool not found"
+    assert data["results"]["sma"]["success"] is True
+
+
+def test_multi_rejects_duplicate_keys():
+    client = TestClient(create_http_api_app())
+    body = {"close": CLOSE, "indicators": [{"indicator": "sma"}, {"indicator": "sma", "params": {"timeperiod": 5}}]}
+
+    r = client.post("/api/multi", json=body)
+
+    assert r.status_code == 422
+    assert "duplicate" in r.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_calculate_multi_mcp_tool():
+    mcp = create_mcp_server()
+    assert "calculate_multi" in {tool.name for tool in await mcp.list_tools()}
+
+    result = await mcp.call_tool(
+        "calculate_multi",
+        {"close": CLOSE, "indicators": [{"indicator": "sma", "params": {"timeperiod": 5}}, {"indicator": "tema"}]},
+    )
+
+    payload = json.loads(result[0].text)
+    assert payload["success"] is True
+    assert set(payload["results"]) == {"sma", "tema"}
+    assert len(payload["results"]["sma"]["values"]["sma"]) == len(CLOSE) - 4
@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+import talib as ta
+from fastapi.testclient import TestClient
+
+from mcp_talib.cache import get_result_cache
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.models.market_data import ColumnarMarketData
+from mcp_talib.serialization import round_significant, to_builtin
+from mcp_talib.store import SeriesStore, get_series_store
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(14).normal(size=500))
+
+
+def _relative_error(got, expected):
+    got, expected = np.asarray(got, dtype=float), np.asarray(expected, dtype=float)
+    return np.nanmax(np.abs(got - expected) / np.abs(expected))
+
+
+def test_round_significant_prints_short_decimals():
+    values = np.array([0.1, 100.12345678, -3.3e-5, 1.2345678e12, 0.0, np.nan], dtype=np.float32)
+    rounded = round_significant(values)
+
+    assert [repr(v) for v in rounded[:5].tolist()] == ["0.1", "100.1235", "-3.3e-05", "1234568000000.0", "0.0"]
+    assert np.isnan(rounded[5])
+    assert to_builtin(values)[-1] is None
+    assert to_builtin(np.float32(0.1)) == 0.1
+
+
+def test_with_precision_converts_price_columns_only():
+    market_data = ColumnarMarketData(close=CLOSE, high=CLOSE + 1, timestamp=np.arange(500))
+    half = market_data.with_precision("float32")
+
+    assert market_data.precision == "float64" and market_data.with_precision("float64") is market_data
+    assert half.precision == "float32"
+    assert half.close.dtype == np.float32 and half.high.dtype == np.float32
+    assert half.timestamp.dtype == np.int64
+
+
+def test_float32_store_halves_memory_and_keeps_precision_on_append():
+    store = SeriesStore()
+    full = store.put("f64", ColumnarMarketData(close=CLOSE))
+    half = store.put("f32", ColumnarMarketData(close=CLOSE[:400]).with_precision("float32"))
+    info = store.append("f32", ColumnarMarketData(close=CLOSE[400:]))
+
+    assert half["precision"] == "float32" and full["precision"] == "float64"
+    assert info["precision"] == "float32" and info["length"] == 500
+    assert store.get("f32").close.dtype == np.float32
+    assert store.get("f32").close.nbytes * 2 == store.get("f64").close.nbytes
+
+
+def test_float32_requests_return_float32_precision():
+    client = TestClient(create_http_api_app())
+    expected = ta.KAMA(CLOSE, timeperiod=10)
+
+    response = client.post("/api/tools/kama", json={"close": CLOSE.tolist(), "timeperiod": 10, "precision": "float32"})
+    full = client.post("/api/tools/kama", json={"close": CLOSE.tolist(), "timeperiod": 10})
+
+    values = response.json()["values"]["kama"]
+    assert values[:9] == [None] * 9
+    assert _relative_error(values[9:], expected[9:]) < 1e-6
+    assert len(response.content) < 0.7 * len(full.content)
+    assert max(len(repr(v)) for v in values[9:]) <= 9
+    assert response.json()["metadata"] == full.json()["metadata"]
+
+
+def test_float32_results_are_cached_separately_at_half_size():
+    cache = get_result_cache()
+    cache.clear()
+    client = TestClient(create_http_api_app())
+    body = {"close": (CLOSE + 7).tolist(), "timeperiod": 30}
+    client.post("/api/tools/trima", json=body)
+    full_bytes = cache.stats()["bytes"]
+    client.post("/api/tools/trima", json={**body, "precision": "float32"})
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] - full_bytes < full_bytes
+
+
+def test_float32_stored_series_drive_output_precision():
+    get_series_store().put("HALF", ColumnarMarketData(close=CLOSE).with_precision("float32"))
+    client = TestClient(create_http_api_app())
+
+    info = client.get("/api/series/HALF").json()
+    swept = client.post("/api/sweep/ema", json={"series": "HALF", "grid": {"timeperiod": [5, 10]}}).json()
+    upcast = client.post("/api/tools/ema", json={"series": "HALF", "timeperiod": 5, "precision": "float64"}).json()
+
+    assert info["precision"] == "float32"
+    assert _relative_error(swept["values"]["ema"][0][4:], ta.EMA(CLOSE, timeperiod=5)[4:]) < 1e-6
+    # Upcasting the stored values gives float64 outputs of the rounded input
+    assert upcast["values"]["ema"] == ta.EMA(CLOSE.astype(np.float32).astype(float), timeperiod=5)[4:].tolist()
+    assert json.dumps(swept)
@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_talib import profiling
+from mcp_talib.config import Settings
+from mcp_talib.core.mcp_server import create_mcp_server
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.indicators import registry
+from mcp_talib.metrics import get_metrics
+from mcp_talib.models.market_data import ColumnarMarketData
+from mcp_talib.profiling import ProfilingDisabledError, load_profile, run_profiled
+from mcp_talib.synthetic import generate_ohlcv
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(25).normal(size=5000))
+
+
+def _samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+@pytest.fixture
+def enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "get_settings", lambda: Settings(profiling=True, profile_dir=str(tmp_path)))
+    return tmp_path
+
+
+async def test_profile_finds_the_talib_call_and_is_stored(enabled):
+    result, profile = await run_profiled(registry.get_indicator("sarext"), generate_ohlcv(200_000, seed=25))
+
+    assert result.success and result.calculation_time > 0
+    slowest = max(profile.functions, key=lambda f: f.total_ms)
+    assert slowest.name == "mcp_talib.indicators.sarext:SAREXTIndicator.calculate" and slowest.calls == 1
+    assert "ta.SAREXT(" in profile.lines[0].source
+    stacks = [line.rsplit(" ", 1) for line in profile.collapsed().splitlines()]
+    assert all(stack.startswith("mcp_talib.indicators.sarext:SAREXTIndicator.calculate") for stack, _ in stacks)
+    assert sum(int(weight) for _, weight in stacks) <= profile.seconds * 1e6 + len(stacks)
+    stored = load_profile(profile.id)
+    assert stored["collapsed"] == profile.collapsed() and profile.id in stored["table"]
+    with pytest.raises(KeyError):
+        load_profile("../" + profile.id)
+
+
+async def test_profiling_is_refused_unless_enabled():
+    with pytest.raises(ProfilingDisabledError):
+        await run_profiled(registry.get_indicator("sma"), generate_ohlcv(100))
+    client = TestClient(create_http_api_app())
+
+    response = client.post("/api/tools/sma", json={"close": CLOSE.tolist()}, headers={"X-Profile": "1"})
+    plain = client.post("/api/tools/sma", json={"close": CLOSE.tolist()}, headers={"X-Profile": "0"})
+
+    assert response.status_code == 403 and plain.status_code == 200
+    assert "x-profile-id" not in plain.headers
+
+
+def test_http_header_profiles_the_request(enabled):
+    client = TestClient(create_http_api_app())
+    body = {"close": CLOSE.tolist(), "timeperiod": 10}
+
+    plain = client.post("/api/tools/kama", json=body)
+    response = client.post("/api/tools/kama", json=body, headers={"X-Profile": "1"})
+    stored = client.get(f"/api/profiles/{response.headers['x-profile-id']}")
+
+    assert response.json()["values"] == plain.json()["values"]
+    assert stored.status_code == 200 and "KAMAIndicator.calculate" in stored.json()["collapsed"]
+    assert (enabled / f"{response.headers['x-profile-id']}.collapsed").exists()
+    assert client.get("/api/profiles/0123456789abcdef0123456789abcdef").status_code == 404
+
+
+async def test_mcp_profile_option_adds_the_profile(enabled):
+    mcp = create_mcp_server()
+
+    plain = json.loads((await mcp.call_tool("calculate_kama", {"close": CLOSE.tolist()}))[0].text)
+    profiled = json.loads((await mcp.call_tool("calculate_kama", {"close": CLOSE.tolist(), "profile": True}))[0].text)
+
+    assert "profile" not in plain and profiled["values"] == plain["values"]
+    assert any(f["name"].endswith("KAMAIndicator.calculate") for f in profiled["profile"]["functions"])
+    assert any("ta.KAMA(" in line["source"] for line in profiled["profile"]["lines"])
+
+
+async def test_profiled_results_match_precision_metrics_and_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        profiling, "get_settings", lambda: Settings(profiling=True, profile_dir=str(tmp_path), profile_max_count=2)
+    )
+    timed = 'mcp_talib_calculation_seconds_count{indicator="trima"}'
+    before = _samples(get_metrics().render()).get(timed, 0)
+    market_data = ColumnarMarketData(close=CLOSE).with_precision("float32")
+
+    profiles = [(await run_profiled(registry.get_indicator("trima"), market_data))[1] for _ in range(3)]
+    result, last = await run_profiled(registry.get_indicator("trima"), market_data)
+
+    assert result.values["trima"].dtype == np.float32
+    assert int(_samples(get_metrics().render())[timed]) == int(before) + 4
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f"{profile_id}{extension}" for profile_id in (profiles[2].id, last.id) for extension in (".txt", ".collapsed")
+    )
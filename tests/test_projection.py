@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+import talib as ta
+from fastapi.testclient import TestClient
+
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.models.indicator_result import IndicatorResult
+from mcp_talib.projection import Projection, parse_slice, project
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(18).normal(size=200))
+UPPER, MIDDLE, LOWER = ta.BBANDS(CLOSE, timeperiod=20)
+
+
+def _bbands():
+    return IndicatorResult(
+        indicator_name="bbands",
+        values={"upperband": UPPER, "middleband": MIDDLE, "lowerband": LOWER},
+        metadata={"timeperiod": 20, "input_points": 200, "output_points": 200},
+    )
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_http_api_app())
+
+
+def test_projection_selects_outputs_and_windows_without_copying():
+    projected = project(_bbands(), Projection.from_options(["upperband"], drop_lookback=True))
+
+    assert list(projected.values) == ["upperband"]
+    assert projected.metadata["offset"] == 19 and projected.metadata["output_points"] == 181
+    assert np.shares_memory(projected.values["upperband"], UPPER)
+    np.testing.assert_array_equal(projected.values["upperband"], UPPER[19:])
+
+    tail = project(_bbands(), Projection.from_options(tail=5))
+    np.testing.assert_array_equal(tail.values["lowerband"], LOWER[-5:])
+    assert tail.metadata["offset"] == 195
+
+
+def test_offsets_align_trimmed_and_padded_outputs():
+    trimmed = IndicatorResult(
+        indicator_name="sma",
+        values={"sma": MIDDLE[19:]},
+        metadata={"input_points": 200, "output_points": 181},
+    )
+    window = Projection.from_options(slice="10:30")
+    padded = project(_bbands(), window)
+    cut = project(trimmed, window)
+
+    assert padded.metadata["offset"] == 10 and cut.metadata["offset"] == 19
+    np.testing.assert_array_equal(cut.values["sma"], padded.values["middleband"][9:])
+    assert project(trimmed, Projection.from_options(slice="-3:")).values["sma"].tolist() == MIDDLE[-3:].tolist()
+
+
+def test_invalid_projections_are_rejected():
+    assert parse_slice(":-5") == (None, -5)
+    with pytest.raises(ValueError, match="start:end"):
+        parse_slice("5")
+    with pytest.raises(ValueError, match="not both"):
+        Projection.from_options(tail=5, slice="1:2")
+    with pytest.raises(ValueError, match="unknown outputs"):
+        project(_bbands(), Projection.from_options(["signal"]))
+
+
+def test_http_projection_options(client):
+    body = {"close": CLOSE.tolist(), "timeperiod": 20}
+    tool = client.post("/api/tools/bbands", json={**body, "outputs": ["upperband"], "tail": 50}).json()
+    swept = client.post(
+        "/api/sweep/sma", json={"close": CLOSE.tolist(), "grid": {"timeperiod": [5, 20]}, "drop_lookback": True}
+    ).json()
+
+    assert list(tool["values"]) == ["upperband"] and tool["values"]["upperband"] == UPPER[-50:].tolist()
+    assert tool["metadata"]["offset"] == 150
+    assert len(swept["values"]["sma"][0]) == 181 and swept["metadata"]["offset"] == 19
+    # Projection options never reach the indicator as parameters
+    assert "tail" not in tool["metadata"]
+
+    bad = client.post("/api/tools/bbands", json={**body, "tail": 5, "slice": "1:3"})
+    assert bad.status_code == 422
+    unknown = client.post("/api/tools/bbands", json={**body, "outputs": ["signal"]})
+    assert unknown.status_code == 422 and "upperband" in unknown.json()["detail"]
+
+
+def test_multi_projects_each_spec(client):
+    body = {
+        "close": CLOSE.tolist(),
+        "drop_lookback": True,
+        "indicators": [{"indicator": "bbands", "outputs": ["lowerband"]}, {"indicator": "sma"}],
+    }
+    results = client.post("/api/multi", json=body).json()["results"]
+
+    assert list(results["bbands"]["values"]) == ["lowerband"]
+    assert results["bbands"]["metadata"]["offset"] == results["sma"]["metadata"]["offset"] == 19
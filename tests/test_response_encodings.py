@@ -0,0 +1,106 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_talib import media
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.serialization import MSGPACK_NDARRAY, decode_msgpack, to_builtin
+
+CLOSE = (100 + np.cumsum(np.random.default_rng(16).normal(size=300))).tolist()
+BODY = {"close": CLOSE, "timeperiod": 20}
+
+
+@pytest.fixture
+def client():
+    return TestClient(create_http_api_app())
+
+
+def _read_frames(content):
+    (size,) = struct.unpack("<I", content[:4])
+    header = json.loads(content[4:4 + size])
+    arrays = {
+        column["name"]: np.frombuffer(
+            content, dtype=column["dtype"], count=int(np.prod(column["shape"])), offset=4 + size + column["offset"]
+        ).reshape(column["shape"])
+        for column in header.pop("columns")
+    }
+    return header, arrays
+
+
+def test_negotiate_follows_quality_and_specificity():
+    assert media.negotiate(None) == media.JSON
+    assert media.negotiate("*/*") == media.JSON
+    assert media.negotiate("application/x-msgpack") == media.MSGPACK
+    assert media.negotiate("application/json;q=0.5, application/vnd.apache.arrow.stream") == media.ARROW_STREAM
+    assert media.negotiate("application/*;q=0.2, application/vnd.mcp-talib.frames;q=0.9") == media.FRAMES
+    assert media.negotiate("*/*, application/json;q=0") == media.MSGPACK
+    assert media.negotiate("text/html") is None
+
+
+def test_frames_carry_raw_buffers_and_metadata(client):
+    expected = client.post("/api/tools/bbands", json=BODY).json()
+    response = client.post("/api/tools/bbands", json=BODY, headers={"accept": media.FRAMES})
+    header, arrays = _read_frames(response.content)
+
+    assert response.headers["content-type"] == media.FRAMES
+    assert header == {"success": True, "metadata": expected["metadata"], "error": None}
+    assert list(arrays) == ["upperband", "middleband", "lowerband"]
+    assert np.isnan(arrays["middleband"][:19]).all()
+    assert arrays["middleband"][19:].tolist() == expected["values"]["middleband"][19:]
+
+
+def test_frames_keep_float32_and_report_failures(client):
+    response = client.post("/api/tools/sma", json={**BODY, "precision": "float32"}, headers={"accept": media.FRAMES})
+    _, arrays = _read_frames(response.content)
+    assert arrays["sma"].dtype == np.float32
+
+    failed = client.post("/api/tools/sma", json={**BODY, "timeperiod": 0}, headers={"accept": media.FRAMES})
+    header, arrays = _read_frames(failed.content)
+    assert header["success"] is False and header["error"] and arrays == {}
+
+
+def test_msgpack_matches_json(client):
+    pytest.importorskip("msgpack")
+    accept = {"accept": media.MSGPACK}
+    tool = client.post("/api/tools/bbands", json=BODY, headers=accept)
+    multi_body = {"close": CLOSE, "indicators": [{"indicator": "sma"}, {"indicator": "rsi"}]}
+    multi = client.post("/api/multi", json=multi_body, headers=accept)
+
+    assert to_builtin(decode_msgpack(tool.content)) == client.post("/api/tools/bbands", json=BODY).json()
+    assert to_builtin(decode_msgpack(multi.content)) == client.post("/api/multi", json=multi_body).json()
+
+
+def test_msgpack_packs_output_buffers(client):
+    msgpack = pytest.importorskip("msgpack")
+    body = {**BODY, "precision": "float32"}
+    response = client.post("/api/tools/bbands", json=body, headers={"accept": media.MSGPACK})
+
+    raw = msgpack.unpackb(response.content)["values"]["middleband"]
+    assert isinstance(raw, msgpack.ExtType) and raw.code == MSGPACK_NDARRAY
+    middle = decode_msgpack(response.content)["values"]["middleband"]
+    assert middle.dtype == np.float32 and middle.shape == (len(CLOSE),)
+    assert np.isnan(middle[:19]).all()
+    np.testing.assert_allclose(middle[19:], np.convolve(CLOSE, np.ones(20) / 20, "valid"), rtol=1e-6)
+
+
+def test_arrow_results_and_sweeps(client):
+    pa = pytest.importorskip("pyarrow")
+    tool = client.post("/api/tools/bbands", json=BODY, headers={"accept": media.ARROW_STREAM})
+    table = pa.ipc.open_stream(tool.content).read_all()
+    sweep = client.post(
+        "/api/sweep/sma", json={"close": CLOSE, "grid": {"timeperiod": [5, 10, 20]}}, headers={"accept": media.ARROW_FILE}
+    )
+    grid = pa.ipc.open_file(sweep.content).read_all()
+
+    assert table.column_names == ["upperband", "middleband", "lowerband"] and table.num_rows == 300
+    assert json.loads(table.schema.metadata[b"mcp_talib"])["metadata"]["timeperiod"] == 20
+    assert grid.num_rows == 3 and grid.schema.field("sma").type.list_size == 300
+
+
+def test_unacceptable_types_get_406(client):
+    assert client.post("/api/tools/sma", json=BODY, headers={"accept": "text/html"}).status_code == 406
+    frames_batch = client.post("/api/batch", json={"tool": "sma", "jobs": []}, headers={"accept": media.FRAMES})
+    assert frames_batch.status_code == 406
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_talib.cache import ResultCache, fingerprint
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.indicators import registry
+from mcp_talib.models.indicator_result import IndicatorResult
+from mcp_talib.models.market_data import ColumnarMarketData
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(8).normal(size=200))
+
+
+def _result(n=100):
+    return IndicatorResult(indicator_name="x", values={"x": np.arange(n, dtype=float)}, metadata={"n": n})
+
+
+def test_keys_depend_on_contents_and_canonical_options():
+    cache = ResultCache()
+    base = cache.key("sma", ColumnarMarketData(close=CLOSE), {"timeperiod": 5, "matype": 0})
+
+    assert cache.key("sma", ColumnarMarketData(close=CLOSE.copy()), {"matype": 0, "timeperiod": np.int64(5)}) == base
+    assert cache.key("ema", ColumnarMarketData(close=CLOSE), {"timeperiod": 5, "matype": 0}) != base
+    assert cache.key("sma", ColumnarMarketData(close=CLOSE), {"timeperiod": 6, "matype": 0}) != base
+    changed = CLOSE.copy()
+    changed[-1] += 1e-9
+    assert cache.key("sma", ColumnarMarketData(close=changed), {"timeperiod": 5, "matype": 0}) != base
+    assert cache.key("sma", ColumnarMarketData(high=CLOSE), {"timeperiod": 5, "matype": 0}) != base
+
+
+def test_fingerprint_is_memoized_on_market_data():
+    market_data = ColumnarMarketData(close=CLOSE)
+    digest = fingerprint(market_data)
+    assert market_data._fingerprint == digest
+    assert fingerprint(ColumnarMarketData(close=CLOSE.tolist())) == digest
+
+
+def test_hits_return_isolated_copies_of_frozen_values():
+    cache = ResultCache()
+    result = _result()
+    cache.put(b"k", result)
+
+    hit = cache.get(b"k")
+    hit.metadata["note"] = "changed"
+
+    assert cache.get(b"k").metadata == {"n": 100}
+    assert hit.values["x"] is result.values["x"]
+    assert result.values["x"].flags.writeable is False
+    assert cache.get(b"missing") is None
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResultCache(max_entries=2, max_bytes=10_000)
+    cache.put(b"a", _result())
+    cache.put(b"b", _result())
+    cache.get(b"a")
+    cache.put(b"c", _result())
+
+    assert cache.get(b"b") is None and cache.get(b"a") is not None
+    assert cache.stats()["evictions"] == 1
+
+    cache.put(b"big", _result(n=2000))
+    assert cache.get(b"big") is None
+    cache.put(b"d", _result(n=1100))
+    assert cache.stats()["entries"] == 1 and cache.stats()["bytes"] <= 10_000
+
+
+@pytest.mark.asyncio
+async def test_shared_by_http_and_direct_calls(monkeypatch):
+    calls = []
+    indicator = registry.get_indicator("kama")
+    original = indicator.calculate
+
+    async def counting(market_data, options):
+        calls.append(options)
+        return await original(market_data, options)
+
+    monkeypatch.setattr(indicator, "calculate", counting)
+    client = TestClient(create_http_api_app())
+    before = client.get("/api/cache").json()
+
+    body = {"close": CLOSE.tolist(), "timeperiod": 17}
+    first = client.post("/api/tools/kama", json=body).json()
+    second = client.post("/api/tools/kama", json=body).json()
+
+    assert first == second
+    assert len(calls) == 1
+    stats = client.get("/api/cache").json()
+    assert stats["hits"] == before["hits"] + 1
+    assert stats["misses"] == before["misses"] + 1
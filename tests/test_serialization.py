@@ -0,0 +1,134 @@
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_talib import serialization
+from mcp_talib.config import Settings
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.models.indicator_result import IndicatorResult
+from mcp_talib.serialization import dumps, json_nan, result_to_payload, to_builtin
+
+PAYLOAD = {
+    "values": {"sma": np.array([np.nan, np.nan, 1.25, 2.5]), "grid": np.array([[np.inf, 1.0], [2.0, 3.0]])},
+    "half": np.array([np.nan, 0.1], dtype=np.float32),
+    "ints": np.arange(3),
+    "metadata": {"timeperiod": np.int64(3), "ratio": np.float64("nan"), "name": "sma"},
+}
+
+
+def test_to_builtin_converts_arrays_and_non_finite_values():
+    values = {
+        "a": np.array([np.nan, 1.5, np.inf]),
+        "b": np.array([[1.0, np.nan], [2.0, 3.0]]),
+        "n": np.int64(4),
+        "f": np.float64("nan"),
+    }
+
+    assert to_builtin(values) == {"a": [None, 1.5, None], "b": [[1.0, None], [2.0, 3.0]], "n": 4, "f": None}
+
+
+def test_result_to_payload_is_strict_json():
+    result = IndicatorResult(
+        indicator_name="bbands",
+        values={"upperband": np.array([np.nan, 2.0]), "lowerband": np.array([np.nan, 1.0])},
+        metadata={"timeperiod": 2},
+    )
+
+    payload = result_to_payload(result)
+
+    assert json.loads(json.dumps(payload, allow_nan=False)) == {
+        "success": True,
+        "values": {"upperband": [None, 2.0], "lowerband": [None, 1.0]},
+        "metadata": {"timeperiod": 2},
+        "error": None,
+    }
+
+
+def test_result_to_payload_reports_error_message():
+    result = IndicatorResult(indicator_name="sma", success=False, values={}, error_message="Not enough data points")
+
+    assert result_to_payload(result) == {"success": False, "values": None, "metadata": None, "error": "Not enough data points"}
+
+
+def test_http_api_serializes_ndarray_results():
+    client = TestClient(create_http_api_app())
+
+    r = client.post("/api/tools/bbands", json={"close": [float(x) for x in range(1, 11)], "timeperiod": 3})
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["success"] is True
+    assert data["values"]["upperband"][:2] == [None, None]
+    assert len(data["values"]["middleband"]) == 10
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps_writes_standard_json_with_or_without_orjson(monkeypatch, fast):
+    if fast and serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not fast:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    assert json.loads(dumps(PAYLOAD, nan=None)) == {
+        "values": {"sma": [None, None, 1.25, 2.5], "grid": [[None, 1.0], [2.0, 3.0]]},
+        "half": [None, 0.1],
+        "ints": [0, 1, 2],
+        "metadata": {"timeperiod": 3, "ratio": None, "name": "sma"},
+    }
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps_substitutes_the_nan_sentinel(monkeypatch, fast):
+    if fast and serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not fast:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    assert json.loads(dumps(PAYLOAD, nan="NaN"))["values"]["sma"] == ["NaN", "NaN", 1.25, 2.5]
+    zeroed = json.loads(dumps(PAYLOAD, nan=0))
+    assert zeroed["values"]["grid"] == [[0, 1.0], [2.0, 3.0]] and zeroed["metadata"]["ratio"] == 0
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps_writes_non_string_keys_as_strings(monkeypatch, fast):
+    if fast and serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not fast:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    assert json.loads(dumps({"errors": {1: "bad", 3: "worse"}, "values": {2: np.arange(2)}})) == {
+        "errors": {"1": "bad", "3": "worse"},
+        "values": {"2": [0, 1]},
+    }
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_sweep_with_a_failing_point_serializes(monkeypatch, fast):
+    if fast and serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not fast:
+        monkeypatch.setattr(serialization, "orjson", None)
+    client = TestClient(create_http_api_app())
+
+    close = np.linspace(1.0, 2.0, 300).tolist()
+    r = client.post("/api/sweep/sma", json={"close": close, "grid": {"timeperiod": [5, 400]}})
+
+    assert r.status_code == 200
+    data = r.json()
+    assert "outside" in data["metadata"]["errors"]["1"]
+    assert data["values"]["sma"][1] == [None] * 300
+
+
+def test_json_nan_setting_reaches_http_responses(monkeypatch):
+    monkeypatch.setattr(serialization, "get_settings", lambda: Settings(json_nan='"NaN"'))
+    client = TestClient(create_http_api_app())
+
+    r = client.post("/api/tools/bbands", json={"close": [1.0, 2.0, 3.0], "timeperiod": 2})
+
+    assert r.json()["values"]["middleband"] == ["NaN", 1.5, 2.5]
+
+    monkeypatch.setattr(serialization, "get_settings", lambda: Settings(json_nan="NaN"))
+    with pytest.raises(ValueError, match="MCP_TALIB_JSON_NAN"):
+        json_nan()
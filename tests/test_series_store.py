@@ -0,0 +1,134 @@
+import json
+
+import numpy as np
+import pytest
+import talib as ta
+from fastapi.testclient import TestClient
+
+from mcp_talib.config import Settings
+from mcp_talib.core.mcp_server import create_mcp_server
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.models.market_data import ColumnarMarketData
+from mcp_talib.store import SeriesNotFoundError, SeriesStore
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(4).normal(size=300))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_append_grows_in_place_and_keeps_snapshots():
+    store = SeriesStore()
+    store.put("AAA", ColumnarMarketData(close=CLOSE[:100], high=CLOSE[:100] + 1))
+    before = store.get("AAA")
+
+    for start in range(100, 300, 20):
+        chunk = CLOSE[start:start + 20]
+        info = store.append("AAA", ColumnarMarketData(close=chunk, high=chunk + 1))
+
+    after = store.get("AAA")
+    assert info["length"] == 300 and info["columns"] == ["close", "high"]
+    np.testing.assert_array_equal(after.close, CLOSE)
+    np.testing.assert_array_equal(before.close, CLOSE[:100])
+    assert after.close.base is not None  # a view of the growable buffer
+
+    with pytest.raises(ValueError):
+        store.append("AAA", ColumnarMarketData(close=[1.0]))
+    assert store.info("AAA")["length"] == 300
+
+
+def test_ttl_and_byte_budget():
+    clock = FakeClock()
+    store = SeriesStore(ttl_seconds=10, max_bytes=3 * 800, clock=clock)
+    for name in ("a", "b", "c"):
+        store.put(name, ColumnarMarketData(close=CLOSE[:100]))
+
+    clock.now = 5
+    store.get("a")
+    store.put("d", ColumnarMarketData(close=CLOSE[:100]))
+
+    # "b" was least recently used once the budget was exceeded
+    assert [info["name"] for info in store.list()] == ["c", "a", "d"]
+    assert store.evictions == 1
+
+    clock.now = 12
+    assert [info["name"] for info in store.list()] == ["a", "d"]
+    with pytest.raises(SeriesNotFoundError):
+        store.get("c")
+    with pytest.raises(ValueError):
+        store.put("huge", ColumnarMarketData(close=np.ones(1000)))
+
+
+def test_rejected_writes_keep_the_stored_series():
+    store = SeriesStore(max_bytes=8000)
+    store.put("AAA", ColumnarMarketData(close=np.ones(600)))
+
+    # Spare buffer capacity does not count against the budget
+    assert store.append("AAA", ColumnarMarketData(close=np.ones(10)))["nbytes"] == 4880
+    with pytest.raises(ValueError, match="needs 8080 bytes"):
+        store.append("AAA", ColumnarMarketData(close=np.ones(400)))
+    with pytest.raises(ValueError):
+        store.put("AAA", ColumnarMarketData(close=np.ones(1001)))
+
+    assert [info["name"] for info in store.list()] == ["AAA"]
+    assert store.info("AAA")["length"] == 610
+    np.testing.assert_array_equal(store.get("AAA").close, np.ones(610))
+
+
+def test_settings_from_env():
+    settings = Settings.from_env({"MCP_TALIB_SERIES_TTL_SECONDS": "60", "MCP_TALIB_SERIES_MAX_BYTES": "1024"})
+    assert settings.series_ttl_seconds == 60.0 and settings.series_max_bytes == 1024
+
+    with pytest.raises(ValueError, match="MCP_TALIB_SERIES_MAX_BYTES"):
+        Settings.from_env({"MCP_TALIB_SERIES_MAX_BYTES": "lots"})
+
+
+def test_http_calls_by_handle():
+    client = TestClient(create_http_api_app())
+
+    r = client.put("/api/series/http-sym", json={"close": CLOSE[:250].tolist()})
+    assert r.status_code == 200 and r.json()["length"] == 250
+    r = client.post("/api/series/http-sym/append", json={"close": CLOSE[250:].tolist()})
+    assert r.json()["length"] == 300
+
+    r = client.post("/api/tools/wma", json={"series": "http-sym", "timeperiod": 9})
+    got = np.asarray([np.nan if v is None else v for v in r.json()["values"]["wma"]])
+    np.testing.assert_allclose(got, ta.WMA(CLOSE, timeperiod=9), equal_nan=True)
+
+    r = client.post("/api/multi", json={"series": "http-sym", "indicators": [{"indicator": "sma"}, {"indicator": "rsi"}]})
+    assert r.json()["success"] is True
+
+    r = client.post("/api/batch", json={"tool": "ema", "jobs": [{"symbol": "X", "series": "http-sym"}, {"symbol": "Y", "series": "missing"}]})
+    assert [res["success"] for res in r.json()["results"]] == [True, False]
+
+    assert "http-sym" in [info["name"] for info in client.get("/api/series").json()["series"]]
+    assert client.post("/api/tools/sma", json={"series": "missing"}).status_code == 404
+    assert client.post("/api/tools/sma", json={"timeperiod": 3}).status_code == 422
+    assert client.post("/api/tools/sma", json={"series": "http-sym", "close": [1.0]}).status_code == 422
+    assert client.delete("/api/series/http-sym").status_code == 200
+    assert client.get("/api/series/http-sym").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_mcp_tools_and_resource_by_handle():
+    mcp = create_mcp_server()
+
+    stored = await mcp.call_tool("store_series", {"name": "mcp-sym", "close": CLOSE.tolist()})
+    assert json.loads(stored[0].text)["series"]["length"] == 300
+
+    result = await mcp.call_tool("calculate_tema", {"series": "mcp-sym", "timeperiod": 10})
+    payload = json.loads(result[0].text)
+    got = np.asarray([np.nan if v is None else v for v in payload["values"]["tema"]])
+    np.testing.assert_allclose(got, ta.TEMA(CLOSE, timeperiod=10), equal_nan=True)
+
+    contents = await mcp.read_resource("series://mcp-sym")
+    resource = json.loads(contents[0].content)
+    assert resource["data"]["close"] == CLOSE.tolist()
+
+    deleted = await mcp.call_tool("delete_series", {"name": "mcp-sym"})
+    assert json.loads(deleted[0].text)["success"] is True
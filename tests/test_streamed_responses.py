@@ -0,0 +1,79 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+import talib as ta
+from fastapi.testclient import TestClient
+
+from mcp_talib import media
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.models.indicator_result import IndicatorResult
+from mcp_talib.serialization import iter_frame_stream, iter_ndjson
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(19).normal(size=10_000))
+UPPER, MIDDLE, LOWER = ta.BBANDS(CLOSE, timeperiod=20)
+
+
+def _result():
+    return IndicatorResult(
+        indicator_name="bbands",
+        values={"upperband": UPPER, "middleband": MIDDLE, "lowerband": LOWER},
+        metadata={"timeperiod": 20, "input_points": len(CLOSE)},
+    )
+
+
+def _read_frames(content):
+    frames, position = [], 0
+    while position < len(content):
+        (size,) = struct.unpack("<I", content[position:position + 4])
+        frames.append(content[position + 4:position + 4 + size])
+        position += 4 + size
+    return frames
+
+
+def test_ndjson_yields_the_header_before_serializing_chunks():
+    stream = iter_ndjson(_result(), chunk_points=4096)
+    header = json.loads(next(stream))
+    chunks = [json.loads(line) for line in stream]
+
+    assert header["columns"] == ["upperband", "middleband", "lowerband"]
+    assert header["metadata"]["timeperiod"] == 20
+    assert [chunk["start"] for chunk in chunks] == [0, 4096, 8192]
+    middle = [value for chunk in chunks for value in chunk["values"]["middleband"]]
+    assert middle[:19] == [None] * 19 and middle[19:] == MIDDLE[19:].tolist()
+
+
+def test_frame_stream_chunks_carry_raw_buffers():
+    header, *frames = _read_frames(b"".join(iter_frame_stream(_result(), chunk_points=3000)))
+    columns = json.loads(header)["columns"]
+
+    assert [len(frame) for frame in frames] == [3 * 8 * 3000] * 3 + [3 * 8 * 1000]
+    decoded = [np.frombuffer(frame).reshape(len(columns), -1) for frame in frames]
+    np.testing.assert_array_equal(np.hstack(decoded)[2], LOWER)
+
+
+def test_http_streams_tool_and_sweep_results():
+    client = TestClient(create_http_api_app())
+    with client.stream(
+        "POST", "/api/tools/bbands", json={"close": CLOSE.tolist(), "timeperiod": 20}, headers={"accept": media.NDJSON}
+    ) as response:
+        lines = [json.loads(line) for line in response.iter_lines()]
+    sweep = client.post(
+        "/api/sweep/sma",
+        json={"close": CLOSE[:500].tolist(), "grid": {"timeperiod": [5, 10]}},
+        headers={"accept": media.FRAME_STREAM},
+    )
+
+    assert response.headers["content-type"] == media.NDJSON
+    assert lines[0]["success"] and sum(len(line["values"]["upperband"]) for line in lines[1:]) == len(CLOSE)
+    header, *frames = _read_frames(sweep.content)
+    assert json.loads(header)["columns"][0]["shape"] == [2, 500]
+    np.testing.assert_allclose(np.frombuffer(frames[0]).reshape(2, 500)[1], ta.SMA(CLOSE[:500], timeperiod=10))
+
+
+@pytest.mark.parametrize("stream", [iter_ndjson, iter_frame_stream])
+def test_failed_results_stream_only_a_header(stream):
+    failed = IndicatorResult(indicator_name="sma", success=False, values={}, error_message="boom")
+    (header,) = list(stream(failed, chunk_points=10))
+    assert b'"error":"boom"' in header
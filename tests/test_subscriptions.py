@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+import talib as ta
+from fastapi.testclient import TestClient
+
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.models.market_data import ColumnarMarketData
+from mcp_talib.store import SeriesNotFoundError, get_series_store
+from mcp_talib.subscriptions import MAX_PENDING, SubscriptionHub, get_subscription_hub
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(20).normal(size=400))
+
+
+@pytest.fixture
+def live():
+    get_series_store().put("LIVE", ColumnarMarketData(close=CLOSE[:300]))
+    yield "LIVE"
+    get_series_store().delete("LIVE")
+
+
+async def test_hub_advances_states_with_appended_bars(live):
+    hub = SubscriptionHub()
+    ema = hub.subscribe(live, "ema", {"timeperiod": 10})
+    rsi = hub.subscribe(live, "rsi", {"timeperiod": 14})
+
+    get_series_store().append(live, ColumnarMarketData(close=CLOSE[300:310]))
+    hub.publish(live, ColumnarMarketData(close=CLOSE[300:310]))
+
+    message = await ema.next_message()
+    assert message["type"] == "values" and message["start"] == 300
+    np.testing.assert_allclose(message["values"]["ema"], ta.EMA(CLOSE[:310], timeperiod=10)[300:])
+    np.testing.assert_allclose((await rsi.next_message())["values"]["rsi"], ta.RSI(CLOSE[:310])[300:])
+
+    hub.unsubscribe(ema)
+    assert hub.count() == 1
+    with pytest.raises(SeriesNotFoundError):
+        hub.subscribe("missing", "ema")
+    with pytest.raises(ValueError, match="no streaming state"):
+        hub.subscribe(live, "kama")
+
+
+async def test_replacing_the_series_resets_and_slow_subscribers_close(live):
+    hub = SubscriptionHub()
+    subscription = hub.subscribe(live, "sma", {"timeperiod": 5})
+
+    get_series_store().put(live, ColumnarMarketData(close=CLOSE[:50]))
+    hub.reset(live)
+    reset = await subscription.next_message()
+    assert reset["type"] == "reset" and reset["length"] == 50
+
+    for _ in range(MAX_PENDING + 1):
+        hub.publish(live, ColumnarMarketData(close=CLOSE[:1]))
+    assert subscription.closed
+    assert (await subscription.next_message())["type"] == "values"
+
+
+def test_websocket_pushes_bars_and_receives_new_values(live):
+    client = TestClient(create_http_api_app())
+    with client.websocket_connect(f"/api/series/{live}/stream?indicator=ema&timeperiod=10") as socket:
+        subscribed = socket.receive_json()
+        socket.send_text(json.dumps({"close": CLOSE[300:305].tolist()}))
+        pushed = socket.receive_json()
+        client.post(f"/api/series/{live}/append", json={"close": CLOSE[305:307].tolist()})
+        appended = socket.receive_json()
+        socket.send_text(json.dumps({"high": [1.0]}))
+        error = socket.receive_json()
+
+    assert subscribed["type"] == "subscribed" and subscribed["length"] == 300
+    assert pushed["start"] == 300 and appended["start"] == 305
+    np.testing.assert_allclose(pushed["values"]["ema"] + appended["values"]["ema"], ta.EMA(CLOSE[:307], 10)[300:])
+    assert error["type"] == "error" and "columns" in error["error"]
+    assert get_series_store().info(live)["length"] == 307
+
+    with client.websocket_connect("/api/series/missing/stream?indicator=ema") as socket:
+        assert socket.receive_json() == {"type": "error", "error": "series 'missing' not found"}
+
+
+async def test_server_sent_events_follow_appends(live):
+    app = create_http_api_app()
+    sent: asyncio.Queue = asyncio.Queue()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"/api/series/{live}/stream",
+        "raw_path": f"/api/series/{live}/stream".encode(),
+        "query_string": b"indicator=sma&timeperiod=3",
+        "root_path": "",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def next_event():
+        while True:
+            message = await asyncio.wait_for(sent.get(), 5)
+            if message.get("body"):
+                return message["body"].decode()
+
+    task = asyncio.create_task(app(scope, receive, sent.put))
+    try:
+        subscribed = await next_event()
+        get_series_store().append(live, ColumnarMarketData(close=CLOSE[300:302]))
+        get_subscription_hub().publish(live, ColumnarMarketData(close=CLOSE[300:302]))
+        values = await next_event()
+    finally:
+        task.cancel()
+
+    assert subscribed.startswith("event: subscribed\n")
+    event, data = values.split("\n")[:2]
+    assert event == "event: values"
+    np.testing.assert_allclose(json.loads(data[len("data: "):])["values"]["sma"], ta.SMA(CLOSE[:302], 3)[300:])
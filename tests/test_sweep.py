@@ -0,0 +1,133 @@
+import json
+
+import numpy as np
+import pytest
+import talib as ta
+from fastapi.testclient import TestClient
+from numpy.lib.stride_tricks import sliding_window_view
+
+from mcp_talib.core.mcp_server import create_mcp_server
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.metrics import get_metrics
+from mcp_talib.models.market_data import ColumnarMarketData
+from mcp_talib.sweep import expand_grid, expand_range, run_sweep
+
+CLOSE = 1e4 + np.cumsum(np.random.default_rng(21).normal(size=800))
+
+
+def test_expand_range_and_grid():
+    assert expand_range({"start": 5, "stop": 9, "step": 2}) == [5, 7, 9]
+    assert expand_range({"start": 1.0, "stop": 2.0, "step": 0.5}) == [1.0, 1.5, 2.0]
+    assert expand_range([3, 1]) == [3, 1]
+
+    axes, points = expand_grid({"timeperiod": [5, 10], "nbdevup": [1.0, 2.0]})
+    assert axes == {"timeperiod": [5, 10], "nbdevup": [1.0, 2.0]}
+    assert points[:2] == [{"timeperiod": 5, "nbdevup": 1.0}, {"timeperiod": 5, "nbdevup": 2.0}]
+
+    with pytest.raises(ValueError):
+        expand_range({"start": 1, "stop": 5, "step": 0})
+    with pytest.raises(ValueError):
+        expand_grid({"timeperiod": {"start": 1, "stop": 20_000}})
+
+
+@pytest.mark.asyncio
+async def test_sma_sweep_shares_prefix_sums_and_matches_talib():
+    result = await run_sweep("sma", ColumnarMarketData(close=CLOSE), {"timeperiod": {"start": 5, "stop": 200}})
+
+    matrix = result.values["sma"]
+    assert matrix.shape == (196, len(CLOSE))
+    assert result.metadata["shared_computation"] is True
+    for row in (0, 95, 195):
+        period = result.metadata["points"][row]["timeperiod"]
+        np.testing.assert_allclose(matrix[row], ta.SMA(CLOSE, period), rtol=1e-12, equal_nan=True)
+
+
+@pytest.mark.asyncio
+async def test_bbands_sweep_reuses_moments_across_deviations():
+    grid = {"timeperiod": [10, 20], "nbdevup": [1.0, 2.5], "nbdevdn": [2.0]}
+    result = await run_sweep("bbands", ColumnarMarketData(close=CLOSE), grid)
+
+    assert result.values["upperband"].shape == (4, len(CLOSE))
+    assert result.metadata["shared_computation"] is True
+    for row, point in enumerate(result.metadata["points"]):
+        period = point["timeperiod"]
+        upper, middle, lower = ta.BBANDS(CLOSE, period, point["nbdevup"], point["nbdevdn"])
+        np.testing.assert_allclose(result.values["middleband"][row], middle, rtol=1e-12, equal_nan=True)
+        # TA-Lib's running variance loses precision on prices far from zero
+        np.testing.assert_allclose(result.values["upperband"][row], upper, rtol=1e-8, equal_nan=True)
+        np.testing.assert_allclose(result.values["lowerband"][row], lower, rtol=1e-8, equal_nan=True)
+        exact = sliding_window_view(CLOSE, period).std(axis=1)
+        deviation = (result.values["upperband"][row] - result.values["middleband"][row])[period - 1:] / point["nbdevup"]
+        np.testing.assert_allclose(deviation, exact, rtol=1e-9)
+
+
+@pytest.mark.asyncio
+async def test_generic_sweep_aligns_trimmed_outputs_and_records_errors():
+    result = await run_sweep("ema", ColumnarMarketData(close=CLOSE), {"timeperiod": [5, 30, 5000]})
+
+    matrix = result.values["ema"]
+    assert matrix.shape == (3, len(CLOSE))
+    assert result.metadata["shared_computation"] is False
+    np.testing.assert_allclose(matrix[1], ta.EMA(CLOSE, 30), equal_nan=True)
+    assert np.isnan(matrix[2]).all()
+    assert "Not enough data" in result.metadata["errors"]["2"]
+
+
+@pytest.mark.asyncio
+async def test_sweeps_are_timed_and_recorded_per_grid_point():
+    def counts(indicator):
+        samples = dict(line.rsplit(" ", 1) for line in get_metrics().render().splitlines() if not line.startswith("#"))
+        return [
+            int(samples.get(f'mcp_talib_{name}_count{{indicator="{indicator}"}}', 0))
+            for name in ("calculation_seconds", "output_points")
+        ]
+
+    before = counts("sma")
+    shared = await run_sweep("sma", ColumnarMarketData(close=CLOSE), {"timeperiod": [5, 10, 5000]})
+    generic = await run_sweep("wma", ColumnarMarketData(close=CLOSE * 1.5), {"timeperiod": [5, 10]})
+
+    assert shared.calculation_time > 0 and generic.calculation_time > 0
+    # The out-of-range point is reported as an error, not as a calculation
+    assert counts("sma") == [count + 2 for count in before]
+
+
+def test_sweep_http_endpoint():
+    client = TestClient(create_http_api_app())
+
+    r = client.post("/api/sweep/wma", json={"close": CLOSE[:100].tolist(), "grid": {"timeperiod": {"start": 5, "stop": 8}}})
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["success"] is True
+    assert len(data["values"]["wma"]) == 4
+    assert data["metadata"]["grid"] == {"timeperiod": [5, 6, 7, 8]}
+
+    assert client.post("/api/sweep/nope", json={"close": [1.0], "grid": {"timeperiod": [2]}}).status_code == 404
+    assert client.post("/api/sweep/sma", json={"close": [1.0], "grid": {}}).status_code == 422
+
+
+def test_sweep_http_range_keeps_integer_periods():
+    client = TestClient(create_http_api_app())
+
+    r = client.post("/api/sweep/ema", json={"close": CLOSE[:100].tolist(), "grid": {"timeperiod": {"start": 5, "stop": 8}}})
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["metadata"]["grid"] == {"timeperiod": [5, 6, 7, 8]}
+    assert all(type(period) is int for period in data["metadata"]["grid"]["timeperiod"])
+    assert data["metadata"]["errors"] == {}
+    np.testing.assert_allclose(np.array(data["values"]["ema"][3], dtype=float), ta.EMA(CLOSE[:100], 8), equal_nan=True)
+
+
+@pytest.mark.asyncio
+async def test_sweep_mcp_tool():
+    mcp = create_mcp_server()
+
+    result = await mcp.call_tool(
+        "sweep_indicator",
+        {"indicator": "sma", "grid": {"timeperiod": [2, 3]}, "close": [1.0, 2.0, 3.0, 4.0]},
+    )
+
+    payload = json.loads(result[0].text)
+    assert payload["success"] is True
+    assert payload["values"]["sma"] == [[None, 1.5, 2.5, 3.5], [None, None, 2.0, 3.0]]
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from mcp_talib.synthetic import BAR_SECONDS, columns_payload, generate_ohlcv
+
+
+def test_same_seed_gives_same_series():
+    first, again, other = generate_ohlcv(1000, seed=3), generate_ohlcv(1000, seed=3), generate_ohlcv(1000, seed=4)
+
+    np.testing.assert_array_equal(first.close, again.close)
+    np.testing.assert_array_equal(first.volume, again.volume)
+    assert not np.array_equal(first.close, other.close)
+
+
+def test_bars_are_consistent():
+    bars = generate_ohlcv(5000, seed=1)
+
+    assert bars.close.shape == (5000,)
+    np.testing.assert_array_equal(bars.open[1:], bars.close[:-1])
+    assert (bars.high >= np.maximum(bars.open, bars.close)).all()
+    assert (bars.low <= np.minimum(bars.open, bars.close)).all()
+    assert (bars.low > 0).all() and (bars.volume > 0).all()
+    assert (np.diff(bars.timestamp) == BAR_SECONDS).all()
+
+
+def test_columns_payload_is_json_ready():
+    bars = generate_ohlcv(10)
+
+    payload = columns_payload(bars, ["high", "low"])
+    assert list(payload) == ["high", "low"] and payload["high"] == bars.high.tolist()
+    with pytest.raises(ValueError, match="at least 1"):
+        generate_ohlcv(0)
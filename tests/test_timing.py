@@ -0,0 +1,83 @@
+import json
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from mcp_talib import timing
+from mcp_talib.config import Settings
+from mcp_talib.core import mcp_server
+from mcp_talib.core.mcp_server import create_mcp_server
+from mcp_talib.http_api_server import create_http_api_app
+from mcp_talib.timing import TraceWriter, current_timings, iter_spanned, mark, span, timed
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(24).normal(size=5000))
+
+
+def _stages(header):
+    return [entry.split(";")[0] for entry in header.split(", ")]
+
+
+def test_spans_record_only_inside_timed_blocks():
+    with span("parse"):
+        pass
+    assert current_timings() is None
+
+    with timed("test", "sma") as timings:
+        mark("parse")
+        with span("calculate"):
+            pass
+        chunks = list(iter_spanned(iter([b"a", b"b"]), "encode"))
+        with timed("nested") as inner:
+            with span("calculate"):
+                pass
+
+    assert inner is timings and chunks == [b"a", b"b"]
+    assert list(timings.durations()) == ["parse", "calculate", "encode"]
+    assert _stages(timings.server_timing()) == ["parse", "calculate", "encode", "total"]
+    assert timings.total_ms >= sum(timings.durations().values())
+    assert current_timings() is None
+
+
+def test_http_responses_carry_server_timing_and_trace_lines(tmp_path, monkeypatch):
+    trace = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(timing, "get_settings", lambda: Settings(trace_file=str(trace)))
+    client = TestClient(create_http_api_app())
+
+    response = client.post("/api/tools/kama", json={"close": CLOSE.tolist(), "timeperiod": 10})
+    streamed = client.post("/api/tools/kama", json={"close": CLOSE.tolist()}, headers={"Accept": "application/x-ndjson"})
+    missing = client.post("/api/tools/kama", json={"series": "no-such-series"})
+    timing.get_trace_writer().flush()
+
+    assert _stages(response.headers["server-timing"]) == ["read", "parse", "convert", "calculate", "project", "encode", "total"]
+    assert "server-timing" in missing.headers and streamed.status_code == 200
+    lines = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert [(line["transport"], line["tool"]) for line in lines] == [("http", "kama")] * 3
+    assert lines[0]["spans"]["calculate"] > 0 and lines[0]["total_ms"] >= lines[0]["spans"]["calculate"]
+    # Streamed chunks are encoded after the header is sent
+    assert lines[1]["spans"]["encode"] > 0
+
+
+def test_trace_writer_switches_files_and_survives_write_errors(tmp_path):
+    writer = TraceWriter()
+    first, second = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+
+    for index in range(3):
+        writer.write(str(first), {"index": index})
+    writer.write(str(second), {"index": 3})
+    writer.write(str(tmp_path / "missing" / "c.jsonl"), {"index": 4})
+    writer.write(str(second), {"index": 5})
+    writer.flush()
+
+    assert [json.loads(line)["index"] for line in first.read_text().splitlines()] == [0, 1, 2]
+    assert [json.loads(line)["index"] for line in second.read_text().splitlines()] == [3, 5]
+
+
+async def test_mcp_results_carry_timing_metadata_when_enabled(monkeypatch):
+    mcp = create_mcp_server()
+    plain = json.loads((await mcp.call_tool("calculate_kama", {"close": CLOSE.tolist()}))[0].text)
+    monkeypatch.setattr(mcp_server, "get_settings", lambda: Settings(timing_metadata=True))
+    timed_result = json.loads((await mcp.call_tool("calculate_kama", {"close": CLOSE.tolist()}))[0].text)
+
+    assert "timing" not in plain["metadata"]
+    assert list(timed_result["metadata"]["timing"]) == ["convert", "calculate", "project"]
+    assert timed_result["values"] == plain["values"]
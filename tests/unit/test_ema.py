@@ -1,6 +1,8 @@
 import asyncio
 import json
+import numpy as np
 import pytest
+import talib as ta
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
@@ -48,5 +50,50 @@ async def test_ema():
             assert metadata.get("timeperiod") == 10
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timeperiod", [2, 10, 30])
+async def test_ema_matches_talib(timeperiod):
+    from mcp_talib.indicators import registry
+    from mcp_talib.models.market_data import MarketData
+
+    rng = np.random.default_rng(3)
+    close = (50 + np.cumsum(rng.normal(size=400))).tolist()
+    expected = ta.EMA(np.asarray(close, dtype=float), timeperiod=timeperiod)
+
+    result = await registry.get_indicator("ema").calculate(MarketData(close=close), {"timeperiod": timeperiod})
+
+    assert result.success is True
+    values = result.values["ema"]
+    assert len(values) == len(close) - timeperiod + 1
+    # Same C routine as talib.EMA; the tolerance only absorbs list round-trips
+    np.testing.assert_allclose(np.asarray(values, dtype=float), expected[timeperiod - 1:], rtol=1e-12, atol=0)
+
+
+
+@pytest.mark.asyncio
+async def test_ema_period_one_returns_the_input():
+    from mcp_talib.indicators import registry
+    from mcp_talib.models.market_data import MarketData
+
+    close = [10.0, 12.0, 11.0, 13.0]
+    result = await registry.get_indicator("ema").calculate(MarketData(close=close), {"timeperiod": 1})
+
+    assert result.success is True
+    np.testing.assert_array_equal(result.values["ema"], close)
+    assert result.metadata["output_points"] == len(close)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timeperiod", [0, -1])
+async def test_ema_rejects_non_positive_timeperiod(timeperiod):
+    from mcp_talib.indicators import registry
+    from mcp_talib.models.market_data import MarketData
+
+    result = await registry.get_indicator("ema").calculate(MarketData(close=[1.0, 2.0, 3.0]), {"timeperiod": timeperiod})
+
+    assert result.success is False
+    assert "timeperiod" in result.error_message
+
+
 if __name__ == "__main__":
     asyncio.run(test_ema())
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from mcp_talib.indicators import registry
+from mcp_talib.models.market_data import ColumnarMarketData, MarketData, as_float_array
+
+
+def test_columnar_keeps_float64_buffer_without_copy():
+    close = np.linspace(1.0, 2.0, 1000)
+    market_data = ColumnarMarketData(close=close)
+
+    assert market_data.close is close
+    assert market_data.length == 1000
+    assert as_float_array(market_data.close) is close
+
+
+def test_columnar_converts_lists_to_contiguous_float64():
+    market_data = ColumnarMarketData(close=[1, 2, 3], high=[2, 3, 4], low=[0, 1, 2])
+
+    for column in (market_data.close, market_data.high, market_data.low):
+        assert column.dtype == np.float64
+        assert column.flags.c_contiguous
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"close": []},
+        {"close": [1.0, float("nan"), 3.0]},
+        {"close": [1.0, float("inf")]},
+        {"close": [[1.0, 2.0]]},
+        {"close": [1.0, 2.0], "volume": [1.0]},
+        {"high": [1.0, 2.0], "low": [1.0]},
+        {"volume": [1.0, 2.0]},
+    ],
+)
+def test_columnar_rejects_invalid_columns(kwargs):
+    with pytest.raises(ValidationError):
+        ColumnarMarketData(**kwargs)
+
+
+def test_columnar_accepts_high_low_only():
+    market_data = ColumnarMarketData(high=[2.0, 3.0, 4.0], low=[1.0, 2.0, 3.0])
+    assert market_data.close is None
+    assert market_data.length == 3
+
+
+def test_from_market_data_round_trip():
+    market_data = MarketData(close=[1.0, 2.0, 3.0], volume=[10.0, 11.0, 12.0])
+    columnar = ColumnarMarketData.from_market_data(market_data)
+    np.testing.assert_array_equal(columnar.close, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(columnar.volume, [10.0, 11.0, 12.0])
+
+
+@pytest.mark.asyncio
+async def test_indicators_accept_both_market_data_models():
+    close = [float(x) for x in range(1, 41)]
+    high = [c + 1 for c in close]
+    low = [c - 1 for c in close]
+
+    for name in registry.list_indicators():
+        indicator = registry.get_indicator(name)
+        from_lists = await indicator.calculate(MarketData(close=close, high=high, low=low), {"timeperiod": 5})
+        from_arrays = await indicator.calculate(ColumnarMarketData(close=close, high=high, low=low), {"timeperiod": 5})
+
+        assert from_lists.success == from_arrays.success, name
+        assert from_lists.values.keys() == from_arrays.values.keys(), name
+        for key in from_lists.values:
+            np.testing.assert_array_equal(from_lists.values[key], from_arrays.values[key], err_msg=name)
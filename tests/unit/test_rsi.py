@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+import talib as ta
+
+from mcp_talib.indicators import registry
+from mcp_talib.models.market_data import MarketData
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timeperiod", [2, 14, 30])
+async def test_rsi_matches_talib(timeperiod):
+    rng = np.random.default_rng(5)
+    close = (100 + np.cumsum(rng.normal(size=400))).tolist()
+    expected = ta.RSI(np.asarray(close, dtype=float), timeperiod=timeperiod)
+
+    result = await registry.get_indicator("rsi").calculate(MarketData(close=close), {"timeperiod": timeperiod})
+
+    assert result.success is True
+    values = np.asarray(result.values["rsi"], dtype=float)
+    assert len(values) == len(close) - timeperiod
+    assert result.metadata["output_points"] == len(values)
+    np.testing.assert_allclose(values, expected[timeperiod:], rtol=1e-12, atol=0)
+    assert values.min() >= 0 and values.max() <= 100
+
+
+@pytest.mark.asyncio
+async def test_rsi_flat_and_monotonic_series_match_talib():
+    indicator = registry.get_indicator("rsi")
+
+    rising = await indicator.calculate(MarketData(close=[float(x) for x in range(1, 40)]), {"timeperiod": 14})
+    assert rising.success is True
+    np.testing.assert_allclose(rising.values["rsi"], 100.0)
+
+    # A flat series has no gains or losses; TA-Lib reports 0 (the old loop
+    # treated it as all gains and reported 100)
+    flat = await indicator.calculate(MarketData(close=[5.0] * 30), {"timeperiod": 14})
+    assert flat.success is True
+    np.testing.assert_array_equal(flat.values["rsi"], 0.0)
+    np.testing.assert_array_equal(flat.values["rsi"], ta.RSI(np.full(30, 5.0), timeperiod=14)[14:])
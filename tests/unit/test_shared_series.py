@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+import talib as ta
+
+from mcp_talib.execution import run_indicator_set
+from mcp_talib.indicators import registry, shared
+from mcp_talib.models.market_data import ColumnarMarketData, MarketData
+
+CLOSE = 100 + np.cumsum(np.random.default_rng(12).normal(size=600))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("matype", range(9))
+async def test_ma_and_bbands_match_talib(matype):
+    market_data = MarketData(close=CLOSE.tolist())
+
+    ma = await registry.get_indicator("ma").calculate(market_data, {"timeperiod": 12, "matype": matype})
+    bands = await registry.get_indicator("bbands").calculate(
+        market_data, {"timeperiod": 12, "nbdevup": 2.5, "nbdevdn": 1.5, "matype": matype}
+    )
+
+    np.testing.assert_array_equal(ma.values["ma"], ta.MA(CLOSE, 12, matype))
+    for got, expected in zip(
+        (bands.values["upperband"], bands.values["middleband"], bands.values["lowerband"]),
+        ta.BBANDS(CLOSE, 12, 2.5, 1.5, matype),
+    ):
+        np.testing.assert_array_equal(got, expected)
+
+
+@pytest.mark.parametrize("matype", range(9))
+def test_shared_bbands_decomposition_matches_talib(matype):
+    with shared.shared_scope():
+        bands = shared.bbands(CLOSE, 7, 1.0, 2.0, matype)
+
+    for got, expected in zip(bands, ta.BBANDS(CLOSE, 7, 1.0, 2.0, matype)):
+        np.testing.assert_array_equal(got, expected)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timeperiod", [2, 5, 30])
+async def test_nested_ema_indicators_match_talib(timeperiod):
+    market_data = MarketData(close=CLOSE.tolist())
+
+    dema = await registry.get_indicator("dema").calculate(market_data, {"timeperiod": timeperiod})
+    tema = await registry.get_indicator("tema").calculate(market_data, {"timeperiod": timeperiod})
+    t3 = await registry.get_indicator("t3").calculate(market_data, {"timeperiod": timeperiod, "vfactor": 0.6})
+
+    np.testing.assert_array_equal(dema.values["dema"], ta.DEMA(CLOSE, timeperiod))
+    np.testing.assert_array_equal(tema.values["tema"], ta.TEMA(CLOSE, timeperiod))
+    np.testing.assert_array_equal(t3.values["t3"], ta.T3(CLOSE, timeperiod, 0.6))
+
+
+@pytest.mark.asyncio
+async def test_bad_parameters_still_fail():
+    market_data = MarketData(close=CLOSE.tolist())
+    assert (await registry.get_indicator("dema").calculate(market_data, {"timeperiod": 1})).success is False
+    assert (await registry.get_indicator("t3").calculate(market_data, {"vfactor": 2.0})).success is False
+
+
+@pytest.mark.asyncio
+async def test_multi_request_computes_each_ema_layer_once(monkeypatch):
+    calls = []
+    original = shared.ta.EMA
+
+    def counting_ema(values, timeperiod):
+        calls.append(timeperiod)
+        return original(values, timeperiod=timeperiod)
+
+    monkeypatch.setattr(shared.ta, "EMA", counting_ema)
+    close = CLOSE + 0.123  # distinct input, so nothing comes from the result cache
+    specs = [
+        ("ema", "ema", {"timeperiod": 9}),
+        ("dema", "dema", {"timeperiod": 9}),
+        ("tema", "tema", {"timeperiod": 9}),
+        ("t3", "t3", {"timeperiod": 9}),
+        ("ma", "ma", {"timeperiod": 9, "matype": 4}),
+        ("bbands", "bbands", {"timeperiod": 9, "matype": 1}),
+    ]
+
+    results = await run_indicator_set(ColumnarMarketData(close=close), specs)
+
+    assert all(result.success for result in results.values())
+    # EMA, EMA(EMA) and EMA(EMA(EMA)); T3 runs its own fused kernel
+    assert calls == [9] * 3
+    np.testing.assert_array_equal(results["ma"].values["ma"], ta.TEMA(close, 9))
+    np.testing.assert_array_equal(results["bbands"].values["upperband"], ta.BBANDS(close, 9, 2.0, 2.0, 1)[0])
+
+    # Without a shared scope each indicator computes its own layers
+    calls.clear()
+    await registry.get_indicator("dema").calculate(ColumnarMarketData(close=close), {"timeperiod": 9})
+    await registry.get_indicator("tema").calculate(ColumnarMarketData(close=close), {"timeperiod": 9})
+    assert calls == [9] * 5
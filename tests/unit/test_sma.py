@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+import pytest
+import talib as ta
+
+from mcp_talib.indicators import registry
+from mcp_talib.indicators.kernels import PrefixSums, compensated_cumsum, rolling_mean, rolling_sum
+from mcp_talib.models.market_data import MarketData
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timeperiod", [2, 3, 10, 30])
+async def test_sma_matches_talib(timeperiod):
+    rng = np.random.default_rng(7)
+    close = (100 + np.cumsum(rng.normal(size=500))).tolist()
+
+    expected = ta.SMA(np.asarray(close, dtype=float), timeperiod=timeperiod)
+
+    result = await registry.get_indicator("sma").calculate(MarketData(close=close), {"timeperiod": timeperiod})
+
+    assert result.success is True
+    values = result.values["sma"]
+    # SMA keeps its trimmed output: one value per full window
+    assert len(values) == len(close) - timeperiod + 1
+    assert result.metadata["output_points"] == len(values)
+    np.testing.assert_allclose(np.asarray(values, dtype=float), expected[timeperiod - 1:], rtol=1e-10, atol=1e-10)
+
+
+@pytest.mark.asyncio
+async def test_sma_rejects_non_positive_timeperiod():
+    result = await registry.get_indicator("sma").calculate(MarketData(close=[1.0, 2.0, 3.0]), {"timeperiod": 0})
+    assert result.success is False
+    assert "timeperiod" in result.error_message
+
+
+def test_rolling_sum_is_compensated_on_long_series():
+    rng = np.random.default_rng(11)
+    values = 1e4 + np.cumsum(rng.normal(size=200_000))
+    window = 200
+
+    sums = rolling_sum(values, window)
+
+    for i in (0, 1234, len(sums) - 1):
+        assert sums[i] == pytest.approx(math.fsum(values[i:i + window]), rel=1e-15, abs=1e-9)
+
+
+def test_rolling_mean_short_input_is_empty():
+    assert rolling_mean(np.array([1.0, 2.0]), 3).shape == (0,)
+
+
+def test_empty_input_has_empty_prefix_sums():
+    high, low = compensated_cumsum(np.empty(0))
+    assert high.shape == low.shape == (0,)
+    assert PrefixSums(np.empty(0)).window_sums(1).shape == (0,)
+
+
+def test_rolling_sum_confines_non_finite_values_to_their_windows():
+    values = 1e4 + np.arange(50.0)
+    values[20] = np.nan
+    values[40] = np.inf
+    window = 5
+
+    sums = rolling_sum(values, window)
+
+    direct = np.array([values[i:i + window].sum() for i in range(len(sums))])
+    np.testing.assert_array_equal(np.isnan(sums), np.isnan(direct))
+    np.testing.assert_allclose(sums, direct, rtol=1e-15)
+    assert np.isnan(sums[16:21]).all() and np.isinf(sums[36:41]).all()
+    assert np.isfinite(sums[21:36]).all() and np.isfinite(sums[41:]).all()
+
+
+@pytest.mark.asyncio
+async def test_sma_nan_only_affects_windows_containing_it():
+    close = [float(x) for x in range(100, 130)]
+    close[10] = float("nan")
+
+    result = await registry.get_indicator("sma").calculate(MarketData(close=close), {"timeperiod": 3})
+
+    # Like the per-window loop SMA used to run; talib.SMA's running sum
+    # would turn every later window into NaN
+    expected = [sum(close[i:i + 3]) / 3 for i in range(len(close) - 2)]
+    np.testing.assert_allclose(result.values["sma"], expected, equal_nan=True)
+    assert np.isnan(result.values["sma"]).sum() == 3
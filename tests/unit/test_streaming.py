@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+import talib as ta
+
+from mcp_talib.indicators import registry
+from mcp_talib.indicators.streaming import SMAState, create_state
+from mcp_talib.models.market_data import MarketData
+
+CLOSE = 1e4 + np.cumsum(np.random.default_rng(3).normal(size=1500))
+
+CASES = [
+    ("sma", {"timeperiod": 20}, lambda x: ta.SMA(x, timeperiod=20)),
+    ("ema", {"timeperiod": 20}, lambda x: ta.EMA(x, timeperiod=20)),
+    ("rsi", {"timeperiod": 14}, lambda x: ta.RSI(x, timeperiod=14)),
+    ("dema", {"timeperiod": 10}, lambda x: ta.DEMA(x, timeperiod=10)),
+    ("tema", {"timeperiod": 10}, lambda x: ta.TEMA(x, timeperiod=10)),
+    ("t3", {"timeperiod": 5, "vfactor": 0.7}, lambda x: ta.T3(x, timeperiod=5, vfactor=0.7)),
+]
+
+
+@pytest.mark.parametrize("name,options,full", CASES)
+@pytest.mark.parametrize("warmup", [0, 5, 40, 1000])
+def test_updates_match_full_recompute(name, options, full, warmup):
+    expected = full(CLOSE)[warmup:]
+
+    state = create_state(name, options, CLOSE[:warmup])
+    streamed = np.array([state.update(x) for x in CLOSE[warmup:]])
+
+    np.testing.assert_allclose(streamed, expected, rtol=1e-11, atol=0, equal_nan=True)
+    assert state.ready is True
+    assert state.value == streamed[-1]
+
+
+@pytest.mark.parametrize("name,options,full", CASES)
+def test_chunked_extend_matches_full_recompute(name, options, full):
+    state = create_state(name, options)
+
+    chunks = [state.extend(chunk) for chunk in np.array_split(CLOSE, [3, 17, 400])]
+
+    np.testing.assert_allclose(np.concatenate(chunks), full(CLOSE), rtol=1e-11, atol=0, equal_nan=True)
+
+
+@pytest.mark.asyncio
+async def test_ema_stream_matches_indicator():
+    result = await registry.get_indicator("ema").calculate(MarketData(close=CLOSE.tolist()), {"timeperiod": 30})
+    state = create_state("ema", {"timeperiod": 30}, CLOSE[:-100])
+
+    streamed = [state.update(x) for x in CLOSE[-100:]]
+
+    np.testing.assert_allclose(streamed, result.values["ema"][-100:], rtol=1e-12)
+
+
+def test_sma_state_does_not_drift():
+    values = 1e6 + np.random.default_rng(9).normal(size=200_000)
+    state = SMAState(timeperiod=50)
+
+    for value in values.tolist():
+        state.update(value)
+
+    assert state.value == pytest.approx(values[-50:].mean(), rel=1e-15)
+
+
+@pytest.mark.parametrize("name", ["ema", "dema", "tema", "t3"])
+@pytest.mark.parametrize("warmup", [0, 40])
+def test_period_one_follows_the_input(name, warmup):
+    expected = getattr(ta, name.upper())(CLOSE, timeperiod=1)[warmup:]
+
+    state = create_state(name, {"timeperiod": 1}, CLOSE[:warmup])
+    streamed = np.array([state.update(x) for x in CLOSE[warmup:]])
+
+    np.testing.assert_allclose(streamed, expected, rtol=1e-11, atol=0)
+    assert state.extend(CLOSE[:3]).tolist() == pytest.approx(CLOSE[:3].tolist(), rel=1e-11)
+
+
+def test_lookback_is_nan_and_rejects_bad_input():
+    state = create_state("rsi", {"timeperiod": 3})
+    assert [np.isnan(state.update(x)) for x in (1.0, 2.0, 3.0)] == [True, True, True]
+    assert state.update(4.0) == 100.0
+
+    with pytest.raises(ValueError):
+        state.update(float("nan"))
+    with pytest.raises(ValueError):
+        create_state("kama")
+    with pytest.raises(ValueError):
+        create_state("rsi", {"timeperiod": 1})
+    with pytest.raises(ValueError):
+        create_state("ema", {"period": 10})